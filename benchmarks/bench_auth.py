@@ -0,0 +1,113 @@
+"""Per-request overhead of the API key middleware.
+
+Compares no auth, the previous ``BaseHTTPMiddleware`` implementation and the
+pure ASGI ``APIKeyMiddleware``, on a main app with a mounted sub-app (the
+``strict_auth`` layout, where both apps carry the middleware). Requests are sent
+in-process through ``httpx.ASGITransport``, so no network time is measured.
+
+    python benchmarks/bench_auth.py --requests 5000
+"""
+import argparse
+import asyncio
+import base64
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from mcp_hub.utils.auth import APIKeyMiddleware
+
+
+API_KEY = "bench-secret-key"
+
+
+class LegacyAPIKeyMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation APIKeyMiddleware replaced, kept as the baseline."""
+
+    def __init__(self, app, api_key: str):
+        super().__init__(app)
+        self.api_key = api_key
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method == "OPTIONS":
+            return await call_next(request)
+        authorization = request.headers.get("Authorization")
+        if not authorization:
+            return JSONResponse(status_code=401, content={"detail": "Missing or invalid Authorization header"})
+        if authorization.startswith("Bearer "):
+            if authorization[7:] != self.api_key:
+                return JSONResponse(status_code=403, content={"detail": "Invalid API key"})
+        elif authorization.startswith("Basic "):
+            try:
+                _, password = base64.b64decode(authorization[6:]).decode("utf-8").split(":", 1)
+            except Exception:
+                return JSONResponse(status_code=401, content={"detail": "Invalid Basic Authentication format"})
+            if password != self.api_key:
+                return JSONResponse(status_code=403, content={"detail": "Invalid credentials"})
+        else:
+            return JSONResponse(status_code=401, content={"detail": "Unsupported authorization method"})
+        return await call_next(request)
+
+
+def build_app(middleware):
+    sub_app = FastAPI()
+
+    @sub_app.post("/")
+    async def proxy(payload: dict):
+        return {"jsonrpc": "2.0", "id": payload.get("id"), "result": {}}
+
+    main_app = FastAPI()
+    if middleware is not None:
+        sub_app.add_middleware(middleware, api_key=API_KEY)
+        main_app.add_middleware(middleware, api_key=API_KEY)
+    main_app.mount("/srv/mcp", sub_app)
+    return main_app
+
+
+async def measure(app, requests: int, authorization: str):
+    transport = httpx.ASGITransport(app=app)
+    headers = {"authorization": authorization}
+    body = {"jsonrpc": "2.0", "id": 1, "method": "ping"}
+    latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(200, requests)):  # warm-up
+            await client.post("/srv/mcp/", json=body, headers=headers)
+        for _ in range(requests):
+            started = time.perf_counter()
+            resp = await client.post("/srv/mcp/", json=body, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            assert resp.status_code == 200, resp.text
+    return latencies
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def main(requests: int):
+    bearer = f"Bearer {API_KEY}"
+    basic = "Basic " + base64.b64encode(f"user:{API_KEY}".encode()).decode()
+    cases = [
+        ("no auth", None, bearer),
+        ("BaseHTTPMiddleware, bearer", LegacyAPIKeyMiddleware, bearer),
+        ("pure ASGI, bearer", APIKeyMiddleware, bearer),
+        ("BaseHTTPMiddleware, basic", LegacyAPIKeyMiddleware, basic),
+        ("pure ASGI, basic", APIKeyMiddleware, basic),
+    ]
+    baseline = None
+    print(f"{'case':<30}{'p50 us':>10}{'p99 us':>10}{'overhead us':>14}")
+    for label, middleware, authorization in cases:
+        latencies = await measure(build_app(middleware), requests, authorization)
+        p50 = statistics.median(latencies) * 1e6
+        baseline = p50 if baseline is None else baseline
+        print(f"{label:<30}{p50:>10.1f}{percentile(latencies, 99) * 1e6:>10.1f}{p50 - baseline:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    asyncio.run(main(parser.parse_args().requests))
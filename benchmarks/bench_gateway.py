@@ -0,0 +1,276 @@
+"""End-to-end gateway benchmark against the bundled stub MCP server.
+
+Starts the gateway (``mcp_hub.main.run``) in a child process, configured with one
+``stub`` server running ``benchmarks/stub_server.py``, then drives it over HTTP
+with concurrent async clients, one phase per method (``initialize``,
+``tools/list``, ``tools/call``). Each client has its own session and sends its
+requests back to back. Reports throughput and latency percentiles per method,
+optionally saves them as JSON, and can compare them against a saved baseline.
+
+    python benchmarks/bench_gateway.py --clients 16 --requests 200 --output results.json
+    python benchmarks/bench_gateway.py --baseline benchmarks/baseline.json
+    python benchmarks/bench_gateway.py --transport streamable-http
+    python benchmarks/bench_gateway.py --runtime-profile performance
+
+With ``--transport sse`` or ``streamable-http`` the stub runs as a local HTTP
+server standing in for a remote one, and the gateway reaches it by ``url``.
+
+The gateway and the clients run in separate processes, so both can use a full
+core; numbers are only comparable between runs on the same machine.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+
+STUB_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_server.py")
+METHODS = ("initialize", "tools/list", "tools/call")
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+ENDPOINTS = {"streamable-http": "/mcp", "sse": "/sse"}
+# Settings added after a baseline may have been recorded, with the value older baselines used
+META_DEFAULTS = {"transport": "stdio", "runtime_profile": "default"}
+GATEWAY_BOOT = (
+    "import sys\n"
+    "from mcp_hub.main import run\n"
+    "from mcp_hub.utils.runtime import RuntimeProfile\n"
+    "runtime = RuntimeProfile(sys.argv[3])\n"
+    "runtime.run(run(host='127.0.0.1', port=int(sys.argv[2]), config_path=sys.argv[1], api_key='', runtime=runtime))\n"
+)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def stub_env(args) -> dict:
+    return {
+        "STUB_LATENCY_MS": str(args.latency_ms),
+        "STUB_PAYLOAD_BYTES": str(args.payload_bytes),
+        "STUB_TOOLS": str(args.tools),
+    }
+
+
+def start_remote_stub(args, port: int) -> subprocess.Popen:
+    """Run the stub as a local HTTP server, standing in for a remote MCP server."""
+    env = {**os.environ, **stub_env(args), "STUB_TRANSPORT": args.transport, "STUB_PORT": str(port)}
+    stub = subprocess.Popen([sys.executable, STUB_SERVER], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return stub
+        except OSError:
+            if stub.poll() is not None or time.monotonic() > deadline:
+                stub.kill()
+                raise RuntimeError("stub server did not start")
+            time.sleep(0.05)
+
+
+def write_config(args, stub_port: int = 0) -> str:
+    if args.transport == "stdio":
+        stub = {"command": sys.executable, "args": [STUB_SERVER], "env": stub_env(args)}
+    else:
+        stub = {"url": f"http://127.0.0.1:{stub_port}{ENDPOINTS[args.transport]}", "transport": args.transport}
+    config = {"mcpServers": {"stub": {**stub, "replicas": args.replicas}}}
+    fd, path = tempfile.mkstemp(prefix="mcp-hub-bench-", suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(config, f)
+    return path
+
+
+def start_gateway(config_path: str, port: int, runtime_profile: str = "default") -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-c", GATEWAY_BOOT, config_path, str(port), runtime_profile],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, gateway: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    message = {"jsonrpc": "2.0", "id": 0, "method": "initialize"}
+    while time.monotonic() < deadline:
+        if gateway.poll() is not None:
+            raise RuntimeError(f"Gateway exited with code {gateway.returncode}")
+        try:
+            resp = await client.post("/stub/mcp/", json=message, headers={"x-session-id": "bench-probe"})
+            if resp.status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError("Gateway did not become ready")
+
+
+def request_for(method: str, req_id: int) -> dict:
+    if method == "tools/call":
+        return {"jsonrpc": "2.0", "id": req_id, "method": method, "params": {"name": "work", "arguments": {}}}
+    return {"jsonrpc": "2.0", "id": req_id, "method": method}
+
+
+async def run_client(client: httpx.AsyncClient, index: int, method: str, requests: int, latencies: list) -> int:
+    headers = {"x-session-id": f"bench-{index}"}
+    errors = 0
+    for req_id in range(requests):
+        started = time.perf_counter()
+        resp = await client.post("/stub/mcp/", json=request_for(method, req_id), headers=headers)
+        latencies.append(time.perf_counter() - started)
+        if resp.status_code != 200 or "error" in resp.json():
+            errors += 1
+    return errors
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_phase(client: httpx.AsyncClient, method: str, clients: int, requests: int) -> dict:
+    latencies: list = []
+    started = time.perf_counter()
+    errors = await asyncio.gather(*(run_client(client, i, method, requests, latencies) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def benchmark(args) -> dict:
+    port = args.port or free_port()
+    stub = None
+    if args.transport != "stdio":
+        stub_port = free_port()
+        stub = start_remote_stub(args, stub_port)
+        config_path = write_config(args, stub_port)
+    else:
+        config_path = write_config(args)
+    gateway = start_gateway(config_path, port, args.runtime_profile)
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            await wait_until_ready(client, gateway)
+            # Every client session must be initialized before tools/* requests
+            await run_phase(client, "initialize", args.clients, 1)
+            await run_phase(client, "tools/call", args.clients, args.warmup)
+            results = {}
+            for method in METHODS:
+                results[method] = await run_phase(client, method, args.clients, args.requests)
+    finally:
+        gateway.terminate()
+        try:
+            gateway.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            gateway.kill()
+        if stub is not None:
+            stub.terminate()
+            stub.wait(timeout=30)
+        os.unlink(config_path)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "clients": args.clients,
+            "requests_per_client": args.requests,
+            "latency_ms": args.latency_ms,
+            "payload_bytes": args.payload_bytes,
+            "tools": args.tools,
+            "replicas": args.replicas,
+            "transport": args.transport,
+            "runtime_profile": args.runtime_profile,
+        },
+        "results": results,
+    }
+
+
+def print_results(report: dict):
+    print(f"{'method':<14}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for method, stats in report["results"].items():
+        print(
+            f"{method:<14}{stats['throughput_rps']:>10.1f}{stats['p50_ms']:>10.2f}"
+            f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['errors']:>8}"
+        )
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> bool:
+    """Print the change against a baseline; False when a method regressed past ``max_regression``."""
+    ok = True
+    print(f"\n{'method':<14}{'req/s':>12}{'p50':>10}{'p99':>10}   (vs baseline)")
+    for method, stats in report["results"].items():
+        base = baseline.get("results", {}).get(method)
+        if base is None:
+            continue
+        throughput = stats["throughput_rps"] / base["throughput_rps"] - 1
+        p50 = stats["p50_ms"] / base["p50_ms"] - 1
+        p99 = stats["p99_ms"] / base["p99_ms"] - 1
+        regressed = throughput < -max_regression or p50 > max_regression
+        ok = ok and not regressed
+        print(f"{method:<14}{throughput:>+12.1%}{p50:>+10.1%}{p99:>+10.1%}{'   REGRESSION' if regressed else ''}")
+    mismatched = [
+        key for key in (
+            "clients", "requests_per_client", "latency_ms", "payload_bytes", "tools", "replicas",
+            "transport", "runtime_profile",
+        )
+        if baseline.get("meta", {}).get(key, META_DEFAULTS.get(key)) != report["meta"][key]
+    ]
+    if mismatched:
+        print(f"warning: baseline was recorded with different settings: {', '.join(mismatched)}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=200, help="requests per client and method")
+    parser.add_argument("--warmup", type=int, default=20, help="warm-up tools/call requests per client")
+    parser.add_argument("--latency-ms", type=float, default=0, help="stub tool latency")
+    parser.add_argument("--payload-bytes", type=int, default=64, help="stub tool result size")
+    parser.add_argument("--tools", type=int, default=0, help="extra tools in the stub catalog")
+    parser.add_argument("--replicas", type=int, default=1, help="stub server replicas")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="stdio",
+                        help="how the gateway reaches the stub: a child process or a local HTTP server")
+    parser.add_argument("--runtime-profile", choices=("default", "performance"), default="default",
+                        help="gateway runtime profile (performance: uvloop, httptools and eager tasks when available)")
+    parser.add_argument("--port", type=int, default=0, help="gateway port (default: a free one)")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this results JSON file")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="fail when throughput drops or p50 grows by more than this fraction")
+    args = parser.parse_args()
+
+    report = asyncio.run(benchmark(args))
+    print_results(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if not compare(report, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
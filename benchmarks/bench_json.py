@@ -0,0 +1,102 @@
+"""JSON handling cost of the proxy endpoint for large messages.
+
+Compares the previous endpoint shape (the body declared as a model parameter so
+FastAPI parses and validates it, and a dict returned through ``jsonable_encoder``
+and ``JSONResponse``) with the current raw-bytes path, with and without orjson.
+Each request is a ``tools/call`` whose arguments and result are about
+``--size`` bytes, sent in-process through ``httpx.ASGITransport`` against a fake
+upstream session, so only gateway-side work is measured.
+
+    python benchmarks/bench_json.py --size 1048576 --requests 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Dict, List, Union
+
+import httpx
+from fastapi import FastAPI
+
+from mcp_hub.main import create_sub_app
+from mcp_hub.utils import fastjson
+
+
+class FakeSession:
+    def __init__(self, size: int):
+        self.text = "x" * size
+
+    async def call_tool(self, name, arguments=None):
+        content = type("FakeContent", (), {"type": "text", "text": self.text})()
+        return type("FakeResult", (), {"content": [content]})()
+
+
+def build_legacy_app(size: int) -> FastAPI:
+    """The endpoint shape the proxy had before reading raw bytes."""
+    app = FastAPI()
+    session = FakeSession(size)
+
+    @app.post("/")
+    async def mcp_proxy(request_data: Union[Dict[str, Any], List[Any]]):
+        params = request_data.get("params") or {}
+        result = await session.call_tool(params.get("name"), params.get("arguments"))
+        return {
+            "jsonrpc": "2.0",
+            "id": request_data.get("id"),
+            "result": {"content": [{"type": c.type, "text": c.text} for c in result.content]},
+        }
+
+    return app
+
+
+def build_current_app(size: int) -> FastAPI:
+    app = create_sub_app("bench", {"command": "echo"}, ["*"], None, False, None, 5, None)
+    app.state.session = FakeSession(size)
+    return app
+
+
+async def measure(app: FastAPI, size: int, requests: int) -> List[float]:
+    headers = {"x-session-id": "bench", "content-type": "application/json"}
+    call = fastjson.dumps({
+        "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+        "params": {"name": "big", "arguments": {"blob": "y" * size}},
+    })
+    latencies = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.post("/", json={"jsonrpc": "2.0", "id": 0, "method": "initialize"}, headers=headers)
+        for i in range(requests + 5):
+            started = time.perf_counter()
+            resp = await client.post("/", content=call, headers=headers)
+            if i >= 5:  # warm-up
+                latencies.append(time.perf_counter() - started)
+            assert resp.status_code == 200, resp.text
+    return latencies
+
+
+async def main(size: int, requests: int):
+    orjson = fastjson.orjson
+    cases = [("model body + jsonable_encoder", build_legacy_app, orjson)]
+    if orjson is not None:
+        cases.append(("raw bytes, orjson", build_current_app, orjson))
+    cases.append(("raw bytes, stdlib json", build_current_app, None))
+
+    print(f"{size / 1024:.0f} KiB arguments and result, {requests} requests")
+    print(f"{'case':<32}{'p50 ms':>10}{'mean ms':>10}{'speedup':>10}")
+    baseline = None
+    for label, build, codec in cases:
+        fastjson.orjson = codec
+        try:
+            latencies = await measure(build(size), size, requests)
+        finally:
+            fastjson.orjson = orjson
+        p50 = statistics.median(latencies) * 1000
+        baseline = p50 if baseline is None else baseline
+        print(f"{label:<32}{p50:>10.2f}{statistics.fmean(latencies) * 1000:>10.2f}{baseline / p50:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1024 * 1024)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.size, args.requests))
@@ -0,0 +1,49 @@
+"""Stub stdio MCP server for benchmarks.
+
+Serves ``work`` (sleeps, then returns a text payload) and ``echo``. The defaults
+come from the environment and can be overridden per call:
+
+- ``STUB_LATENCY_MS``: time ``work`` spends before answering (default: 0)
+- ``STUB_PAYLOAD_BYTES``: size of the text ``work`` returns (default: 64)
+- ``STUB_TOOLS``: extra no-op tools to register, to benchmark large catalogs (default: 0)
+- ``STUB_TRANSPORT``: ``stdio``, or ``streamable-http``/``sse`` to stand in for a remote server (default: stdio)
+- ``STUB_PORT``: port the HTTP transports listen on, on 127.0.0.1 (default: 8765)
+"""
+import asyncio
+import os
+from typing import Optional
+
+from mcp.server.fastmcp import FastMCP
+
+
+DEFAULT_LATENCY_MS = float(os.environ.get("STUB_LATENCY_MS", "0"))
+DEFAULT_PAYLOAD_BYTES = int(os.environ.get("STUB_PAYLOAD_BYTES", "64"))
+
+mcp = FastMCP("bench-stub", host="127.0.0.1", port=int(os.environ.get("STUB_PORT", "8765")), log_level="WARNING")
+
+
+@mcp.tool()
+async def work(latency_ms: Optional[float] = None, payload_bytes: Optional[int] = None) -> str:
+    """Sleep for latency_ms, then return payload_bytes of text."""
+    latency_ms = DEFAULT_LATENCY_MS if latency_ms is None else latency_ms
+    if latency_ms > 0:
+        await asyncio.sleep(latency_ms / 1000)
+    return "x" * (DEFAULT_PAYLOAD_BYTES if payload_bytes is None else payload_bytes)
+
+
+@mcp.tool()
+async def echo(text: str) -> str:
+    """Return text unchanged."""
+    return text
+
+
+def add_filler_tools(count: int):
+    for i in range(count):
+        async def filler() -> str:
+            return "ok"
+        mcp.add_tool(filler, name=f"filler_{i}", description=f"No-op tool {i} of a large catalog.")
+
+
+if __name__ == "__main__":
+    add_filler_tools(int(os.environ.get("STUB_TOOLS", "0")))
+    mcp.run(transport=os.environ.get("STUB_TRANSPORT", "stdio"))
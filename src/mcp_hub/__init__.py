@@ -1,11 +1,8 @@
 import sys
-import asyncio
 import typer
 import os
-from dotenv import load_dotenv
 
-from typing_extensions import Annotated
-from typing import Optional, List
+from typing import Annotated, Optional, List
 
 app = typer.Typer()
 
@@ -69,6 +66,29 @@ def main(
     hot_reload: Annotated[
         Optional[bool], typer.Option("--hot-reload", help="Enable hot reload for config file changes")
     ] = False,
+    max_concurrent_spawns: Annotated[
+        Optional[int],
+        typer.Option("--max-concurrent-spawns", help="Maximum number of MCP servers starting at once"),
+    ] = None,
+    connection_timeout: Annotated[
+        Optional[float],
+        typer.Option("--timeout", help="Default deadline in seconds for requests to the MCP servers"),
+    ] = None,
+    runtime_profile: Annotated[
+        Optional[str],
+        typer.Option("--runtime-profile", help="Runtime profile: default or performance (uvloop, httptools, eager tasks)"),
+    ] = None,
+    backlog: Annotated[
+        Optional[int], typer.Option("--backlog", help="Maximum number of pending connections")
+    ] = None,
+    limit_concurrency: Annotated[
+        Optional[int],
+        typer.Option("--limit-concurrency", help="Maximum concurrent connections and tasks before answering 503"),
+    ] = None,
+    timeout_keep_alive: Annotated[
+        Optional[float],
+        typer.Option("--timeout-keep-alive", help="Seconds to keep idle client connections open"),
+    ] = None,
 ):
     server_command = None
     if not config_path:
@@ -85,6 +105,19 @@ def main(
             return
 
     from mcp_hub.main import run
+    from mcp_hub.utils.runtime import RuntimeProfile, read_runtime_config, validate_runtime_config
+
+    # The event loop is chosen before it starts, so the runtime settings are read ahead of the config
+    runtime_cfg = read_runtime_config(config_path)
+    try:
+        validate_runtime_config({**runtime_cfg, **({"profile": runtime_profile} if runtime_profile else {})})
+    except ValueError as e:
+        typer.echo(f"Error: {e}")
+        raise typer.Exit(1)
+    runtime = RuntimeProfile.from_config(
+        runtime_cfg, profile=runtime_profile, backlog=backlog,
+        limit_concurrency=limit_concurrency, keep_alive_timeout=timeout_keep_alive,
+    )
 
     if config_path:
         print("Starting MCP Hub with config file:", config_path)
@@ -101,6 +134,8 @@ def main(
                 env_dict[key] = value
 
         if env_path:
+            from dotenv import load_dotenv
+
             # Load environment variables from the specified file
             load_dotenv(env_path)
             env_dict.update(dict(os.environ))
@@ -123,7 +158,7 @@ def main(
         path_prefix = f"/{path_prefix}"
 
     # Run your async run function from mcp_hub.main
-    asyncio.run(
+    runtime.run(
         run(
             host,
             port,
@@ -141,6 +176,9 @@ def main(
             path_prefix=path_prefix,
             headers=headers,
             hot_reload=hot_reload,
+            max_concurrent_spawns=max_concurrent_spawns,
+            connection_timeout=connection_timeout,
+            runtime=runtime,
         )
     )
 
@@ -4,24 +4,82 @@ import logging
 import os
 import signal
 import socket
-from contextlib import AsyncExitStack, asynccontextmanager
-from typing import Optional, Dict, Any
+import sqlite3
+import time
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
+from typing import Optional, Dict, Any, List, Tuple
 from urllib.parse import urljoin
 
-import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from starlette.routing import Mount
 
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from mcp import McpError, StdioServerParameters
 
+from mcp_hub.utils import fastjson
+from mcp_hub.utils.admission import AdmissionControl, OverloadedError, validate_concurrency_config
+from mcp_hub.utils.aggregate import DEFAULT_PAGE_SIZE, AggregatedCatalog, InvalidCursorError
 from mcp_hub.utils.auth import APIKeyMiddleware, get_verify_api_key
-from mcp_hub.utils.config_watcher import ConfigWatcher
+from mcp_hub.utils.catalog import CatalogCache, dump_json, jsonrpc_result_bytes, tool_to_dict
+from mcp_hub.utils.coalesce import SingleFlight, canonical_arguments
+from mcp_hub.utils.deadlines import (
+    Deadlines,
+    bound_handler,
+    requested_timeout,
+    validate_timeout_config,
+)
+from mcp_hub.utils.health import HealthProber, server_health, validate_health_check_config
+from mcp_hub.utils.jsonrpc import (
+    dispatch_jsonrpc,
+    http_exception_error,
+    is_client_notification,
+    jsonrpc_error,
+    parse_jsonrpc_body,
+)
+from mcp_hub.utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, GatewayMetrics, method_label
+from mcp_hub.utils.pool import (
+    BALANCING_POLICIES,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_POLICY,
+    NoHealthyReplicaError,
+    RestartPolicy,
+    SessionPool,
+    stdio_session_factory,
+    validate_restart_config,
+)
+from mcp_hub.utils.passthrough import UpstreamClosedError, UpstreamError, raw_stdio_session_factory
+from mcp_hub.utils.remote import (
+    HttpPool,
+    default_transport,
+    remote_session_factory,
+    validate_http_pool_config,
+    validate_remote_config,
+)
+from mcp_hub.utils.runtime import RuntimeProfile, running_loop_matches, validate_runtime_config
+from mcp_hub.utils.resource_cache import (
+    DEFAULT_RESOURCE_CACHE_MAX_BYTES,
+    ResourceCache,
+    normalize_uri,
+    validate_resource_cache_config,
+)
+from mcp_hub.utils.result_cache import (
+    DEFAULT_RESULT_STORE_MAX_BYTES,
+    ResultStore,
+    create_result_caches,
+    validate_result_cache_config,
+)
+from mcp_hub.utils.sessions import DEFAULT_MAX_SESSIONS, DEFAULT_SESSION_TTL, SessionStore
+from mcp_hub.utils.streaming import stream_response, wants_event_stream
 
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_CONCURRENT_SPAWNS = os.cpu_count() or 4
+# How long a server replaced by a reload may keep serving its in-flight requests
+DEFAULT_DRAIN_TIMEOUT = 30.0
+DRAIN_POLL_INTERVAL = 0.05
+
 
 class GracefulShutdown:
     def __init__(self):
@@ -46,15 +104,166 @@ class GracefulShutdown:
 
 def validate_server_config(server_name: str, server_cfg: Dict[str, Any]) -> None:
     """Validate individual server configuration."""
-    if not server_cfg.get("command"):
-        raise ValueError(f"Server '{server_name}' must have a 'command' field")
-    
-    if not isinstance(server_cfg["command"], str):
+    if server_cfg.get("url") is not None:
+        # Remote server reached over SSE or streamable HTTP instead of a local process
+        if "command" in server_cfg:
+            raise ValueError(f"Server '{server_name}' must have either a 'command' or a 'url', not both")
+        validate_remote_config(f"Server '{server_name}'", server_cfg)
+        if server_cfg.get("passthrough"):
+            raise ValueError(f"Server '{server_name}' 'passthrough' is only supported for 'command' servers")
+    elif not server_cfg.get("command"):
+        raise ValueError(f"Server '{server_name}' must have a 'command' field or a 'url'")
+    elif not isinstance(server_cfg["command"], str):
         raise ValueError(f"Server '{server_name}' 'command' must be a string")
-    
+
     if server_cfg.get("args") and not isinstance(server_cfg["args"], list):
         raise ValueError(f"Server '{server_name}' 'args' must be a list")
 
+    replicas = server_cfg.get("replicas", 1)
+    if not isinstance(replicas, int) or isinstance(replicas, bool) or replicas < 1:
+        raise ValueError(f"Server '{server_name}' 'replicas' must be a positive integer")
+
+    if "restart" in server_cfg:
+        validate_restart_config(f"Server '{server_name}'", server_cfg["restart"])
+
+    if "healthCheck" in server_cfg:
+        validate_health_check_config(f"Server '{server_name}'", server_cfg["healthCheck"])
+
+    standby = server_cfg.get("standby", 0)
+    if not isinstance(standby, int) or isinstance(standby, bool) or standby < 0:
+        raise ValueError(f"Server '{server_name}' 'standby' must be a non-negative integer")
+
+    policy = server_cfg.get("loadBalancing", DEFAULT_POLICY)
+    if policy not in BALANCING_POLICIES:
+        raise ValueError(
+            f"Server '{server_name}' 'loadBalancing' must be one of: {', '.join(BALANCING_POLICIES)}"
+        )
+
+    tools_cache_ttl = server_cfg.get("toolsCacheTtl")
+    if tools_cache_ttl is not None and (
+        not isinstance(tools_cache_ttl, (int, float)) or isinstance(tools_cache_ttl, bool) or tools_cache_ttl < 0
+    ):
+        raise ValueError(f"Server '{server_name}' 'toolsCacheTtl' must be a non-negative number")
+
+    if not isinstance(server_cfg.get("passthrough", False), bool):
+        raise ValueError(f"Server '{server_name}' 'passthrough' must be a boolean")
+
+    if not isinstance(server_cfg.get("lazy", False), bool):
+        raise ValueError(f"Server '{server_name}' 'lazy' must be a boolean")
+
+    idle_timeout = server_cfg.get("idleTimeout", DEFAULT_IDLE_TIMEOUT)
+    if not isinstance(idle_timeout, (int, float)) or isinstance(idle_timeout, bool) or idle_timeout < 0:
+        raise ValueError(f"Server '{server_name}' 'idleTimeout' must be a non-negative number")
+
+    if "concurrency" in server_cfg:
+        validate_concurrency_config(f"Server '{server_name}'", server_cfg["concurrency"])
+
+    if "timeout" in server_cfg:
+        validate_timeout_config(f"Server '{server_name}'", server_cfg["timeout"])
+
+    if not isinstance(server_cfg.get("notifyCancelled", True), bool):
+        raise ValueError(f"Server '{server_name}' 'notifyCancelled' must be a boolean")
+
+    if "resourceCache" in server_cfg:
+        validate_resource_cache_config(f"Server '{server_name}'", server_cfg["resourceCache"])
+
+    # Per-tool settings: {"tools": {"<tool name>": {...}}}
+    tools_cfg = server_cfg.get("tools", {})
+    if not isinstance(tools_cfg, dict) or not all(isinstance(cfg, dict) for cfg in tools_cfg.values()):
+        raise ValueError(f"Server '{server_name}' 'tools' must map tool names to objects")
+    for tool_name, tool_cfg in tools_cfg.items():
+        if "concurrency" in tool_cfg:
+            validate_concurrency_config(f"Server '{server_name}' tool '{tool_name}'", tool_cfg["concurrency"])
+        if "timeout" in tool_cfg:
+            validate_timeout_config(f"Server '{server_name}' tool '{tool_name}'", tool_cfg["timeout"])
+        if not isinstance(tool_cfg.get("coalesce", False), bool):
+            raise ValueError(f"Server '{server_name}' tool '{tool_name}' 'coalesce' must be a boolean")
+        if "cache" in tool_cfg:
+            validate_result_cache_config(f"Server '{server_name}' tool '{tool_name}'", tool_cfg["cache"])
+
+
+def validate_gateway_config(gateway_cfg: Dict[str, Any]) -> None:
+    """Validate the optional gateway-wide 'gateway' section of the config file."""
+    if not isinstance(gateway_cfg, dict):
+        raise ValueError("'gateway' must be an object")
+
+    max_spawns = gateway_cfg.get("maxConcurrentSpawns")
+    if max_spawns is not None and (
+        not isinstance(max_spawns, int) or isinstance(max_spawns, bool) or max_spawns < 1
+    ):
+        raise ValueError("'gateway' 'maxConcurrentSpawns' must be a positive integer")
+
+    if not isinstance(gateway_cfg.get("hubEndpoint", True), bool):
+        raise ValueError("'gateway' 'hubEndpoint' must be a boolean")
+
+    page_size = gateway_cfg.get("hubPageSize", DEFAULT_PAGE_SIZE)
+    if not isinstance(page_size, int) or isinstance(page_size, bool) or page_size < 0:
+        raise ValueError("'gateway' 'hubPageSize' must be a non-negative integer")
+
+    drain_timeout = gateway_cfg.get("drainTimeout", DEFAULT_DRAIN_TIMEOUT)
+    if not isinstance(drain_timeout, (int, float)) or isinstance(drain_timeout, bool) or drain_timeout < 0:
+        raise ValueError("'gateway' 'drainTimeout' must be a non-negative number")
+
+    max_sessions = gateway_cfg.get("maxSessions", DEFAULT_MAX_SESSIONS)
+    if not isinstance(max_sessions, int) or isinstance(max_sessions, bool) or max_sessions < 1:
+        raise ValueError("'gateway' 'maxSessions' must be a positive integer")
+
+    session_ttl = gateway_cfg.get("sessionTtl", DEFAULT_SESSION_TTL)
+    if session_ttl is not None and (
+        not isinstance(session_ttl, (int, float)) or isinstance(session_ttl, bool) or session_ttl < 0
+    ):
+        raise ValueError("'gateway' 'sessionTtl' must be a non-negative number")
+
+    if not isinstance(gateway_cfg.get("resultCachePath", ""), str):
+        raise ValueError("'gateway' 'resultCachePath' must be a string")
+
+    store_max_bytes = gateway_cfg.get("resultCacheMaxBytes", DEFAULT_RESULT_STORE_MAX_BYTES)
+    if not isinstance(store_max_bytes, int) or isinstance(store_max_bytes, bool) or store_max_bytes < 1:
+        raise ValueError("'gateway' 'resultCacheMaxBytes' must be a positive integer")
+
+    if "httpPool" in gateway_cfg:
+        validate_http_pool_config(gateway_cfg["httpPool"])
+
+    if "runtime" in gateway_cfg:
+        validate_runtime_config(gateway_cfg["runtime"])
+
+
+def create_session_store(gateway_cfg: Dict[str, Any]) -> SessionStore:
+    """Build an HTTP session store sized by the 'gateway' config section (a TTL of 0 disables expiry)."""
+    return SessionStore(
+        max_size=gateway_cfg.get("maxSessions", DEFAULT_MAX_SESSIONS),
+        ttl=gateway_cfg.get("sessionTtl", DEFAULT_SESSION_TTL) or None,
+    )
+
+
+def open_result_store(main_app: FastAPI, gateway_cfg: Dict[str, Any]) -> Optional[ResultStore]:
+    """The on-disk result cache tier 'resultCachePath' asks for.
+
+    The store already open is reused while the path stays the same; otherwise a
+    new one is opened, which the caller publishes in ``main_app.state.result_store``
+    (and closes if it ends up unused).
+    """
+    path = gateway_cfg.get("resultCachePath")
+    if not path:
+        return None
+    max_bytes = gateway_cfg.get("resultCacheMaxBytes", DEFAULT_RESULT_STORE_MAX_BYTES)
+    store = getattr(main_app.state, "result_store", None)
+    if store is not None and store.path == path:
+        store.max_bytes = max_bytes
+        return store
+    try:
+        return ResultStore(path, max_bytes)
+    except sqlite3.Error as e:
+        logger.error(f"Cannot open result cache store '{path}', caching in memory only: {e}")
+        return None
+
+
+def close_result_store(main_app: FastAPI):
+    store = getattr(main_app.state, "result_store", None)
+    main_app.state.result_store = None
+    if store is not None:
+        store.close()
+
 
 def load_config(config_path: str) -> Dict[str, Any]:
     """Load and validate config from file."""
@@ -71,6 +280,8 @@ def load_config(config_path: str) -> Dict[str, Any]:
         for server_name, server_cfg in mcp_servers.items():
             validate_server_config(server_name, server_cfg)
 
+        validate_gateway_config(config_data.get("gateway", {}))
+
         return config_data
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON in config file {config_path}: {e}")
@@ -85,7 +296,7 @@ def load_config(config_path: str) -> Dict[str, Any]:
 
 def create_sub_app(server_name: str, server_cfg: Dict[str, Any], cors_allow_origins,
                    api_key: Optional[str], strict_auth: bool, api_dependency,
-                   connection_timeout, lifespan) -> FastAPI:
+                   connection_timeout, lifespan, result_store: Optional[ResultStore] = None) -> FastAPI:
     """Create a sub-application for an MCP server."""
     sub_app = FastAPI(
         title=f"{server_name} MCP Proxy",
@@ -102,17 +313,63 @@ def create_sub_app(server_name: str, server_cfg: Dict[str, Any], cors_allow_orig
         allow_headers=["*"],
     )
 
-    # Configure server type and connection parameters for stdio
-    sub_app.state.server_type = "stdio"
-    sub_app.state.command = server_cfg["command"]
+    # Configure server type and connection parameters: a local stdio process or a remote URL
+    sub_app.state.server_name = server_name
+    sub_app.state.url = server_cfg.get("url")
+    sub_app.state.transport = server_cfg.get("transport") or (
+        default_transport(sub_app.state.url) if sub_app.state.url else None
+    )
+    sub_app.state.headers = server_cfg.get("headers", {})
+    sub_app.state.server_type = sub_app.state.transport or "stdio"
+    sub_app.state.command = server_cfg.get("command")
     sub_app.state.args = server_cfg.get("args", [])
     sub_app.state.env = {**os.environ, **server_cfg.get("env", {})}
-    
+    sub_app.state.replicas = server_cfg.get("replicas", 1)
+    sub_app.state.standby = server_cfg.get("standby", 0)
+    # How replicas that exit on their own are restarted
+    sub_app.state.restart_policy = RestartPolicy.from_config(server_cfg.get("restart"))
+    # Background pings that catch hung processes; read by the /health endpoints
+    sub_app.state.health_check = server_cfg.get("healthCheck")
+    sub_app.state.load_balancing = server_cfg.get("loadBalancing", DEFAULT_POLICY)
+    sub_app.state.sticky_sessions = bool(server_cfg.get("stickySessions", False))
+    # Spawn on first use and stop again after idleTimeout seconds without requests (0: keep running)
+    sub_app.state.lazy = server_cfg.get("lazy", False)
+    sub_app.state.idle_timeout = server_cfg.get("idleTimeout", DEFAULT_IDLE_TIMEOUT) or None
+    # Forward JSON-RPC as-is instead of going through the SDK client session
+    sub_app.state.passthrough = server_cfg.get("passthrough", False)
+
+    # tools/list cache: no TTL caches until invalidated, 0 disables caching
+    tools_cache_ttl = server_cfg.get("toolsCacheTtl")
+    sub_app.state.tools_cache = CatalogCache(ttl=tools_cache_ttl or None, enabled=tools_cache_ttl != 0)
+
+    # Server-wide and per-tool limits on concurrent tools/call
+    sub_app.state.admission = AdmissionControl.from_config(server_name, server_cfg)
+
+    # Opt-in single-flight: identical concurrent calls of these tools share one upstream call
+    sub_app.state.coalesce_tools = {
+        tool_name for tool_name, tool_cfg in server_cfg.get("tools", {}).items() if tool_cfg.get("coalesce")
+    }
+    sub_app.state.single_flight = SingleFlight()
+
+    # Per-tool result caches, backed by the gateway's on-disk store when there is one
+    sub_app.state.result_caches = create_result_caches(server_name, server_cfg, result_store)
+
+    # resources/read cache, kept fresh by upstream resources/updated notifications
+    resource_cache_cfg = server_cfg.get("resourceCache")
+    sub_app.state.resource_cache = ResourceCache(
+        max_bytes=resource_cache_cfg.get("maxBytes", DEFAULT_RESOURCE_CACHE_MAX_BYTES),
+        ttl=resource_cache_cfg.get("ttl"),
+    ) if resource_cache_cfg is not None else None
+
     if api_key and strict_auth:
         sub_app.add_middleware(APIKeyMiddleware, api_key=api_key)
 
     sub_app.state.api_dependency = api_dependency
     sub_app.state.connection_timeout = connection_timeout
+    # Request deadlines: per tool, else per server, else the gateway-wide connection_timeout
+    sub_app.state.deadlines = Deadlines.from_config(server_cfg, connection_timeout)
+    # Send notifications/cancelled for requests given up on (timed out, client gone)
+    sub_app.state.notify_cancelled = server_cfg.get("notifyCancelled", True)
 
     # Add MCP proxy endpoint
     create_mcp_proxy_endpoint(sub_app, api_dependency)
@@ -120,148 +377,722 @@ def create_sub_app(server_name: str, server_cfg: Dict[str, Any], cors_allow_orig
     return sub_app
 
 
+@asynccontextmanager
+async def lease_session(app: FastAPI, routing_key: Optional[str] = None):
+    """Yield the upstream session that should serve one request.
+
+    Apps started through ``lifespan`` own a ``SessionPool`` and balance across its
+    replicas; otherwise the single ``app.state.session`` is used as-is.
+    """
+    pool = getattr(app.state, "session_pool", None)
+    if pool is None:
+        yield app.state.session
+        return
+    async with pool.acquire(routing_key) as session:
+        yield session
+
+
+def resolve_session_id(request, request_data) -> str:
+    """Get the HTTP session id from header/param/body; if absent, derive a stable anon key from client IP + UA."""
+    session_id = request.headers.get("x-session-id")
+    if not session_id:
+        session_id = request.query_params.get("sessionId")
+    if not session_id and isinstance(request_data, dict):
+        session_id = request_data.get("sessionId")
+    if not session_id:
+        # Derive a stable anonymous session per client to support clients (e.g., n8n) that don't persist a sessionId
+        client_ip = getattr(request.client, 'host', 'unknown')
+        user_agent = request.headers.get('user-agent', '')
+        import hashlib
+        anon_fingerprint = hashlib.sha256(f"{client_ip}|{user_agent}".encode("utf-8")).hexdigest()[:16]
+        session_id = f"anon:{anon_fingerprint}"
+    return session_id
+
+
+async def list_server_tools(app: FastAPI, routing_key: Optional[str] = None) -> bytes:
+    """Return the serialized ``tools/list`` result of a server, served from its catalog cache when possible."""
+    async def fetch_tools():
+        async with lease_session(app, routing_key) as session:
+            if getattr(app.state, "passthrough", False):
+                # Relay the server's own result rather than the SDK model's subset of it
+                return await session.request("tools/list")
+            result = await session.list_tools()
+        return [tool_to_dict(tool) for tool in result.tools]
+
+    return await app.state.tools_cache.get_or_fetch(fetch_tools)
+
+
+def model_to_dict(model) -> Dict[str, Any]:
+    """JSON shape of an SDK result model, as the server sent it."""
+    return model.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+async def read_server_resource(app: FastAPI, routing_key: Optional[str], uri: str) -> bytes:
+    """Return the serialized ``resources/read`` result of a URI, served from the resource cache when possible."""
+    async def read(subscribe: bool) -> Tuple[bytes, bool]:
+        subscribed = False
+        async with lease_session(app, routing_key) as session:
+            # Servers that don't advertise subscriptions aren't asked
+            initialize_result = getattr(session, "initialize_result", None)
+            if initialize_result is not None:
+                subscribe = subscribe and bool(
+                    (initialize_result.get("capabilities", {}).get("resources") or {}).get("subscribe")
+                )
+            if subscribe:
+                try:
+                    await session.subscribe_resource(uri)
+                    subscribed = True
+                except (McpError, UpstreamError) as e:
+                    logger.info(f"Cannot subscribe to resource {uri} on '{app.state.server_name}': {e}")
+            result = await session.read_resource(uri)
+        return dump_json(model_to_dict(result)), subscribed
+
+    cache = getattr(app.state, "resource_cache", None)
+    if cache is None:
+        return (await read(False))[0]
+    return await cache.get_or_fetch(normalize_uri(uri), read)
+
+
+def server_tools_from(app: FastAPI, result_bytes: bytes) -> List[Dict[str, Any]]:
+    """Tool dicts behind a serialized tools/list result, avoiding a re-parse when cached."""
+    cache = app.state.tools_cache
+    if cache.result_bytes is result_bytes and cache.tools is not None:
+        return cache.tools
+    return fastjson.loads(result_bytes)["tools"]
+
+
+async def call_server_tool(app: FastAPI, routing_key: Optional[str], params: Dict[str, Any],
+                           progress_callback=None) -> Dict[str, Any]:
+    """Run a ``tools/call`` on a server, sharing one upstream call between identical calls of coalesced tools."""
+    tool_name = params.get("name")
+    result_cache = getattr(app.state, "result_caches", {}).get(tool_name)
+    # Calls streaming progress need their own upstream call to receive their own progress events
+    coalesce = tool_name in getattr(app.state, "coalesce_tools", ()) and progress_callback is None
+    if result_cache is None and not coalesce:
+        return await forward_tool_call(app, routing_key, params, progress_callback)
+
+    arguments_key = canonical_arguments(params.get("arguments"))
+    if result_cache is not None:
+        cached = await result_cache.get(arguments_key)
+        if cached is not None:
+            return cached
+
+    if coalesce:
+        result = await app.state.single_flight.do(
+            (tool_name, arguments_key), lambda: forward_tool_call(app, routing_key, params)
+        )
+    else:
+        result = await forward_tool_call(app, routing_key, params, progress_callback)
+
+    if result_cache is not None and not result.get("isError"):
+        await result_cache.put(arguments_key, result)
+    return result
+
+
+def uses_call_cache(app: FastAPI, tool_name: Optional[str]) -> bool:
+    """Whether calls of a tool go through its result cache or coalescing rather than straight upstream."""
+    return tool_name in getattr(app.state, "result_caches", {}) or tool_name in getattr(app.state, "coalesce_tools", ())
+
+
+async def forward_tool_call(app: FastAPI, routing_key: Optional[str], params: Dict[str, Any],
+                            progress_callback=None) -> Dict[str, Any]:
+    """Forward a ``tools/call`` to a server and shape its result for the gateway response."""
+    tool_name = params.get("name")
+    # Only ask upstream for progress when someone is listening for it
+    extra = {"progress_callback": progress_callback} if progress_callback else {}
+    admission = getattr(app.state, "admission", None)
+    async with admission.admit(tool_name) if admission else nullcontext():
+        async with lease_session(app, routing_key) as session:
+            if "arguments" in params:
+                arguments = params["arguments"]
+                if arguments is None or arguments == {}:
+                    result = await session.call_tool(tool_name, **extra)
+                else:
+                    result = await session.call_tool(tool_name, arguments=arguments, **extra)
+            else:
+                result = await session.call_tool(tool_name, **extra)
+    shaped = {"content": [content_to_dict(content) for content in result.content]}
+    if getattr(result, "isError", False) is True:
+        shaped["isError"] = True
+    return shaped
+
+
+def content_to_dict(content) -> Dict[str, Any]:
+    """Shape of one tool result content block; images, audio and resources keep all their fields."""
+    if hasattr(content, "model_dump"):
+        return content.model_dump(mode="json", by_alias=True, exclude_none=True)
+    if hasattr(content, "text"):
+        return {"type": content.type, "text": content.text}
+    return {"type": content.type}
+
+
+async def forward_raw(app: FastAPI, routing_key: Optional[str], message: Dict[str, Any],
+                      progress_callback=None) -> Optional[bytes]:
+    """Relay a JSON-RPC message to a passthrough server and return its response body untouched."""
+    admission = getattr(app.state, "admission", None)
+    tool_name = (message.get("params") or {}).get("name")
+    admit = admission.admit(tool_name) if admission and message.get("method") == "tools/call" else nullcontext()
+    async with admit:
+        async with lease_session(app, routing_key) as session:
+            return await session.send_raw(message, progress_callback)
+
+
+async def upstream_initialize_result(app: FastAPI, routing_key: Optional[str]) -> Dict[str, Any]:
+    """The ``initialize`` result the server answered the gateway with (empty when unknown)."""
+    try:
+        async with lease_session(app, routing_key) as session:
+            return getattr(session, "initialize_result", None) or {}
+    except NoHealthyReplicaError:
+        # Clients may still initialize while replicas are down; later requests report it
+        return {}
+
+
+def overloaded_exception(e: OverloadedError) -> HTTPException:
+    """429 with Retry-After for a request rejected by admission control."""
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+def upstream_error_reply(req_id, e: Exception, where: str) -> Dict[str, Any]:
+    """Reply to a request that failed with ``e``, or raise the HTTP error it maps to.
+
+    Errors the server answered with are relayed as JSON-RPC errors; an unreachable
+    server is a 503, a rejected request a 429 and anything else a 500.
+    """
+    if isinstance(e, HTTPException):
+        raise e
+    if isinstance(e, (NoHealthyReplicaError, UpstreamClosedError)):
+        raise HTTPException(status_code=503, detail=str(e))
+    if isinstance(e, OverloadedError):
+        raise overloaded_exception(e)
+    if isinstance(e, McpError):
+        # The server answered with a JSON-RPC error: relay it
+        return jsonrpc_error(req_id, e.error.code, e.error.message, e.error.data)
+    if isinstance(e, UpstreamError):
+        error = e.error
+        return jsonrpc_error(req_id, error.get("code", -32603), error.get("message", str(e)), error.get("data"))
+    logger.error(f"{where} error: {e}")
+    raise HTTPException(status_code=500, detail=str(e))
+
+
+def instrument_handler(metrics: Optional[GatewayMetrics], server: str, handle):
+    """Wrap a JSON-RPC message handler with count, latency, in-flight and error-code metrics."""
+    if metrics is None:
+        return handle
+
+    async def instrumented(message: Dict[str, Any], *args, **kwargs):
+        method = method_label(message.get("method"))
+        in_flight = metrics.in_flight.labels(server)
+        in_flight.inc()
+        started = time.perf_counter()
+        code = None
+        try:
+            reply = await handle(message, *args, **kwargs)
+            if isinstance(reply, dict) and "error" in reply:
+                code = reply["error"].get("code")
+            return reply
+        except HTTPException as e:
+            code = http_exception_error(None, e)["error"]["code"]
+            raise
+        except Exception:
+            code = -32603
+            raise
+        finally:
+            in_flight.dec()
+            metrics.latency.labels(server, method).observe(time.perf_counter() - started)
+            metrics.requests.labels(server, method).inc()
+            if code is not None:
+                metrics.errors.labels(server, method, str(code)).inc()
+
+    return instrumented
+
+
+async def respond_jsonrpc(request, request_data, handle, metrics: Optional[GatewayMetrics], server: str):
+    """Answer a JSON-RPC body (long-running calls streamed as SSE when asked) and record its metrics."""
+    handle = instrument_handler(metrics, server, handle)
+    # Long-running calls can be streamed as SSE, forwarding progress as it arrives
+    if isinstance(request_data, dict) and wants_event_stream(request.headers.get("accept", ""), request_data):
+        response = stream_response(request_data, handle)
+    else:
+        response = await dispatch_jsonrpc(request_data, handle)
+    if metrics is not None:
+        # Streamed responses have no body to measure
+        body = getattr(response, "body", None)
+        metrics.observe_bytes(server, len(await request.body()), len(body) if body is not None else None)
+    return response
+
+
+# Methods the server endpoint answers only after initialize
+PROXIED_METHODS = ("tools/list", "tools/call", "resources/list", "resources/templates/list", "resources/read")
+
+
 def create_mcp_proxy_endpoint(app: FastAPI, api_dependency=None):
     """Create MCP proxy endpoint that forwards requests directly to MCP server."""
     
-    # In-memory session store: {session_id: {"initialized": bool}}
+    # Bounded in-memory session store (LRU + idle TTL)
     if not hasattr(app.state, "http_sessions"):
-        app.state.http_sessions = {}
+        app.state.http_sessions = SessionStore()
+    if not hasattr(app.state, "tools_cache"):
+        app.state.tools_cache = CatalogCache()
 
-    from fastapi import Request, Response
-    import uuid
+    from fastapi import Request
 
     @app.post("/")
-    async def mcp_proxy(request: Request, request_data: dict):
-        """Proxy MCP requests directly to the connected MCP server with MCP-compliant session logic."""
+    async def mcp_proxy(request: Request):
+        """Proxy MCP requests directly to the connected MCP server with MCP-compliant session logic.
+
+        Accepts a single JSON-RPC message or a batch array, whose entries are forwarded concurrently.
+        """
+        request_data = parse_jsonrpc_body(await request.body())
+        if isinstance(request_data, Response):
+            return request_data
+
         session = getattr(app.state, 'session', None)
-        if not session:
+        if not session and getattr(app.state, 'session_pool', None) is None:
             raise HTTPException(status_code=503, detail="MCP server not connected")
 
-        # Session management: get session_id from header/param/body; if absent, derive a stable anon key from client IP + UA
-        session_id = request.headers.get("x-session-id")
-        if not session_id:
-            session_id = request.query_params.get("sessionId")
-        if not session_id:
-            session_id = request_data.get("sessionId")
-        if not session_id:
-            # Derive a stable anonymous session per client to support clients (e.g., n8n) that don't persist a sessionId
-            client_ip = getattr(request.client, 'host', 'unknown')
-            user_agent = request.headers.get('user-agent', '')
-            import hashlib
-            anon_fingerprint = hashlib.sha256(f"{client_ip}|{user_agent}".encode("utf-8")).hexdigest()[:16]
-            session_id = f"anon:{anon_fingerprint}"
+        try:
+            requested = requested_timeout(request.headers)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        session_id = resolve_session_id(request, request_data)
 
         # Get or create session state
-        http_sessions = app.state.http_sessions
-        if session_id not in http_sessions:
-            http_sessions[session_id] = {"initialized": False}
-        sess_state = http_sessions[session_id]
+        sess_state = app.state.http_sessions.get(session_id)
+        passthrough = getattr(app.state, "passthrough", False)
+        resource_cache = getattr(app.state, "resource_cache", None)
 
-        try:
-            # Extract method and params from MCP request
-            method = request_data.get("method")
-            params = request_data.get("params", {})
-            req_id = request_data.get("id")
-
-            if method == "initialize":
-                # Mark session as initialized
-                sess_state["initialized"] = True
-                # Return MCP-compliant initialize result; include sessionId for clients that want to persist it
-                return {
-                    "jsonrpc": "2.0",
-                    "id": req_id,
-                    "result": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {"tools": {}},
-                        "serverInfo": {"name": app.title, "version": "1.0"},
-                        "sessionId": session_id,
-                    },
-                }
-
-            elif method == "notifications/initialized":
-                # JSON-RPC notification from client. No response body should be returned if there's no id.
-                # We'll mark the session and return 204 No Content for true notifications (no id).
-                sess_state["initialized"] = True
-                if req_id is None:
-                    return Response(status_code=204)
-                # If an id was sent (non-standard), acknowledge with empty result to be lenient
-                return {"jsonrpc": "2.0", "id": req_id, "result": {}}
-
-            elif method == "tools/list":
-                # Enforce MCP: require initialize first
-                if not sess_state["initialized"]:
+        async def handle(message: Dict[str, Any], progress_callback=None):
+            try:
+                # Extract method and params from MCP request
+                method = message.get("method")
+                params = message.get("params") or {}
+                req_id = message.get("id")
+
+                if method == "initialize" and passthrough:
+                    sess_state.initialized = True
+                    # Advertise what the server itself supports (resources, prompts, ...)
+                    upstream = await upstream_initialize_result(app, session_id)
                     return {
                         "jsonrpc": "2.0",
                         "id": req_id,
-                        "error": {
-                            "code": -32000,
-                            "message": "Bad Request: Server not initialized"
-                        }
+                        "result": {
+                            "protocolVersion": upstream.get("protocolVersion", "2024-11-05"),
+                            "capabilities": upstream.get("capabilities", {"tools": {}}),
+                            "serverInfo": upstream.get("serverInfo", {"name": app.title, "version": "1.0"}),
+                            "sessionId": session_id,
+                        },
                     }
-                result = await session.list_tools()
-                return {
-                    "jsonrpc": "2.0",
-                    "id": req_id,
-                    "result": {
-                        "tools": [
-                            {
-                                "name": tool.name,
-                                "description": tool.description,
-                                "inputSchema": tool.inputSchema,
-                            }
-                            for tool in result.tools
-                        ]
-                    },
-                }
-
-            elif method == "tools/call":
-                # Enforce MCP: require initialize first
-                if not sess_state["initialized"]:
+
+                elif method == "initialize":
+                    # Mark session as initialized
+                    sess_state.initialized = True
+                    capabilities = {"tools": {}}
+                    upstream = await upstream_initialize_result(app, session_id)
+                    if "resources" in upstream.get("capabilities", {}):
+                        # Proxied, but subscriptions stay with the gateway
+                        capabilities["resources"] = {}
+                    # Return MCP-compliant initialize result; include sessionId for clients that want to persist it
                     return {
                         "jsonrpc": "2.0",
                         "id": req_id,
-                        "error": {
-                            "code": -32000,
-                            "message": "Bad Request: Server not initialized"
-                        }
+                        "result": {
+                            "protocolVersion": "2024-11-05",
+                            "capabilities": capabilities,
+                            "serverInfo": {"name": app.title, "version": "1.0"},
+                            "sessionId": session_id,
+                        },
                     }
-                tool_name = params.get("name")
-                if "arguments" in params:
-                    arguments = params["arguments"]
-                    if arguments is None or arguments == {}:
-                        result = await session.call_tool(tool_name)
-                    else:
-                        result = await session.call_tool(tool_name, arguments=arguments)
-                else:
-                    result = await session.call_tool(tool_name)
-                return {
-                    "jsonrpc": "2.0",
-                    "id": req_id,
-                    "result": {
-                        "content": [
-                            {"type": content.type, "text": content.text}
-                            if hasattr(content, 'text') else {"type": content.type}
-                            for content in result.content
-                        ]
-                    },
-                }
-            else:
+
+                elif method == "notifications/initialized":
+                    # JSON-RPC notification from client. No response body should be returned if there's no id.
+                    sess_state.initialized = True
+                    if req_id is None:
+                        return None
+                    # If an id was sent (non-standard), acknowledge with empty result to be lenient
+                    return {"jsonrpc": "2.0", "id": req_id, "result": {}}
+
+                elif is_client_notification(message):
+                    # Other client notifications need no reply
+                    return None
+
+                elif method in PROXIED_METHODS and not sess_state.initialized:
+                    # Enforce MCP: require initialize first
+                    return jsonrpc_error(req_id, -32000, "Bad Request: Server not initialized")
+
+                elif passthrough and method != "ping" and not sess_state.initialized:
+                    return jsonrpc_error(req_id, -32000, "Bad Request: Server not initialized")
+
+                elif method == "tools/list" and not (passthrough and params.get("cursor")):
+                    result_bytes = await list_server_tools(app, session_id)
+                    return jsonrpc_result_bytes(req_id, result_bytes)
+
+                elif method == "resources/read" and (not passthrough or resource_cache is not None):
+                    if not isinstance(params.get("uri"), str):
+                        return jsonrpc_error(req_id, -32602, "Invalid params: 'uri' is required")
+                    return jsonrpc_result_bytes(req_id, await read_server_resource(app, session_id, params["uri"]))
+
+                elif passthrough and not (method == "tools/call" and uses_call_cache(app, params.get("name"))):
+                    # Anything else goes to the server verbatim: resources/*, prompts/*, ping, completion/complete...
+                    return await forward_raw(app, session_id, message, progress_callback)
+
+                elif method == "tools/call":
+                    return {
+                        "jsonrpc": "2.0",
+                        "id": req_id,
+                        "result": await call_server_tool(app, session_id, params, progress_callback),
+                    }
+
+                elif method in ("resources/list", "resources/templates/list"):
+                    async with lease_session(app, session_id) as session:
+                        if method == "resources/list":
+                            result = await session.list_resources(params.get("cursor"))
+                        else:
+                            result = await session.list_resource_templates(params.get("cursor"))
+                    return jsonrpc_result_bytes(req_id, dump_json(model_to_dict(result)))
+
                 # Unknown method: reply with JSON-RPC compliant error object (Method not found)
-                return {
-                    "jsonrpc": "2.0",
-                    "id": req_id,
-                    "error": {
-                        "code": -32601,
-                        "message": f"Method not found: {method}",
-                    },
-                }
+                return jsonrpc_error(req_id, -32601, f"Method not found: {method}")
 
-        except Exception as e:
-            logger.error(f"MCP proxy error: {e}")
-            # Propagate HTTPExceptions as-is; otherwise return 500
-            if isinstance(e, HTTPException):
-                raise e
-            raise HTTPException(status_code=500, detail=str(e))
+            except Exception as e:
+                return upstream_error_reply(req_id, e, "MCP proxy")
+
+        handle = bound_handler(handle, getattr(app.state, "deadlines", None), requested)
+        return await respond_jsonrpc(
+            request, request_data, handle, getattr(app.state, "metrics", None), app.state.server_name
+        )
+
+
+def mounted_servers(main_app: FastAPI) -> List[Tuple[str, FastAPI]]:
+    """Connected server sub-apps mounted on the main app, in mount order."""
+    servers = []
+    for route in main_app.router.routes:
+        if not isinstance(route, Mount) or not isinstance(route.app, FastAPI):
+            continue
+        state = route.app.state
+        if not hasattr(state, "server_name"):
+            continue
+        if getattr(state, "session", None) or getattr(state, "session_pool", None) is not None:
+            servers.append((state.server_name, route.app))
+    return servers
+
+
+def session_store_stats(main_app: FastAPI) -> Dict[str, Any]:
+    """Size and eviction counters of every HTTP session store, keyed by server ('hub' for /mcp)."""
+    stats = {}
+    for route in main_app.router.routes:
+        state = getattr(getattr(route, "app", None), "state", None)
+        store = getattr(state, "http_sessions", None)
+        if isinstance(store, SessionStore):
+            stats[state.server_name] = store.stats()
+    hub_sessions = getattr(main_app.state, "hub_sessions", None)
+    if isinstance(hub_sessions, SessionStore):
+        stats["hub"] = hub_sessions.stats()
+    return stats
+
+
+def result_cache_stats(main_app: FastAPI) -> Dict[str, Any]:
+    """Hit/miss counters of the tool result caches, keyed by server then tool."""
+    return {
+        server_name: {tool_name: cache.stats() for tool_name, cache in sub_app.state.result_caches.items()}
+        for server_name, sub_app in mounted_servers(main_app)
+        if getattr(sub_app.state, "result_caches", None)
+    }
+
+
+def resource_cache_stats(main_app: FastAPI) -> Dict[str, Any]:
+    """Hit/miss counters of the resource caches, keyed by server."""
+    return {
+        server_name: sub_app.state.resource_cache.stats()
+        for server_name, sub_app in mounted_servers(main_app)
+        if getattr(sub_app.state, "resource_cache", None) is not None
+    }
+
+
+def servers_health(main_app: FastAPI) -> Dict[str, Dict[str, Any]]:
+    """Cached health of every configured server, including the ones that failed to start."""
+    health = {}
+    for route in main_app.router.routes:
+        state = getattr(getattr(route, "app", None), "state", None)
+        if not isinstance(route, Mount) or not hasattr(state, "server_name"):
+            continue
+        health[state.server_name] = server_health(
+            getattr(state, "session_pool", None), getattr(state, "health_prober", None)
+        )
+    return health
+
+
+def add_health_endpoints(main_app: FastAPI):
+    """Liveness, readiness and per-server health, answered from cached state only."""
+
+    @main_app.get("/health")
+    async def health_check():
+        """Health check endpoint for container readiness"""
+        servers = servers_health(main_app)
+        return {
+            "status": "healthy" if all(s["status"] == "healthy" for s in servers.values()) else "degraded",
+            "service": "mcp-hub",
+            "servers": {name: s["status"] for name, s in servers.items()},
+            "sessions": session_store_stats(main_app),
+            "resultCache": result_cache_stats(main_app),
+            "resourceCache": resource_cache_stats(main_app),
+        }
+
+    @main_app.get("/health/live")
+    async def liveness():
+        """The gateway process is up and its event loop is responsive"""
+        return {"status": "alive"}
+
+    @main_app.get("/health/ready")
+    async def readiness():
+        """Every server can take requests, and the gateway is not shutting down"""
+        servers = servers_health(main_app)
+        shutdown_handler = getattr(main_app.state, "shutdown_handler", None)
+        shutting_down = shutdown_handler is not None and shutdown_handler.shutdown_event.is_set()
+        ready = not shutting_down and all(s["ready"] for s in servers.values())
+        body = {
+            "status": "ready" if ready else "not ready",
+            "servers": {name: s["status"] for name, s in servers.items()},
+        }
+        if shutting_down:
+            body["shuttingDown"] = True
+        return Response(content=fastjson.dumps(body), status_code=200 if ready else 503,
+                        media_type="application/json")
+
+    @main_app.get("/health/servers")
+    async def servers_detail():
+        """Per-server and per-replica health with the last probe results"""
+        return servers_health(main_app)
+
+    @main_app.get("/health/servers/{server_name}")
+    async def server_detail(server_name: str):
+        health = servers_health(main_app).get(server_name)
+        if health is None:
+            raise HTTPException(status_code=404, detail=f"Unknown server '{server_name}'")
+        return health
+
+
+def gateway_metrics(main_app: FastAPI) -> GatewayMetrics:
+    """The main app's metrics registry, created on first use with collectors for its live state."""
+    metrics = getattr(main_app.state, "metrics", None)
+    if metrics is None:
+        metrics = main_app.state.metrics = GatewayMetrics()
+        metrics.add_collector(lambda: collect_state_metrics(main_app))
+    return metrics
+
+
+def collect_state_metrics(main_app: FastAPI):
+    """Scrape-time gauges and counters read from session stores, pools, limiters and caches."""
+    sub_apps = [
+        route.app for route in main_app.router.routes
+        if isinstance(route, Mount) and hasattr(getattr(route.app, "state", None), "server_name")
+    ]
+
+    sessions = session_store_stats(main_app)
+    yield ("mcp_hub_sessions", "HTTP sessions held by the gateway.", "gauge", ("server",),
+           [("", (server,), stats["size"]) for server, stats in sessions.items()])
+    yield ("mcp_hub_session_evictions_total", "HTTP sessions evicted because the store was full.", "counter",
+           ("server",), [("", (server,), stats["evictions"]) for server, stats in sessions.items()])
+    yield ("mcp_hub_session_expirations_total", "HTTP sessions expired after being idle.", "counter",
+           ("server",), [("", (server,), stats["expirations"]) for server, stats in sessions.items()])
+
+    replicas, outstanding = [], []
+    for sub_app in sub_apps:
+        server = sub_app.state.server_name
+        pool = getattr(sub_app.state, "session_pool", None)
+        healthy = len(pool.healthy_replicas) if pool is not None else 0
+        replicas.append(("", (server, "configured"), getattr(sub_app.state, "replicas", 1)))
+        replicas.append(("", (server, "healthy"), healthy))
+        if pool is not None and pool.standby:
+            replicas.append(("", (server, "standby"), len(pool.ready_standbys)))
+        outstanding.append(("", (server,), pool.outstanding if pool is not None else 0))
+    yield ("mcp_hub_upstream_replicas", "Upstream server processes, configured, healthy and standing by.", "gauge",
+           ("server", "state"), replicas)
+    yield ("mcp_hub_upstream_outstanding", "Requests in flight to upstream server processes.", "gauge",
+           ("server",), outstanding)
+
+    cold_starts, idle_stops = [], []
+    for sub_app in sub_apps:
+        pool = getattr(sub_app.state, "session_pool", None)
+        if pool is not None and pool.lazy:
+            cold_starts.append(("", (sub_app.state.server_name,), pool.cold_starts))
+            idle_stops.append(("", (sub_app.state.server_name,), pool.idle_stops))
+    yield ("mcp_hub_upstream_cold_starts_total", "On-demand starts of lazy servers.", "counter",
+           ("server",), cold_starts)
+    yield ("mcp_hub_upstream_idle_stops_total", "Lazy servers stopped after being idle.", "counter",
+           ("server",), idle_stops)
+
+    promotions = [
+        ("", (sub_app.state.server_name,), sub_app.state.session_pool.promotions)
+        for sub_app in sub_apps
+        if getattr(sub_app.state, "session_pool", None) is not None and sub_app.state.session_pool.standby
+    ]
+    yield ("mcp_hub_upstream_standby_promotions_total", "Standby processes promoted to replace exited ones.",
+           "counter", ("server",), promotions)
+
+    limits, queued, rejected = [], [], []
+    for sub_app in sub_apps:
+        admission = getattr(sub_app.state, "admission", None)
+        stats = admission.stats() if admission is not None else {}
+        scopes = ([("*", stats["server"])] if "server" in stats else []) + list(stats.get("tools", {}).items())
+        for tool, limiter in scopes:
+            labels = (sub_app.state.server_name, tool)
+            limits.append(("", labels, limiter["limit"]))
+            queued.append(("", labels, limiter["queued"]))
+            rejected.append(("", labels + ("queue_full",), limiter["rejected"]))
+            rejected.append(("", labels + ("queue_timeout",), limiter["timedOut"]))
+    yield ("mcp_hub_admission_limit", "Current in-flight limit of a concurrency limiter.", "gauge",
+           ("server", "tool"), limits)
+    yield ("mcp_hub_admission_queued", "Calls waiting for a concurrency limiter slot.", "gauge",
+           ("server", "tool"), queued)
+    yield ("mcp_hub_admission_rejected_total", "Calls rejected by admission control.", "counter",
+           ("server", "tool", "reason"), rejected)
+
+    catalog = []
+    for sub_app in sub_apps:
+        tools_cache = getattr(sub_app.state, "tools_cache", None)
+        if tools_cache is not None:
+            catalog.append(("", (sub_app.state.server_name, "hit"), tools_cache.hits))
+            catalog.append(("", (sub_app.state.server_name, "miss"), tools_cache.misses))
+    yield ("mcp_hub_tools_cache_requests_total", "tools/list catalog cache lookups.", "counter",
+           ("server", "result"), catalog)
+
+    results = []
+    for server, tools in result_cache_stats(main_app).items():
+        for tool, stats in tools.items():
+            results.append(("", (server, tool, "hit"), stats["hits"]))
+            results.append(("", (server, tool, "disk_hit"), stats["diskHits"]))
+            results.append(("", (server, tool, "miss"), stats["misses"]))
+    yield ("mcp_hub_result_cache_requests_total", "Tool result cache lookups.", "counter",
+           ("server", "tool", "result"), results)
+
+    resources = []
+    for server, stats in resource_cache_stats(main_app).items():
+        resources.append(("", (server, "hit"), stats["hits"]))
+        resources.append(("", (server, "miss"), stats["misses"]))
+    yield ("mcp_hub_resource_cache_requests_total", "resources/read cache lookups.", "counter",
+           ("server", "result"), resources)
+
+
+class HubDeadlines(Deadlines):
+    """Deadlines of the aggregated endpoint, taken from the servers behind it.
+
+    A call gets the deadline of the server and tool it is routed to. A ``tools/list``
+    (or a call to a tool not indexed yet) may reach every server, so it gets the
+    longest server-wide deadline, and none when any server is unbounded.
+    """
+
+    def __init__(self, main_app: FastAPI):
+        super().__init__()
+        self.main_app = main_app
+
+    def limit(self, tool_name: Optional[str] = None) -> Optional[float]:
+        if tool_name is not None:
+            route = self.main_app.state.hub_catalog.resolve(tool_name)
+            if route is not None:
+                _, sub_app, local_name = route
+                return (getattr(sub_app.state, "deadlines", None) or Deadlines()).limit(local_name)
+        limits = [
+            (getattr(sub_app.state, "deadlines", None) or Deadlines()).default
+            for _, sub_app in mounted_servers(self.main_app)
+        ]
+        if not limits or None in limits:
+            return None
+        return max(limits)
+
+
+def create_hub_endpoint(main_app: FastAPI, path_prefix: str, api_dependency=None,
+                        page_size: int = DEFAULT_PAGE_SIZE, session_store: Optional[SessionStore] = None):
+    """Create the aggregated MCP endpoint that exposes the tools of every mounted server."""
+    from fastapi import Request
+
+    main_app.state.hub_catalog = AggregatedCatalog(page_size=page_size)
+    main_app.state.hub_deadlines = HubDeadlines(main_app)
+    main_app.state.hub_sessions = session_store or SessionStore()
+    dependencies = [Depends(api_dependency)] if api_dependency else None
+
+    async def fetch_tools(sub_app: FastAPI) -> List[Dict[str, Any]]:
+        return server_tools_from(sub_app, await list_server_tools(sub_app))
+
+    @main_app.post(f"{path_prefix}mcp", dependencies=dependencies)
+    async def mcp_hub_proxy(request: Request):
+        """Aggregated MCP endpoint: one session and one catalog for all servers."""
+        request_data = parse_jsonrpc_body(await request.body())
+        if isinstance(request_data, Response):
+            return request_data
+        catalog: AggregatedCatalog = main_app.state.hub_catalog
+        try:
+            requested = requested_timeout(request.headers)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        session_id = resolve_session_id(request, request_data)
+        sess_state = main_app.state.hub_sessions.get(session_id)
+
+        async def handle(message: Dict[str, Any], progress_callback=None):
+            method = message.get("method")
+            params = message.get("params") or {}
+            req_id = message.get("id")
+
+            try:
+                if method == "initialize":
+                    sess_state.initialized = True
+                    return {
+                        "jsonrpc": "2.0",
+                        "id": req_id,
+                        "result": {
+                            "protocolVersion": "2024-11-05",
+                            "capabilities": {"tools": {}},
+                            "serverInfo": {"name": main_app.title, "version": main_app.version},
+                            "sessionId": session_id,
+                        },
+                    }
+
+                elif method == "notifications/initialized":
+                    sess_state.initialized = True
+                    if req_id is None:
+                        return None
+                    return {"jsonrpc": "2.0", "id": req_id, "result": {}}
+
+                elif is_client_notification(message):
+                    return None
+
+                elif method in ("tools/list", "tools/call") and not sess_state.initialized:
+                    return jsonrpc_error(req_id, -32000, "Bad Request: Server not initialized")
+
+                elif method == "tools/list":
+                    await catalog.refresh(mounted_servers(main_app), fetch_tools)
+                    try:
+                        result_bytes = catalog.page(params.get("cursor"))
+                    except InvalidCursorError as e:
+                        return jsonrpc_error(req_id, -32602, str(e))
+                    return jsonrpc_result_bytes(req_id, result_bytes)
+
+                elif method == "tools/call":
+                    name = params.get("name")
+                    route = catalog.resolve(name)
+                    if route is None:
+                        # The index may be stale (server added, reloaded or tools changed)
+                        await catalog.refresh(mounted_servers(main_app), fetch_tools)
+                        route = catalog.resolve(name)
+                    if route is None:
+                        return jsonrpc_error(req_id, -32602, f"Unknown tool: {name}")
+                    server_name, sub_app, tool_name = route
+                    try:
+                        result = await call_server_tool(
+                            sub_app, session_id, {**params, "name": tool_name}, progress_callback
+                        )
+                    except NoHealthyReplicaError as e:
+                        # One server being down doesn't make the whole hub unavailable
+                        return jsonrpc_error(req_id, -32000, str(e))
+                    return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+                return jsonrpc_error(req_id, -32601, f"Method not found: {method}")
+
+            except Exception as e:
+                return upstream_error_reply(req_id, e, "MCP hub")
+
+        handle = bound_handler(handle, main_app.state.hub_deadlines, requested)
+        return await respond_jsonrpc(request, request_data, handle, getattr(main_app.state, "metrics", None), "hub")
 
 
 def mount_config_servers(main_app: FastAPI, config_data: Dict[str, Any],
@@ -269,111 +1100,307 @@ def mount_config_servers(main_app: FastAPI, config_data: Dict[str, Any],
                         api_dependency, connection_timeout, lifespan, path_prefix: str):
     """Mount MCP servers from config data."""
     mcp_servers = config_data.get("mcpServers", {})
+    gateway_cfg = config_data.get("gateway", {})
+
+    result_store = open_result_store(main_app, gateway_cfg)
+    if result_store is not None:
+        main_app.state.result_store = result_store
+    metrics = gateway_metrics(main_app)
 
     logger.info("Configuring MCP Servers:")
     for server_name, server_cfg in mcp_servers.items():
         sub_app = create_sub_app(
             server_name, server_cfg, cors_allow_origins, api_key,
-            strict_auth, api_dependency, connection_timeout, lifespan
+            strict_auth, api_dependency, connection_timeout, lifespan, result_store
         )
+        sub_app.state.http_sessions = create_session_store(gateway_cfg)
+        sub_app.state.metrics = metrics
         main_app.mount(f"{path_prefix}{server_name}/mcp", sub_app)
 
 
-def unmount_servers(main_app: FastAPI, path_prefix: str, server_names: list):
-    """Unmount specific MCP servers."""
-    for server_name in server_names:
-        mount_path = f"{path_prefix}{server_name}/mcp"
-        # Find and remove the mount
-        routes_to_remove = []
-        for route in main_app.router.routes:
-            if hasattr(route, 'path') and route.path == mount_path:
-                routes_to_remove.append(route)
+def unmount_servers(main_app: FastAPI, path_prefix: str, server_names: list) -> List[FastAPI]:
+    """Unmount specific MCP servers and return their sub-apps.
+
+    The route table is replaced rather than edited in place, so requests that are
+    being routed concurrently never see a half-updated list.
+    """
+    removed_paths = {f"{path_prefix}{server_name}/mcp" for server_name in server_names}
+    kept, removed = [], []
+    for route in main_app.router.routes:
+        (removed if getattr(route, "path", None) in removed_paths else kept).append(route)
+    main_app.router.routes = kept
 
-        for route in routes_to_remove:
-            main_app.router.routes.remove(route)
-            logger.info(f"Unmounted server: {server_name}")
+    for route in removed:
+        tools_cache = getattr(getattr(route.app, "state", None), "tools_cache", None)
+        if tools_cache is not None:
+            tools_cache.invalidate()
+        logger.info(f"Unmounted server: {route.path}")
+    return [route.app for route in removed]
 
 
 async def reload_config_handler(main_app: FastAPI, new_config_data: Dict[str, Any]):
-    """Handle config reload by comparing and updating mounted servers."""
-    old_config_data = getattr(main_app.state, 'config_data', {})
-    backup_routes = list(main_app.router.routes)  # Backup current routes for rollback
+    """Apply a new config with a blue/green swap of the servers that changed.
+
+    New and changed servers are created and, while the gateway is running, started and
+    handshaken in the background as the current servers keep serving. The route table
+    is then replaced in a single assignment (copy-on-write), so requests that were
+    already routed finish on the sub-app they started on. Replaced and removed servers
+    are drained and stopped afterwards; unchanged servers keep their processes and caches.
+    """
+    reload_lock = getattr(main_app.state, "reload_lock", None)
+    if reload_lock is None:
+        reload_lock = main_app.state.reload_lock = asyncio.Lock()
+
+    async with reload_lock:
+        try:
+            await swap_config_servers(main_app, new_config_data)
+        except Exception as e:
+            logger.error(f"Error during config reload, keeping previous configuration: {e}")
+            raise
 
-    try:
-        old_servers = set(old_config_data.get("mcpServers", {}).keys())
-        new_servers = set(new_config_data.get("mcpServers", {}).keys())
-
-        # Find servers to add, remove, and potentially update
-        servers_to_add = new_servers - old_servers
-        servers_to_remove = old_servers - new_servers
-        servers_to_check = old_servers & new_servers
-
-        # Get app configuration from state
-        cors_allow_origins = getattr(main_app.state, 'cors_allow_origins', ["*"])
-        api_key = getattr(main_app.state, 'api_key', None)
-        strict_auth = getattr(main_app.state, 'strict_auth', False)
-        api_dependency = getattr(main_app.state, 'api_dependency', None)
-        connection_timeout = getattr(main_app.state, 'connection_timeout', None)
-        lifespan = getattr(main_app.state, 'lifespan', None)
-        path_prefix = getattr(main_app.state, 'path_prefix', "/")
-
-        # Remove servers that are no longer in config
-        if servers_to_remove:
-            logger.info(f"Removing servers: {list(servers_to_remove)}")
-            unmount_servers(main_app, path_prefix, list(servers_to_remove))
-
-        # Check for configuration changes in existing servers
-        servers_to_update = []
-        for server_name in servers_to_check:
-            old_cfg = old_config_data["mcpServers"][server_name]
-            new_cfg = new_config_data["mcpServers"][server_name]
-            if old_cfg != new_cfg:
-                servers_to_update.append(server_name)
-
-        # Remove and re-add updated servers
-        if servers_to_update:
-            logger.info(f"Updating servers: {servers_to_update}")
-            unmount_servers(main_app, path_prefix, servers_to_update)
-            servers_to_add.update(servers_to_update)
-
-        # Add new servers and updated servers
-        if servers_to_add:
-            logger.info(f"Adding servers: {list(servers_to_add)}")
-            for server_name in servers_to_add:
-                server_cfg = new_config_data["mcpServers"][server_name]
-                try:
-                    sub_app = create_sub_app(
-                        server_name, server_cfg, cors_allow_origins, api_key,
-                        strict_auth, api_dependency, connection_timeout, lifespan
-                    )
-                    main_app.mount(f"{path_prefix}{server_name}/mcp", sub_app)
-                except Exception as e:
-                    logger.error(f"Failed to create server '{server_name}': {e}")
-                    # Rollback on failure
-                    main_app.router.routes = backup_routes
-                    raise
-
-        # Ensure servers present in new_config are mounted (covers cases where state had servers but mounts missing)
-        for server_name in new_servers:
-            mount_path = f"{path_prefix}{server_name}/mcp"
-            if not any(hasattr(route, 'path') and route.path == mount_path for route in main_app.router.routes):
-                logger.info(f"Mount missing for server '{server_name}', mounting now...")
-                server_cfg = new_config_data["mcpServers"][server_name]
-                sub_app = create_sub_app(
-                    server_name, server_cfg, cors_allow_origins, api_key,
-                    strict_auth, api_dependency, connection_timeout, lifespan
-                )
-                main_app.mount(mount_path, sub_app)
 
-        # Update stored config data only after successful reload
-        main_app.state.config_data = new_config_data
-        logger.info("Config reload completed successfully")
+async def swap_config_servers(main_app: FastAPI, new_config_data: Dict[str, Any]):
+    old_servers = getattr(main_app.state, 'config_data', {}).get("mcpServers", {})
+    new_servers = new_config_data.get("mcpServers", {})
+    gateway_cfg = new_config_data.get("gateway", {})
+
+    # Get app configuration from state
+    cors_allow_origins = getattr(main_app.state, 'cors_allow_origins', ["*"])
+    api_key = getattr(main_app.state, 'api_key', None)
+    strict_auth = getattr(main_app.state, 'strict_auth', False)
+    api_dependency = getattr(main_app.state, 'api_dependency', None)
+    connection_timeout = getattr(main_app.state, 'connection_timeout', None)
+    lifespan = getattr(main_app.state, 'lifespan', None)
+    path_prefix = getattr(main_app.state, 'path_prefix', "/")
+
+    mounted = {route.path: route for route in main_app.router.routes if isinstance(route, Mount)}
+
+    def mount_path(server_name: str) -> str:
+        return f"{path_prefix}{server_name}/mcp"
+
+    servers_to_remove = [name for name in old_servers if name not in new_servers]
+    server_runners = getattr(main_app.state, "server_runners", None)
+
+    def needs_start(name: str) -> bool:
+        # Changed servers, servers of the new config that are missing a mount and,
+        # while the gateway runs, mounted servers that never came up (failed at boot)
+        route = mounted.get(mount_path(name))
+        if old_servers.get(name) != new_servers[name] or route is None:
+            return True
+        return server_runners is not None and getattr(route.app.state, "session_pool", None) is None
+
+    servers_to_start = [name for name in new_servers if needs_start(name)]
+    if servers_to_remove:
+        logger.info(f"Removing servers: {servers_to_remove}")
+    if servers_to_start:
+        logger.info(f"Starting servers: {servers_to_start}")
+
+    old_result_store = getattr(main_app.state, "result_store", None)
+    result_store = open_result_store(main_app, gateway_cfg)
+    metrics = gateway_metrics(main_app)
+
+    # Build the green sub-apps; a failure here leaves the running config untouched
+    green: Dict[str, FastAPI] = {}
+    for server_name in servers_to_start:
+        try:
+            sub_app = create_sub_app(
+                server_name, new_servers[server_name], cors_allow_origins, api_key,
+                strict_auth, api_dependency, connection_timeout, lifespan, result_store
+            )
+        except Exception as e:
+            logger.error(f"Failed to create server '{server_name}': {e}")
+            if result_store is not None and result_store is not old_result_store:
+                result_store.close()
+            raise
+        # Keep client sessions of a replaced server so clients don't have to re-initialize
+        blue = mounted.get(mount_path(server_name))
+        http_sessions = getattr(getattr(blue.app, "state", None), "http_sessions", None) if blue else None
+        if http_sessions is None:
+            http_sessions = create_session_store(gateway_cfg)
+        sub_app.state.http_sessions = http_sessions
+        sub_app.state.metrics = metrics
+        green[server_name] = sub_app
+
+    # Warm up: start and handshake the new processes before they receive traffic
+    applied_servers = dict(new_servers)
+    if server_runners is not None and green:
+        spawn_semaphore = getattr(main_app.state, "spawn_semaphore", None)
+        http_pool = getattr(main_app.state, "http_pool", None)
+        runners = {name: ServerRunner(sub_app, spawn_semaphore, http_pool) for name, sub_app in green.items()}
+        errors = await asyncio.gather(*(runner.start() for runner in runners.values()))
+        for (server_name, runner), error in zip(runners.items(), errors):
+            if error is None:
+                server_runners[runner.sub_app] = runner
+                if mount_path(server_name) in mounted:
+                    metrics.upstream_restarts.labels(server_name).inc(runner.sub_app.state.replicas)
+                continue
+            # Keep serving the previous version (if any); the next reload retries
+            log_startup_failure(server_name, error)
+            del green[server_name]
+            if server_name in old_servers and mount_path(server_name) in mounted:
+                applied_servers[server_name] = old_servers[server_name]
+            else:
+                del applied_servers[server_name]
+
+    # Swap: build the new table aside and publish it with one assignment
+    retired: List[FastAPI] = []
+    green_by_path = {mount_path(name): sub_app for name, sub_app in green.items()}
+    new_routes = []
+    for route in main_app.router.routes:
+        if isinstance(route, Mount) and route.path in green_by_path:
+            retired.append(route.app)
+            new_routes.append(Mount(route.path, app=green_by_path.pop(route.path)))
+            continue
+        new_routes.append(route)
+    new_routes.extend(Mount(path, app=sub_app) for path, sub_app in green_by_path.items())
+    main_app.router.routes = new_routes
+    if servers_to_remove:
+        retired.extend(unmount_servers(main_app, path_prefix, servers_to_remove))
+
+    # Update stored config data only after a successful swap
+    main_app.state.config_data = {**new_config_data, "mcpServers": applied_servers}
+    hub_catalog = getattr(main_app.state, "hub_catalog", None)
+    if hub_catalog is not None:
+        hub_catalog.invalidate()
+
+    if result_store is not old_result_store:
+        swap_result_store(main_app, old_result_store, result_store, applied_servers, set(green.values()), retired)
+
+    for sub_app in retired:
+        tools_cache = getattr(sub_app.state, "tools_cache", None)
+        if tools_cache is not None:
+            tools_cache.invalidate()
+        if server_runners is not None and sub_app in server_runners:
+            drain_timeout = gateway_cfg.get("drainTimeout", DEFAULT_DRAIN_TIMEOUT)
+            track_drain(main_app, drain_server(server_runners, sub_app, drain_timeout))
+    logger.info("Config reload completed successfully")
+
+
+def swap_result_store(main_app: FastAPI, old_store: Optional[ResultStore], new_store: Optional[ResultStore],
+                      servers: Dict[str, Any], green: set, retired: List[FastAPI]):
+    """Move every server onto a new on-disk result store (or none) and close the old one."""
+    main_app.state.result_store = new_store
+    for route in main_app.router.routes:
+        sub_app = getattr(route, "app", None)
+        server_name = getattr(getattr(sub_app, "state", None), "server_name", None)
+        if isinstance(route, Mount) and sub_app not in green and server_name in servers:
+            # Servers kept running: their memory tier is rebuilt empty on top of the new store
+            sub_app.state.result_caches = create_result_caches(server_name, servers[server_name], new_store)
+    for sub_app in retired:
+        # Still draining: finish on the memory tier
+        for cache in getattr(sub_app.state, "result_caches", {}).values():
+            if cache.store is old_store:
+                cache.store = None
+    if old_store is not None:
+        old_store.close()
+
+
+def track_drain(main_app: FastAPI, coro):
+    """Run a drain in the background; the main lifespan cancels leftovers at shutdown."""
+    drain_tasks = getattr(main_app.state, "drain_tasks", None)
+    if drain_tasks is None:
+        drain_tasks = main_app.state.drain_tasks = set()
+    task = asyncio.create_task(coro)
+    drain_tasks.add(task)
+    task.add_done_callback(drain_tasks.discard)
+    return task
+
+
+async def drain_server(server_runners: Dict[FastAPI, "ServerRunner"], sub_app: FastAPI, timeout: float):
+    """Wait for the upstream requests of a retired server to finish, then stop it."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    pool = getattr(sub_app.state, "session_pool", None)
+    while pool is not None and pool.outstanding and loop.time() < deadline:
+        await asyncio.sleep(DRAIN_POLL_INTERVAL)
+    if pool is not None and pool.outstanding:
+        logger.warning(
+            f"Stopping '{sub_app.title}' with {pool.outstanding} request(s) still in flight after {timeout}s"
+        )
+    runner = server_runners.pop(sub_app, None)
+    if runner is not None:
+        await runner.stop()
+    logger.info(f"Drained and stopped '{sub_app.title}'")
+
+
+def log_startup_failure(server_name: str, e: BaseException):
+    """Log why a server failed to start, unpacking exception groups."""
+    error_class_name = type(e).__name__
+    if error_class_name == 'ExceptionGroup' or (hasattr(e, 'exceptions') and hasattr(e, 'message')):
+        logger.error(
+            f"Failed to establish connection for server: '{server_name}' - Multiple errors occurred:"
+        )
+        # Log each individual exception from the group
+        exceptions = getattr(e, 'exceptions', [])
+        for idx, exc in enumerate(exceptions):
+            logger.error(f"  Error {idx + 1}: {type(exc).__name__}: {exc}")
+            # Also log traceback for each exception
+            if hasattr(exc, '__traceback__'):
+                import traceback
+                tb_lines = traceback.format_exception(type(exc), exc, exc.__traceback__)
+                for line in tb_lines:
+                    logger.debug(f"    {line.rstrip()}")
+    else:
+        logger.error(
+            f"Failed to establish connection for server: '{server_name}' - {type(e).__name__}: {e}",
+            exc_info=e
+        )
+
 
+async def hold_lifespan(lifespan_context, started: asyncio.Future, stop_event: asyncio.Event):
+    """Enter a sub-app lifespan in its own task and keep it open until ``stop_event`` is set.
+
+    The outcome of entering the lifespan is reported through ``started`` so that the
+    caller can start many servers concurrently and still isolate failures per server.
+    """
+    try:
+        async with lifespan_context:
+            started.set_result(None)
+            await stop_event.wait()
     except Exception as e:
-        logger.error(f"Error during config reload, keeping previous configuration: {e}")
-        # Ensure we're back to the original state
-        main_app.router.routes = backup_routes
-        raise
+        if not started.done():
+            started.set_exception(e)
+        else:
+            logger.error(f"Error while shutting down server: {type(e).__name__}: {e}")
+    finally:
+        if not started.done():
+            started.set_exception(RuntimeError("Server startup was cancelled"))
+
+
+class ServerRunner:
+    """Holds the lifespan of one mounted sub-app open in a background task."""
+
+    def __init__(self, sub_app: FastAPI, spawn_semaphore: Optional[asyncio.Semaphore] = None,
+                 http_pool: Optional[HttpPool] = None):
+        self.sub_app = sub_app
+        self.stop_event = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        if spawn_semaphore is not None:
+            sub_app.state.spawn_semaphore = spawn_semaphore
+        if http_pool is not None:
+            sub_app.state.http_pool = http_pool
+
+    async def start(self) -> Optional[BaseException]:
+        """Enter the lifespan and wait until it is up; returns the startup error, if any."""
+        started = asyncio.get_running_loop().create_future()
+        lifespan_context = self.sub_app.router.lifespan_context(self.sub_app)
+        self.task = asyncio.create_task(hold_lifespan(lifespan_context, started, self.stop_event))
+        await asyncio.wait([started])
+        return started.exception()
+
+    async def stop(self):
+        self.stop_event.set()
+        if self.task is not None:
+            await asyncio.gather(self.task, return_exceptions=True)
+
+
+async def stop_servers(app: FastAPI):
+    """Stop every held sub-app lifespan, including servers started by a reload."""
+    for task in list(getattr(app.state, "drain_tasks", ())):
+        task.cancel()
+    runners = app.state.server_runners
+    app.state.server_runners = None
+    await asyncio.gather(*(runner.stop() for runner in runners.values()), return_exceptions=True)
 
 
 @asynccontextmanager
@@ -389,54 +1416,54 @@ async def lifespan(app: FastAPI):
     # Get shutdown handler from app state
     shutdown_handler = getattr(app.state, "shutdown_handler", None)
 
-    is_main_app = not command  # Main app doesn't have command
+    url = getattr(app.state, "url", None)
+    is_main_app = not command and not url  # Main app has neither a command nor a url
 
     if is_main_app:
         async with AsyncExitStack() as stack:
             successful_servers = []
             failed_servers = []
 
-            sub_lifespans = [
-                (route.app, route.app.router.lifespan_context(route.app))
-                for route in app.routes
+            sub_apps = [
+                route.app for route in app.routes
                 if isinstance(route, Mount) and isinstance(route.app, FastAPI)
             ]
 
-            for sub_app, lifespan_context in sub_lifespans:
+            # All servers start concurrently; the semaphore bounds how many processes
+            # are cold-starting at any moment so the host CPU doesn't thrash.
+            max_spawns = getattr(app.state, "max_concurrent_spawns", None) or DEFAULT_MAX_CONCURRENT_SPAWNS
+            spawn_semaphore = asyncio.Semaphore(max_spawns)
+            app.state.spawn_semaphore = spawn_semaphore
+            # Keep-alive connections to remote servers, shared by all of them
+            http_pool = getattr(app.state, "http_pool", None)
+            if http_pool is None:
+                http_pool = app.state.http_pool = HttpPool()
+            # Registered first so it closes after the servers using it have stopped
+            stack.push_async_callback(http_pool.aclose)
+            runners = []
+            for sub_app in sub_apps:
+                logger.info(f"Initiating connection for server: '{sub_app.title}'...")
+                runners.append(ServerRunner(sub_app, spawn_semaphore, http_pool))
+            # Reloads register the servers they start here so shutdown stops them too
+            app.state.server_runners = {runner.sub_app: runner for runner in runners}
+            stack.push_async_callback(stop_servers, app)
+            # Closes whichever store is open at shutdown, including one a reload opened
+            stack.callback(close_result_store, app)
+
+            errors = await asyncio.gather(*(runner.start() for runner in runners))
+
+            for sub_app, error in zip(sub_apps, errors):
                 server_name = sub_app.title
-                logger.info(f"Initiating connection for server: '{server_name}'...")
-                try:
-                    await stack.enter_async_context(lifespan_context)
-                    is_connected = getattr(sub_app.state, "is_connected", False)
-                    if is_connected:
-                        logger.info(f"Successfully connected to '{server_name}'.")
-                        successful_servers.append(server_name)
-                    else:
-                        logger.warning(
-                            f"Connection attempt for '{server_name}' finished, but status is not 'connected'."
-                        )
-                        failed_servers.append(server_name)
-                except Exception as e:
-                    error_class_name = type(e).__name__
-                    if error_class_name == 'ExceptionGroup' or (hasattr(e, 'exceptions') and hasattr(e, 'message')):
-                        logger.error(
-                            f"Failed to establish connection for server: '{server_name}' - Multiple errors occurred:"
-                        )
-                        # Log each individual exception from the group
-                        exceptions = getattr(e, 'exceptions', [])
-                        for idx, exc in enumerate(exceptions):
-                            logger.error(f"  Error {idx + 1}: {type(exc).__name__}: {exc}")
-                            # Also log traceback for each exception
-                            if hasattr(exc, '__traceback__'):
-                                import traceback
-                                tb_lines = traceback.format_exception(type(exc), exc, exc.__traceback__)
-                                for line in tb_lines:
-                                    logger.debug(f"    {line.rstrip()}")
-                    else:
-                        logger.error(
-                            f"Failed to establish connection for server: '{server_name}' - {type(e).__name__}: {e}",
-                            exc_info=True
-                        )
+                if error is not None:
+                    log_startup_failure(server_name, error)
+                    failed_servers.append(server_name)
+                elif getattr(sub_app.state, "is_connected", False):
+                    logger.info(f"Successfully connected to '{server_name}'.")
+                    successful_servers.append(server_name)
+                else:
+                    logger.warning(
+                        f"Connection attempt for '{server_name}' finished, but status is not 'connected'."
+                    )
                     failed_servers.append(server_name)
 
             logger.info("\n--- Server Startup Summary ---")
@@ -461,50 +1488,84 @@ async def lifespan(app: FastAPI):
             # The AsyncExitStack will handle the graceful shutdown of all servers
             # when the 'with' block is exited.
     else:
-        # This is a sub-app's lifespan - stdio only
+        # This is a sub-app's lifespan: a local stdio server or a remote one
         app.state.is_connected = False
+        private_http_pool = None
         try:
-            server_params = StdioServerParameters(
-                command=command,
-                args=args,
-                env={**os.environ, **env},
+            notify_cancelled = getattr(app.state, "notify_cancelled", True)
+            if url:
+                # Each replica is its own session over the gateway's pooled HTTP connections
+                http_pool = getattr(app.state, "http_pool", None)
+                if http_pool is None:
+                    http_pool = private_http_pool = HttpPool()
+                session_factory = remote_session_factory(
+                    url, app.state.transport, http_pool,
+                    headers=getattr(app.state, "headers", None), notify_cancelled=notify_cancelled,
+                )
+            else:
+                server_params = StdioServerParameters(
+                    command=command,
+                    args=args,
+                    env={**os.environ, **env},
+                )
+                # Each replica is its own process with its own handshaken session
+                passthrough = getattr(app.state, "passthrough", False)
+                session_factory = (raw_stdio_session_factory if passthrough else stdio_session_factory)(
+                    server_params, notify_cancelled=notify_cancelled
+                )
+            pool = SessionPool(
+                app.title,
+                session_factory,
+                replicas=getattr(app.state, "replicas", 1),
+                policy=getattr(app.state, "load_balancing", DEFAULT_POLICY),
+                sticky=getattr(app.state, "sticky_sessions", False),
+                spawn_semaphore=getattr(app.state, "spawn_semaphore", None),
+                lazy=getattr(app.state, "lazy", False),
+                idle_timeout=getattr(app.state, "idle_timeout", None),
+                standby=getattr(app.state, "standby", 0),
+                restart=getattr(app.state, "restart_policy", None),
             )
-            client_context = stdio_client(server_params)
-
-            async with client_context as (reader, writer, *_):
-                async with ClientSession(reader, writer) as session:
-                    # Perform MCP handshake before any requests
-                    # Some servers (notably Python FastMCP-based) strictly
-                    # require initialize to be called prior to tools/list or other methods.
-                    await session.initialize()
-                    app.state.session = session
-                    app.state.is_connected = True
-                    yield
+            tools_cache = getattr(app.state, "tools_cache", None)
+            if tools_cache is not None:
+                pool.add_notification_listener(tools_cache.on_notification)
+            resource_cache = getattr(app.state, "resource_cache", None)
+            if resource_cache is not None:
+                pool.add_notification_listener(resource_cache.on_notification)
+                pool.add_exit_listener(resource_cache.on_exit)
+                pool.add_idle_stop_listener(lambda pool: resource_cache.reset_subscriptions())
+            metrics = getattr(app.state, "metrics", None)
+            if metrics is not None:
+                server_label = getattr(app.state, "server_name", app.title)
+                upstream_exits = metrics.upstream_exits.labels(server_label)
+                upstream_restarts = metrics.upstream_restarts.labels(server_label)
+                pool.add_exit_listener(lambda replica: upstream_exits.inc())
+                pool.add_restart_listener(lambda replica: upstream_restarts.inc())
+            await pool.start()
+            prober = HealthProber.from_config(pool, getattr(app.state, "health_check", None))
+            if prober is not None:
+                prober.start()
+            app.state.session_pool = pool
+            app.state.health_prober = prober
+            app.state.session = pool.session
+            app.state.is_connected = True
+            try:
+                yield
+            finally:
+                app.state.is_connected = False
+                app.state.session_pool = None
+                app.state.session = None
+                if prober is not None:
+                    await prober.stop()
+                await pool.stop()
         except Exception as e:
             # Log the full exception with traceback for debugging
             logger.error(f"Failed to connect to MCP server '{app.title}': {type(e).__name__}: {e}", exc_info=True)
             app.state.is_connected = False
             # Re-raise the exception so it propagates to the main app's lifespan
             raise
-
-
-# Compatibility shim: allow asyncio.create_task to be called outside a running loop
-_original_asyncio_create_task = getattr(asyncio, 'create_task', None)
-
-def _create_task_compat(coro, *args, **kwargs):
-    try:
-        # If there's a running loop, delegate to the original
-        asyncio.get_running_loop()
-        return _original_asyncio_create_task(coro, *args, **kwargs)
-    except RuntimeError:
-        # No running loop: create a new event loop and set it for the current thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        return loop.create_task(coro, *args, **kwargs)
-
-# Patch only if not already patched
-if getattr(asyncio, 'create_task', None) is not _create_task_compat:
-    asyncio.create_task = _create_task_compat
+        finally:
+            if private_http_pool is not None:
+                await private_http_pool.aclose()
 
 
 # Apply filter to suppress HTTP request logs
@@ -562,6 +1623,10 @@ async def run(
     ssl_certfile = kwargs.get("ssl_certfile")
     ssl_keyfile = kwargs.get("ssl_keyfile")
     path_prefix = kwargs.get("path_prefix") or "/"
+    max_concurrent_spawns = kwargs.get("max_concurrent_spawns")
+    # Event loop and uvicorn tuning; the CLI builds it before the loop starts
+    runtime = kwargs.get("runtime")
+    runtime_cfg: Dict[str, Any] = {}
 
     # Configure basic logging
     logging.basicConfig(
@@ -598,11 +1663,12 @@ async def run(
     main_app.state.shutdown_handler = shutdown_handler
     main_app.state.path_prefix = path_prefix
 
-    # Add health check endpoint
-    @main_app.get("/health")
-    async def health_check():
-        """Health check endpoint for container readiness"""
-        return {"status": "healthy", "service": "mcp-hub"}
+    add_health_endpoints(main_app)
+
+    @main_app.get("/metrics")
+    async def metrics_endpoint():
+        """Prometheus metrics"""
+        return Response(content=gateway_metrics(main_app).render(), media_type=METRICS_CONTENT_TYPE)
 
     main_app.add_middleware(
         CORSMiddleware,
@@ -628,10 +1694,21 @@ async def run(
     elif config_path:
         logger.info(f"Loading MCP server configurations from: {config_path}")
         config_data = load_config(config_path)
+        gateway_cfg = config_data.get("gateway", {})
+        max_concurrent_spawns = max_concurrent_spawns or gateway_cfg.get("maxConcurrentSpawns")
+        main_app.state.http_pool = HttpPool.from_config(gateway_cfg.get("httpPool"))
+        runtime_cfg = gateway_cfg.get("runtime", {})
         mount_config_servers(
             main_app, config_data, cors_allow_origins, api_key, strict_auth,
             api_dependency, connection_timeout, lifespan, path_prefix
         )
+        if gateway_cfg.get("hubEndpoint", True):
+            create_hub_endpoint(
+                main_app, path_prefix, api_dependency,
+                page_size=gateway_cfg.get("hubPageSize", DEFAULT_PAGE_SIZE),
+                session_store=create_session_store(gateway_cfg),
+            )
+            logger.info(f"  Aggregated hub endpoint: {path_prefix}mcp")
 
         # Store config info and app state for hot reload
         main_app.state.config_path = config_path
@@ -647,10 +1724,24 @@ async def run(
         logger.error("MCP Hub server_command or config_path must be provided.")
         raise ValueError("You must provide either server_command or config.")
 
+    main_app.state.max_concurrent_spawns = max_concurrent_spawns or DEFAULT_MAX_CONCURRENT_SPAWNS
+    logger.info(f"  Max Concurrent Spawns: {main_app.state.max_concurrent_spawns}")
+
+    if runtime is None:
+        runtime = RuntimeProfile.from_config(runtime_cfg, profile=kwargs.get("runtime_profile"))
+    logger.info(f"  Runtime Profile: {runtime.describe()}")
+    if not running_loop_matches(runtime):
+        logger.warning(
+            f"Runtime profile '{runtime.name}' asks for another event loop setup than the running one; "
+            "start the gateway through RuntimeProfile.run() to apply it"
+        )
+
     # Setup hot reload if enabled and config_path is provided
     config_watcher = None
     if hot_reload and config_path:
         logger.info(f"Enabling hot reload for config file: {config_path}")
+        # Imported here: watchdog is only needed with hot reload
+        from mcp_hub.utils.config_watcher import ConfigWatcher
 
         async def reload_callback(new_config):
             await reload_config_handler(main_app, new_config)
@@ -659,6 +1750,7 @@ async def run(
         config_watcher.start()
 
     logger.info("Uvicorn server starting...")
+    import uvicorn
     config = uvicorn.Config(
         app=main_app,
         host=host,
@@ -666,6 +1758,7 @@ async def run(
         ssl_certfile=ssl_certfile,
         ssl_keyfile=ssl_keyfile,
         log_level="info",
+        **runtime.uvicorn_options(),
     )
     server = uvicorn.Server(config)
 
@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, Deque, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+# JSON-RPC error code used when a request is rejected by admission control
+OVERLOADED_ERROR_CODE = -32029
+
+# AIMD tuning: latency above LATENCY_TOLERANCE x the observed baseline counts as congestion
+LATENCY_TOLERANCE = 2.0
+DECREASE_FACTOR = 0.9
+BASELINE_DECAY = 0.01
+LATENCY_SMOOTHING = 0.2
+
+
+class OverloadedError(RuntimeError):
+    """Raised when a request cannot be admitted: the queue is full or the wait timed out."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """Bounds in-flight calls with a FIFO wait queue of bounded length and wait time.
+
+    With ``adaptive`` set, the in-flight limit moves between 1 and ``max_in_flight``
+    AIMD style: every call that completes near the baseline latency grows it by
+    ``1/limit`` (about +1 per full window), and a call slower than
+    ``LATENCY_TOLERANCE`` times the baseline shrinks it by ``DECREASE_FACTOR``, at most
+    once per window of completions.
+    """
+
+    def __init__(self, name: str, max_in_flight: int, max_queue: int = 0,
+                 max_queue_wait: Optional[float] = None, adaptive: bool = False,
+                 clock=time.monotonic):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_queue_wait = max_queue_wait
+        self.adaptive = adaptive
+        self.limit = float(max_in_flight)
+        self.in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._clock = clock
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._baseline: Optional[float] = None
+        self._latency: Optional[float] = None
+        self._completions_since_decrease = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < max(1, int(self.limit))
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait: roughly the time to work off the queue."""
+        latency = self._latency or 1.0
+        window = max(1, int(self.limit))
+        return max(1, math.ceil(latency * (self.queued + window) / window))
+
+    def _reject(self, reason: str) -> OverloadedError:
+        return OverloadedError(f"Server overloaded: {self.name} {reason}", self.retry_after())
+
+    async def _admit(self):
+        if self._has_capacity() and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise self._reject("queue is full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_queue_wait)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was granted just as we gave up waiting: hand it back
+                self._release_slot()
+            else:
+                waiter.cancel()
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise self._reject("queue wait timed out") from None
+            raise
+
+    def _release_slot(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def _observe(self, latency: float):
+        self._latency = latency if self._latency is None else (
+            self._latency + LATENCY_SMOOTHING * (latency - self._latency)
+        )
+        if not self.adaptive:
+            return
+        # The baseline tracks the fastest recent latency and drifts up slowly
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        else:
+            self._baseline += BASELINE_DECAY * (latency - self._baseline)
+
+        self._completions_since_decrease += 1
+        if latency > LATENCY_TOLERANCE * self._baseline:
+            if self._completions_since_decrease >= self.limit:
+                self.limit = max(1.0, self.limit * DECREASE_FACTOR)
+                self._completions_since_decrease = 0
+        else:
+            self.limit = min(float(self.max_in_flight), self.limit + 1.0 / self.limit)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one in-flight slot for the duration of an upstream call."""
+        await self._admit()
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self._observe(self._clock() - started)
+            self._release_slot()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "inFlight": self.in_flight,
+            "queued": self.queued,
+            "limit": round(self.limit, 2),
+            "maxInFlight": self.max_in_flight,
+            "rejected": self.rejected,
+            "timedOut": self.timed_out,
+        }
+
+
+DEFAULT_MAX_QUEUE_WAIT = 30.0
+
+
+def validate_concurrency_config(where: str, cfg: Any) -> None:
+    """Validate a ``concurrency`` object of a server or of one of its tools."""
+    if not isinstance(cfg, dict):
+        raise ValueError(f"{where} 'concurrency' must be an object")
+
+    def is_int(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    max_in_flight = cfg.get("maxInFlight")
+    if not is_int(max_in_flight) or max_in_flight < 1:
+        raise ValueError(f"{where} 'concurrency.maxInFlight' must be a positive integer")
+    max_queue = cfg.get("maxQueue", max_in_flight)
+    if not is_int(max_queue) or max_queue < 0:
+        raise ValueError(f"{where} 'concurrency.maxQueue' must be a non-negative integer")
+    max_queue_wait = cfg.get("maxQueueWait", DEFAULT_MAX_QUEUE_WAIT)
+    if not isinstance(max_queue_wait, (int, float)) or isinstance(max_queue_wait, bool) or max_queue_wait <= 0:
+        raise ValueError(f"{where} 'concurrency.maxQueueWait' must be a positive number")
+    if not isinstance(cfg.get("adaptive", False), bool):
+        raise ValueError(f"{where} 'concurrency.adaptive' must be a boolean")
+
+
+def limiter_from_config(name: str, cfg: Optional[Dict[str, Any]]) -> Optional[ConcurrencyLimiter]:
+    if not cfg:
+        return None
+    return ConcurrencyLimiter(
+        name,
+        max_in_flight=cfg["maxInFlight"],
+        max_queue=cfg.get("maxQueue", cfg["maxInFlight"]),
+        max_queue_wait=cfg.get("maxQueueWait", DEFAULT_MAX_QUEUE_WAIT),
+        adaptive=cfg.get("adaptive", False),
+    )
+
+
+class AdmissionControl:
+    """Server-wide and per-tool concurrency limits of one server."""
+
+    def __init__(self, server: Optional[ConcurrencyLimiter] = None,
+                 tools: Optional[Dict[str, ConcurrencyLimiter]] = None):
+        self.server = server
+        self.tools = tools or {}
+
+    @classmethod
+    def from_config(cls, server_name: str, server_cfg: Dict[str, Any]) -> "AdmissionControl":
+        tools = {}
+        for tool_name, tool_cfg in (server_cfg.get("tools") or {}).items():
+            limiter = limiter_from_config(f"{server_name}/{tool_name}", tool_cfg.get("concurrency"))
+            if limiter is not None:
+                tools[tool_name] = limiter
+        return cls(limiter_from_config(server_name, server_cfg.get("concurrency")), tools)
+
+    @asynccontextmanager
+    async def admit(self, tool_name: Optional[str]):
+        """Hold the tool's slot, then the server's, for one upstream call.
+
+        The tool limit is taken first so a hot tool queues against itself instead of
+        occupying server-wide slots that other tools could use.
+        """
+        tool_limiter = self.tools.get(tool_name)
+        async with tool_limiter.slot() if tool_limiter else nullcontext():
+            async with self.server.slot() if self.server else nullcontext():
+                yield
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {}
+        if self.server is not None:
+            stats["server"] = self.server.stats()
+        if self.tools:
+            stats["tools"] = {name: limiter.stats() for name, limiter in self.tools.items()}
+        return stats
@@ -0,0 +1,131 @@
+import asyncio
+import base64
+import binascii
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from mcp_hub.utils.catalog import dump_json
+
+
+logger = logging.getLogger(__name__)
+
+
+NAMESPACE_SEPARATOR = "__"
+DEFAULT_PAGE_SIZE = 500
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a tools/list cursor was not issued by this catalog."""
+
+
+def encode_cursor(page: int) -> str:
+    return base64.urlsafe_b64encode(f"page:{page}".encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        prefix, _, page = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").partition(":")
+        if prefix != "page":
+            raise ValueError(cursor)
+        return int(page)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+
+
+class AggregatedCatalog:
+    """Merged tool catalog of every mounted server.
+
+    Tools are exposed as ``{server}{separator}{tool}`` and ``index`` maps each
+    namespaced name to ``(server_name, sub_app, tool_name)`` so that ``tools/call``
+    is routed with a single dict lookup. Names that collide (a separator inside a
+    server or tool name) keep the first server in mount order and skip the rest. The catalog is rebuilt only when the set
+    of servers or one of their catalog caches changes, and its pages are kept
+    pre-serialized.
+    """
+
+    def __init__(self, separator: str = NAMESPACE_SEPARATOR, page_size: int = DEFAULT_PAGE_SIZE):
+        self.separator = separator
+        self.page_size = page_size
+        self.index: Dict[str, Tuple[str, Any, str]] = {}
+        self.pages: List[bytes] = [dump_json({"tools": []})]
+        self.tool_count = 0
+        self._signature = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self._signature = None
+
+    @staticmethod
+    def _compute_signature(servers: List[Tuple[str, Any]]):
+        parts = []
+        for server_name, sub_app in servers:
+            cache = sub_app.state.tools_cache
+            # Expire TTL'd entries here so that the merged catalog notices them too
+            cache.get()
+            parts.append((server_name, id(sub_app), cache.generation))
+        return tuple(parts)
+
+    async def refresh(self, servers: List[Tuple[str, Any]],
+                      fetch_tools: Callable[[Any], Awaitable[List[Dict[str, Any]]]]):
+        """Rebuild the merged catalog and routing index if anything changed since the last build."""
+        if self._compute_signature(servers) == self._signature:
+            return
+        async with self._lock:
+            signature = self._compute_signature(servers)
+            if signature == self._signature:
+                return
+
+            results = await asyncio.gather(
+                *(fetch_tools(sub_app) for _, sub_app in servers), return_exceptions=True
+            )
+            index: Dict[str, Tuple[str, Any, str]] = {}
+            tools: List[Dict[str, Any]] = []
+            complete = True
+            for (server_name, sub_app), result in zip(servers, results):
+                if isinstance(result, BaseException):
+                    logger.warning(f"Could not list tools of '{server_name}' for the hub catalog: {result}")
+                    complete = False
+                    continue
+                for tool in result:
+                    namespaced = f"{server_name}{self.separator}{tool['name']}"
+                    if namespaced in index:
+                        # e.g. server "a__b" tool "c" vs server "a" tool "b__c": first server wins
+                        owner, _, owner_tool = index[namespaced]
+                        logger.warning(
+                            f"Hub tool name '{namespaced}' of '{server_name}' ({tool['name']}) collides with "
+                            f"'{owner}' ({owner_tool}); skipping it in the hub catalog"
+                        )
+                        continue
+                    index[namespaced] = (server_name, sub_app, tool["name"])
+                    tools.append({**tool, "name": namespaced})
+
+            self.index = index
+            self.pages = self._paginate(tools)
+            self.tool_count = len(tools)
+            # Servers that failed are retried on the next request instead of being left out for good
+            self._signature = signature if complete else None
+            logger.debug(f"Hub catalog rebuilt: {len(tools)} tools from {len(servers)} servers")
+
+    def _paginate(self, tools: List[Dict[str, Any]]) -> List[bytes]:
+        if not self.page_size or len(tools) <= self.page_size:
+            return [dump_json({"tools": tools})]
+        chunks = [tools[i:i + self.page_size] for i in range(0, len(tools), self.page_size)]
+        pages = []
+        for number, chunk in enumerate(chunks):
+            page: Dict[str, Any] = {"tools": chunk}
+            if number + 1 < len(chunks):
+                page["nextCursor"] = encode_cursor(number + 1)
+            pages.append(dump_json(page))
+        return pages
+
+    def page(self, cursor: Optional[str] = None) -> bytes:
+        """Return the serialized tools/list result for a cursor."""
+        if not cursor:
+            return self.pages[0]
+        number = decode_cursor(cursor)
+        if not 0 <= number < len(self.pages):
+            raise InvalidCursorError(f"Invalid cursor: {cursor}")
+        return self.pages[number]
+
+    def resolve(self, name: str) -> Optional[Tuple[str, Any, str]]:
+        return self.index.get(name)
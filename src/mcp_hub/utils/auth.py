@@ -1,13 +1,13 @@
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
 import base64
+import hmac
+from functools import lru_cache
 
-from passlib.context import CryptContext
 from datetime import timezone, datetime, timedelta
 
-import jwt
 from typing import Optional, Union, List, Dict
 
 
@@ -27,7 +27,7 @@ def get_verify_api_key(api_key: str):
                 headers={"WWW-Authenticate": "Bearer"},
             )
         token = authorization.credentials
-        if token != api_key:
+        if not hmac.compare_digest(token.encode("utf-8"), api_key.encode("utf-8")):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Invalid API key",
@@ -36,69 +36,88 @@ def get_verify_api_key(api_key: str):
     return verify_api_key
 
 
-class APIKeyMiddleware(BaseHTTPMiddleware):
+# Marks a request already authenticated by an outer APIKeyMiddleware, so mounted
+# sub-apps that carry their own middleware don't check it again.
+AUTHENTICATED_SCOPE_KEY = "mcp_hub.authenticated"
+WWW_AUTHENTICATE = {"WWW-Authenticate": "Bearer, Basic"}
+
+
+@lru_cache(maxsize=1024)
+def decode_basic_password(credentials: str) -> Optional[bytes]:
+    """Password part of Basic credentials, or None when they are malformed.
+
+    Clients resend the same header on every request, so decoded values are cached.
     """
-    Middleware that enforces Basic or Bearer token authentication for all requests.
+    try:
+        decoded = base64.b64decode(credentials).decode("utf-8")
+    except Exception:
+        return None
+    # Basic auth format is username:password; any username is allowed
+    username, sep, password = decoded.partition(":")
+    if not sep:
+        return None
+    return password.encode("utf-8")
+
+
+class APIKeyMiddleware:
+    """
+    Pure ASGI middleware that enforces Basic or Bearer token authentication for all requests.
+
+    Responses (including streamed ones) pass through untouched, and a request is only
+    checked once even when nested apps are each wrapped with this middleware.
     """
 
     def __init__(self, app, api_key: str):
-        super().__init__(app)
+        self.app = app
         self.api_key = api_key
+        self._api_key_bytes = api_key.encode("utf-8")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope.get(AUTHENTICATED_SCOPE_KEY):
+            await self.app(scope, receive, send)
+            return
+
+        error = self.check(Headers(scope=scope).get("authorization"))
+        if error is not None:
+            await error(scope, receive, send)
+            return
+
+        scope[AUTHENTICATED_SCOPE_KEY] = True
+        await self.app(scope, receive, send)
+
+    def check(self, authorization: Optional[str]) -> Optional[JSONResponse]:
+        """Return the error response for an Authorization header, or None if it is valid."""
+        if not authorization:
+            return JSONResponse(
+                status_code=401,
+                content={"detail": "Missing or invalid Authorization header"},
+                headers=WWW_AUTHENTICATE,
+            )
 
-    async def dispatch(self, request: Request, call_next):
-        # Skip authentication for OPTIONS requests
-        if request.method == "OPTIONS":
-            return await call_next(request)
-
-        # Get authorization header
-        authorization = request.headers.get("Authorization")
+        # Handle Bearer token auth
+        if authorization.startswith("Bearer "):
+            if not hmac.compare_digest(authorization[7:].encode("utf-8"), self._api_key_bytes):
+                return JSONResponse(status_code=403, content={"detail": "Invalid API key"})
+            return None
 
-        # Verify API key
-        try:
-            # Use the same function that the dependency uses
-            if not authorization:
+        # Handle Basic auth: password must match api_key
+        if authorization.startswith("Basic "):
+            password = decode_basic_password(authorization[6:])
+            if password is None:
                 return JSONResponse(
                     status_code=401,
-                    content={"detail": "Missing or invalid Authorization header"},
-                    headers={"WWW-Authenticate": "Bearer, Basic"},
+                    content={"detail": "Invalid Basic Authentication format"},
+                    headers=WWW_AUTHENTICATE,
                 )
+            if not hmac.compare_digest(password, self._api_key_bytes):
+                return JSONResponse(status_code=403, content={"detail": "Invalid credentials"})
+            return None
 
-            # Handle Bearer token auth
-            if authorization.startswith("Bearer "):
-                token = authorization[7:]  # Remove "Bearer " prefix
-                if token != self.api_key:
-                    return JSONResponse(
-                        status_code=403, content={"detail": "Invalid API key"}
-                    )
-            # Handle Basic auth
-            elif authorization.startswith("Basic "):
-                # Decode the base64 credentials
-                credentials = authorization[6:]  # Remove "Basic " prefix
-                try:
-                    decoded = base64.b64decode(credentials).decode("utf-8")
-                    # Basic auth format is username:password
-                    username, password = decoded.split(":", 1)
-                    # Any username is allowed, but password must match api_key
-                    if password != self.api_key:
-                        return JSONResponse(
-                            status_code=403, content={"detail": "Invalid credentials"}
-                        )
-                except Exception:
-                    return JSONResponse(
-                        status_code=401,
-                        content={"detail": "Invalid Basic Authentication format"},
-                        headers={"WWW-Authenticate": "Bearer, Basic"},
-                    )
-            else:
-                return JSONResponse(
-                    status_code=401,
-                    content={"detail": "Unsupported authorization method"},
-                    headers={"WWW-Authenticate": "Bearer, Basic"},
-                )
-
-            return await call_next(request)
-        except Exception as e:
-            return JSONResponse(status_code=500, content={"detail": str(e)})
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Unsupported authorization method"},
+            headers=WWW_AUTHENTICATE,
+        )
 
 
 # def create_token(data: dict, expires_delta: Union[timedelta, None] = None) -> str:
@@ -113,6 +132,9 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
 SESSION_SECRET = "testsecret"  # Para testes
 
 def create_token(data: dict, expires_delta: Union[timedelta, None] = None) -> str:
+    # jwt (and cryptography behind it) is only loaded by the token helpers
+    import jwt
+
     payload = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -129,6 +151,8 @@ def create_token(data: dict, expires_delta: Union[timedelta, None] = None) -> st
 #     except Exception:
 #         return None
 def decode_token(token: str) -> Optional[dict]:
+    import jwt
+
     try:
         decoded = jwt.decode(token, SESSION_SECRET, algorithms=[ALGORITHM])
         return decoded
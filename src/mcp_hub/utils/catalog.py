@@ -0,0 +1,115 @@
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from mcp_hub.utils import fastjson
+from mcp_hub.utils.coalesce import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
+
+TOOLS_LIST = "tools/list"
+TOOLS_LIST_CHANGED = "notifications/tools/list_changed"
+
+
+def dump_json(data: Any) -> bytes:
+    """Serialize data the same way Starlette's JSONResponse does."""
+    return fastjson.dumps(data)
+
+
+def jsonrpc_result_bytes(req_id: Any, result_bytes: bytes) -> bytes:
+    """Wrap an already-serialized result into a JSON-RPC response body."""
+    return b'{"jsonrpc":"2.0","id":' + dump_json(req_id) + b',"result":' + result_bytes + b"}"
+
+
+def tool_to_dict(tool) -> Dict[str, Any]:
+    """Shape of a tool entry as exposed by the gateway."""
+    return {
+        "name": tool.name,
+        "description": tool.description,
+        "inputSchema": tool.inputSchema,
+    }
+
+
+class CatalogCache:
+    """Caches a server's serialized ``tools/list`` result.
+
+    The entry lives until it is invalidated (upstream ``tools/list_changed``
+    notification or config reload) or, when ``ttl`` is set, until it expires.
+    Concurrent misses share a single upstream fetch.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, enabled: bool = True):
+        self.ttl = ttl
+        self.enabled = enabled
+        self.tools: Optional[List[Dict[str, Any]]] = None
+        self.result_bytes: Optional[bytes] = None
+        self.hits = 0
+        self.misses = 0
+        self._expires_at: Optional[float] = None
+        self._generation = 0
+        # Concurrent misses share one fetch, cancelled only when no request waits for it anymore
+        self._single_flight = SingleFlight()
+
+    @property
+    def generation(self) -> int:
+        """Incremented on every invalidation, so dependents can tell the catalog changed."""
+        return self._generation
+
+    def get(self) -> Optional[bytes]:
+        """Return the cached serialized result, or None when missing or expired."""
+        if self.result_bytes is None:
+            return None
+        if self._expires_at is not None and time.monotonic() >= self._expires_at:
+            self.invalidate()
+            return None
+        return self.result_bytes
+
+    def store(self, tools: List[Dict[str, Any]], result_bytes: Optional[bytes] = None) -> bytes:
+        if result_bytes is None:
+            result_bytes = dump_json({"tools": tools})
+        if self.enabled:
+            self.tools = tools
+            self.result_bytes = result_bytes
+            self._expires_at = time.monotonic() + self.ttl if self.ttl else None
+        return result_bytes
+
+    def invalidate(self):
+        self.tools = None
+        self.result_bytes = None
+        self._expires_at = None
+        self._generation += 1
+
+    async def on_notification(self, replica, notification):
+        """Pool notification listener: drop the catalog when upstream tools change."""
+        if notification.method == TOOLS_LIST_CHANGED:
+            logger.info(f"Tool list changed upstream ({replica.name}), invalidating catalog cache")
+            self.invalidate()
+
+    async def get_or_fetch(self, fetch: Callable[[], Awaitable[Union[List[Dict[str, Any]], Dict[str, Any]]]]) -> bytes:
+        """Return the cached result, fetching it from upstream on a miss.
+
+        ``fetch`` returns either the tool entries, or the whole upstream result
+        (a dict with ``tools``), which is then cached and relayed as is.
+        """
+        cached = self.get() if self.enabled else None
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        return await self._single_flight.do(TOOLS_LIST, lambda: self._fetch(fetch))
+
+    async def _fetch(self, fetch: Callable[[], Awaitable[Union[List[Dict[str, Any]], Dict[str, Any]]]]) -> bytes:
+        generation = self._generation
+        fetched = await fetch()
+        if isinstance(fetched, dict):
+            # Upstream result: keep nextCursor, outputSchema, annotations, _meta... untouched
+            tools, result_bytes = fetched.get("tools") or [], dump_json(fetched)
+        else:
+            tools, result_bytes = fetched, dump_json({"tools": fetched})
+        # Don't keep a catalog that was invalidated while we were fetching it
+        if generation == self._generation:
+            self.store(tools, result_bytes)
+        return result_bytes
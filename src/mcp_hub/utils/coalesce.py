@@ -0,0 +1,72 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_arguments(arguments: Optional[Dict[str, Any]]) -> str:
+    """Stable key for tool arguments: key order and whitespace don't matter, missing equals empty."""
+    return json.dumps(arguments or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Shares one execution between concurrent calls with the same key.
+
+    The first caller starts the call as a task; callers arriving while it runs
+    wait on the same task and all get its result (or its exception). A caller
+    that is cancelled only stops waiting: the call itself is cancelled when
+    nobody is left waiting for it.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            self.executions += 1
+            flight = _Flight(asyncio.ensure_future(fn()))
+            # With eager tasks the call may already be over: only a running one can be joined
+            if not flight.task.done():
+                self._flights[key] = flight
+            flight.task.add_done_callback(lambda _task: self._forget(key, flight))
+        else:
+            self.coalesced += 1
+            logger.debug(f"Coalescing call {key!r} with the one in flight")
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Nobody may be waiting anymore (all cancelled): don't warn about an unretrieved exception
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {"inFlight": self.in_flight, "executions": self.executions, "coalesced": self.coalesced}
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from mcp_hub.utils.jsonrpc import jsonrpc_error
+
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds the client is willing to wait for a request; only ever shortens the configured deadline
+TIMEOUT_HEADER = "x-mcp-timeout"
+# JSON-RPC error code for requests the gateway gave up on (as in the TypeScript SDK)
+REQUEST_TIMEOUT = -32001
+# Methods answered by the gateway itself, which no deadline applies to
+LOCAL_METHODS = ("initialize", "notifications/initialized")
+
+
+def validate_timeout_config(where: str, value: Any) -> None:
+    """Validate a ``timeout`` in seconds."""
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+        raise ValueError(f"{where} 'timeout' must be a positive number")
+
+
+def requested_timeout(headers) -> Optional[float]:
+    """The deadline a client asked for in the ``X-MCP-Timeout`` header, if any."""
+    value = headers.get(TIMEOUT_HEADER)
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = 0.0
+    if not seconds > 0 or seconds == float("inf"):
+        raise ValueError(f"Invalid {TIMEOUT_HEADER} header: expected a positive number of seconds")
+    return seconds
+
+
+def timeout_error(req_id, seconds: float) -> Dict[str, Any]:
+    return jsonrpc_error(req_id, REQUEST_TIMEOUT, f"Request timed out after {seconds:g}s")
+
+
+class Deadlines:
+    """How long requests to one server may take: a server-wide deadline and per-tool overrides.
+
+    A client can ask for less with the ``X-MCP-Timeout`` header but never for
+    more than the configured deadline. Without any, requests are not bounded.
+    """
+
+    def __init__(self, default: Optional[float] = None, tools: Optional[Dict[str, float]] = None):
+        self.default = default
+        self.tools = tools or {}
+
+    @classmethod
+    def from_config(cls, server_cfg: Dict[str, Any], default: Optional[float] = None) -> "Deadlines":
+        return cls(
+            default=server_cfg.get("timeout", default),
+            tools={
+                name: tool_cfg["timeout"]
+                for name, tool_cfg in server_cfg.get("tools", {}).items() if "timeout" in tool_cfg
+            },
+        )
+
+    def limit(self, tool_name: Optional[str] = None) -> Optional[float]:
+        return self.tools.get(tool_name, self.default) if tool_name is not None else self.default
+
+    def resolve(self, tool_name: Optional[str], requested: Optional[float]) -> Optional[float]:
+        """Deadline of one request: the configured one, shortened by what the client asked for."""
+        limit = self.limit(tool_name)
+        if requested is None:
+            return limit
+        return requested if limit is None else min(requested, limit)
+
+
+def bound_handler(handle, deadlines: Optional[Deadlines], requested: Optional[float]):
+    """Wrap a JSON-RPC message handler so requests past their deadline get a timeout error.
+
+    Expiry cancels the handler; the upstream sessions turn that cancellation into
+    ``notifications/cancelled``, so the server can stop working on the call.
+    """
+    if deadlines is None:
+        deadlines = Deadlines()
+
+    async def bounded(message: Dict[str, Any], *args, **kwargs):
+        method = message.get("method")
+        if "id" not in message or method in LOCAL_METHODS:
+            return await handle(message, *args, **kwargs)
+        params = message.get("params") or {}
+        timeout = deadlines.resolve(params.get("name") if method == "tools/call" else None, requested)
+        if timeout is None:
+            return await handle(message, *args, **kwargs)
+        try:
+            async with asyncio.timeout(timeout):
+                return await handle(message, *args, **kwargs)
+        except TimeoutError:
+            logger.warning(f"Request {method} timed out after {timeout:g}s")
+            return timeout_error(message.get("id"), timeout)
+
+    return bounded
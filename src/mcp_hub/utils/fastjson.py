@@ -0,0 +1,27 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup, used when installed
+    orjson = None
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, like Starlette's JSONResponse, with orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # Non-string keys, integers past 64 bits, ...: let the stdlib handle them
+            pass
+    return json.dumps(
+        data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def loads(body: bytes) -> Any:
+    """Parse a JSON document; raises ValueError when it is malformed."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
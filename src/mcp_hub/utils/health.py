@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from mcp_hub.utils.pool import Replica, SessionPool
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PROBE_INTERVAL = 10.0
+DEFAULT_PROBE_TIMEOUT = 5.0
+DEFAULT_FAILURE_THRESHOLD = 3
+
+HEALTHY = "healthy"
+DEGRADED = "degraded"
+UNHEALTHY = "unhealthy"
+IDLE = "idle"
+
+
+def validate_health_check_config(where: str, cfg: Any) -> None:
+    """Validate the ``healthCheck`` object of a server."""
+    if not isinstance(cfg, dict):
+        raise ValueError(f"{where} 'healthCheck' must be an object")
+    if not isinstance(cfg.get("enabled", True), bool):
+        raise ValueError(f"{where} 'healthCheck.enabled' must be a boolean")
+    for key in ("interval", "timeout"):
+        value = cfg.get(key, 1)
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+            raise ValueError(f"{where} 'healthCheck.{key}' must be a positive number")
+    threshold = cfg.get("failureThreshold", DEFAULT_FAILURE_THRESHOLD)
+    if not isinstance(threshold, int) or isinstance(threshold, bool) or threshold < 1:
+        raise ValueError(f"{where} 'healthCheck.failureThreshold' must be a positive integer")
+
+
+class ProbeResult:
+    """Outcome of the latest pings of one replica."""
+
+    def __init__(self):
+        self.checked_at: Optional[float] = None
+        self.latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "lastCheck": self.checked_at,
+            "latencyMs": round(self.latency * 1000, 3) if self.latency is not None else None,
+            "consecutiveFailures": self.consecutive_failures,
+            "error": self.error,
+        }
+
+
+class HealthProber:
+    """Pings the replicas of one pool in the background and keeps the results.
+
+    A replica that exited is noticed by the pool itself; the prober catches the
+    ones still running but no longer answering. After ``failure_threshold``
+    pings in a row failed or took longer than ``timeout``, the replica is
+    aborted so the pool replaces it like one that exited. Health endpoints read
+    the kept results and never talk to the servers themselves.
+    """
+
+    def __init__(self, pool: SessionPool, interval: float = DEFAULT_PROBE_INTERVAL,
+                 timeout: float = DEFAULT_PROBE_TIMEOUT, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD):
+        self.pool = pool
+        self.interval = interval
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.results: Dict[Replica, ProbeResult] = {}
+        self.hung = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, pool: SessionPool, cfg: Optional[Dict[str, Any]]) -> Optional["HealthProber"]:
+        """The prober a ``healthCheck`` object asks for, or None when it is disabled."""
+        cfg = cfg or {}
+        if not cfg.get("enabled", True):
+            return None
+        return cls(
+            pool,
+            interval=cfg.get("interval", DEFAULT_PROBE_INTERVAL),
+            timeout=cfg.get("timeout", DEFAULT_PROBE_TIMEOUT),
+            failure_threshold=cfg.get("failureThreshold", DEFAULT_FAILURE_THRESHOLD),
+        )
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"mcp-health-{self.pool.server_name}")
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.probe_once()
+            except Exception as e:
+                logger.error(f"Health probe of '{self.pool.server_name}' failed: {type(e).__name__}: {e}")
+
+    async def probe_once(self):
+        """Ping every running replica and standby once, concurrently."""
+        replicas = self.pool.healthy_replicas + self.pool.ready_standbys
+        # Forget replicas that were replaced since the last round
+        self.results = {r: self.results[r] for r in replicas if r in self.results}
+        await asyncio.gather(*(self._probe(r) for r in replicas))
+
+    async def _probe(self, replica: Replica):
+        session = replica.session
+        result = self.results.setdefault(replica, ProbeResult())
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(session.send_ping(), self.timeout)
+        except Exception as e:
+            if replica.session is not session:
+                # Stopped or replaced while we waited: not this process's fault
+                return
+            result.consecutive_failures += 1
+            result.error = "ping timed out" if isinstance(e, asyncio.TimeoutError) else f"{type(e).__name__}: {e}"
+            logger.warning(
+                f"Replica '{replica.name}' failed health check "
+                f"({result.consecutive_failures}/{self.failure_threshold}): {result.error}"
+            )
+            if result.consecutive_failures >= self.failure_threshold:
+                self.hung += 1
+                self.results.pop(replica, None)
+                await replica.abort(f"no answer to {result.consecutive_failures} health checks")
+        else:
+            result.latency = time.perf_counter() - started
+            result.consecutive_failures = 0
+            result.error = None
+        finally:
+            result.checked_at = time.time()
+
+    def replica_health(self, replica: Replica) -> Dict[str, Any]:
+        result = self.results.get(replica)
+        return result.to_dict() if result is not None else ProbeResult().to_dict()
+
+
+def replica_status(pool: SessionPool, replica: Replica, prober: Optional[HealthProber]) -> str:
+    if not replica.is_alive:
+        return "restarting" if pool.is_restarting(replica) else "down"
+    result = prober.results.get(replica) if prober is not None else None
+    return UNHEALTHY if result is not None and result.consecutive_failures else HEALTHY
+
+
+def server_health(pool: Optional[SessionPool], prober: Optional[HealthProber]) -> Dict[str, Any]:
+    """Health of one server from its pool's state and the prober's last results, without any upstream I/O.
+
+    ``ready`` is true when a request can be served: some replica is up and answering,
+    or the server is lazy and idle, so the next request starts it.
+    """
+    if pool is None:
+        return {"status": UNHEALTHY, "ready": False, "replicas": []}
+    replicas: List[Dict[str, Any]] = []
+    for replica in pool.replicas:
+        entry = {"name": replica.name, "status": replica_status(pool, replica, prober)}
+        if prober is not None:
+            entry.update(prober.replica_health(replica))
+        replicas.append(entry)
+    healthy = sum(1 for entry in replicas if entry["status"] == HEALTHY)
+    if healthy == len(replicas):
+        status = HEALTHY
+    elif healthy:
+        status = DEGRADED
+    elif pool.lazy and not any(r.is_alive or pool.is_restarting(r) for r in pool.replicas):
+        status = IDLE
+    else:
+        status = UNHEALTHY
+    health = {
+        "status": status,
+        "ready": status != UNHEALTHY,
+        "replicas": replicas,
+        "standbys": len(pool.ready_standbys),
+        "restarts": pool.restarts,
+    }
+    if prober is not None:
+        health["hung"] = prober.hung
+    return health
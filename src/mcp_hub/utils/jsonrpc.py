@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+from mcp_hub.utils import fastjson
+from mcp_hub.utils.admission import OVERLOADED_ERROR_CODE
+from mcp_hub.utils.catalog import dump_json
+
+
+logger = logging.getLogger(__name__)
+
+
+# A handler reply is a response dict, a pre-serialized response body, or None for no response
+Reply = Optional[Union[Dict[str, Any], bytes]]
+MessageHandler = Callable[[Dict[str, Any]], Awaitable[Reply]]
+
+
+def jsonrpc_error(req_id, code: int, message: str, data: Any = None) -> Dict[str, Any]:
+    error: Dict[str, Any] = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": req_id, "error": error}
+
+
+def http_exception_error(req_id, e: HTTPException) -> Dict[str, Any]:
+    """JSON-RPC error object for an HTTPException raised by a handler."""
+    if e.status_code == 429:
+        retry_after = int((e.headers or {}).get("Retry-After", 1))
+        return jsonrpc_error(req_id, OVERLOADED_ERROR_CODE, str(e.detail), {"retryAfter": retry_after})
+    code = -32000 if e.status_code == 503 else -32603
+    return jsonrpc_error(req_id, code, str(e.detail))
+
+
+def parse_jsonrpc_body(body: bytes) -> Union[Dict[str, Any], List[Any], Response]:
+    """Decode a raw request body into a message or batch, or the JSON-RPC error response to send back.
+
+    Endpoints read the body themselves instead of declaring a model, so large
+    payloads skip FastAPI's validation and are decoded once with the fast parser.
+    """
+    try:
+        request_data = fastjson.loads(body)
+    except ValueError:
+        return Response(dump_json(jsonrpc_error(None, -32700, "Parse error")), 400, media_type="application/json")
+    if not isinstance(request_data, (dict, list)):
+        return Response(dump_json(jsonrpc_error(None, -32600, "Invalid Request")), 400, media_type="application/json")
+    return request_data
+
+
+def is_notification(message: Dict[str, Any]) -> bool:
+    """JSON-RPC 2.0: any request without an id is a notification and never gets a response."""
+    return "id" not in message
+
+
+def is_client_notification(message: Dict[str, Any]) -> bool:
+    """MCP ``notifications/*`` messages, which the gateway consumes without forwarding."""
+    return str(message.get("method", "")).startswith("notifications/")
+
+
+def reply_to_response(reply: Reply):
+    """Turn a handler reply into what the FastAPI endpoint returns."""
+    if reply is None:
+        return Response(status_code=204)
+    if not isinstance(reply, bytes):
+        reply = dump_json(reply)
+    return Response(content=reply, media_type="application/json")
+
+
+async def encode_reply(message: Any, handle: MessageHandler) -> Optional[bytes]:
+    """Run one message through ``handle`` and serialize its reply.
+
+    Used where an HTTP status can no longer describe the outcome (batch entries,
+    streamed responses), so errors are always turned into JSON-RPC error objects.
+    """
+    if not isinstance(message, dict):
+        return dump_json(jsonrpc_error(None, -32600, "Invalid Request"))
+
+    req_id = message.get("id")
+    try:
+        reply = await handle(message)
+    except HTTPException as e:
+        reply = http_exception_error(req_id, e)
+    except Exception as e:
+        logger.error(f"MCP batch entry error: {e}")
+        reply = jsonrpc_error(req_id, -32603, f"Internal error: {e}")
+
+    if reply is None or is_notification(message):
+        return None
+    return reply if isinstance(reply, bytes) else dump_json(reply)
+
+
+async def dispatch_jsonrpc(request_data: Union[Dict[str, Any], List[Any]], handle: MessageHandler):
+    """Dispatch a single JSON-RPC message or a batch array.
+
+    Batch entries run concurrently and their responses are returned as one array in
+    request order; notifications contribute no entry, and a batch made only of
+    notifications gets an empty 204 response. Errors in one entry are reported as a
+    JSON-RPC error for that entry only.
+    """
+    if isinstance(request_data, dict):
+        if is_notification(request_data):
+            # Notifications still run for their side effects, but get no reply (not even an error)
+            await encode_reply(request_data, handle)
+            return Response(status_code=204)
+        return reply_to_response(await handle(request_data))
+
+    if not request_data:
+        return reply_to_response(jsonrpc_error(None, -32600, "Invalid Request: empty batch"))
+
+    replies = await asyncio.gather(*(encode_reply(message, handle) for message in request_data))
+    parts = [reply for reply in replies if reply is not None]
+    if not parts:
+        return Response(status_code=204)
+    return Response(content=b"[" + b",".join(parts) + b"]", media_type="application/json")
@@ -0,0 +1,206 @@
+import math
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Methods reported under their own label; anything else a client sends is folded into "other"
+MCP_METHODS = frozenset({
+    "initialize", "ping", "tools/list", "tools/call", "resources/list", "resources/read",
+    "resources/templates/list", "resources/subscribe", "resources/unsubscribe", "prompts/list",
+    "prompts/get", "completion/complete", "logging/setLevel",
+})
+
+# A sample: (name suffix, label values, value); collectors yield (name, help, type, labelnames, samples)
+Sample = Tuple[str, Tuple[str, ...], float]
+Collector = Callable[[], Iterable[Tuple[str, str, str, Sequence[str], Iterable[Sample]]]]
+
+
+def method_label(method: Any) -> str:
+    if method in MCP_METHODS:
+        return method
+    if isinstance(method, str) and method.startswith("notifications/"):
+        return "notifications"
+    return "other"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        # Bucket i counts values <= bounds[i]; the last one is +Inf
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    """A metric family; ``labels(...)`` returns the child holding one label combination's value.
+
+    Children are cached, so recording is a dict lookup plus an addition.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def samples(self) -> Iterable[Sample]:
+        for values, child in list(self._children.items()):
+            yield "", values, child.value
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def samples(self) -> Iterable[Sample]:
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                yield "_bucket", values + ("+Inf" if bound == math.inf else repr(float(bound)),), cumulative
+            yield "_sum", values, child.sum
+            yield "_count", values, cumulative
+
+
+class MetricsRegistry:
+    """Metrics recorded by the gateway plus collectors read at scrape time."""
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Collector] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Collector):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def family(name, help, type_, labelnames, samples):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type_}")
+            for suffix, values, value in samples:
+                names = labelnames + ("le",) if suffix == "_bucket" else labelnames
+                lines.append(f"{name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+
+        for metric in self._metrics:
+            family(metric.name, metric.help, metric.type, metric.labelnames, metric.samples())
+        for collector in self._collectors:
+            for name, help, type_, labelnames, samples in collector():
+                family(name, help, type_, tuple(labelnames), samples)
+        return "\n".join(lines) + "\n"
+
+
+class GatewayMetrics(MetricsRegistry):
+    """The gateway's request metrics, labelled by server ('hub' for the aggregated endpoint)."""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = self.register(Counter(
+            "mcp_hub_requests_total", "JSON-RPC messages handled.", ("server", "method")))
+        self.errors = self.register(Counter(
+            "mcp_hub_request_errors_total", "JSON-RPC messages answered with an error, by error code.",
+            ("server", "method", "code")))
+        self.latency = self.register(Histogram(
+            "mcp_hub_request_duration_seconds", "Time to handle a JSON-RPC message.", ("server", "method")))
+        self.in_flight = self.register(Gauge(
+            "mcp_hub_requests_in_flight", "JSON-RPC messages being handled.", ("server",)))
+        self.request_bytes = self.register(Histogram(
+            "mcp_hub_request_size_bytes", "HTTP request body size.", ("server",), SIZE_BUCKETS))
+        self.response_bytes = self.register(Histogram(
+            "mcp_hub_response_size_bytes", "HTTP response body size (streamed responses excluded).",
+            ("server",), SIZE_BUCKETS))
+        self.upstream_exits = self.register(Counter(
+            "mcp_hub_upstream_exits_total", "Upstream server processes that exited unexpectedly.", ("server",)))
+        self.upstream_restarts = self.register(Counter(
+            "mcp_hub_upstream_restarts_total", "Upstream server processes started to replace a previous one.",
+            ("server",)))
+
+    def observe_bytes(self, server: str, request_size: int, response_size: Optional[int]):
+        self.request_bytes.labels(server).observe(request_size)
+        if response_size is not None:
+            self.response_bytes.labels(server).observe(response_size)
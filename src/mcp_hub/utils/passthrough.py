@@ -0,0 +1,277 @@
+import asyncio
+import itertools
+import logging
+import re
+import sys
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from mcp import StdioServerParameters, types
+
+from mcp_hub.utils import fastjson
+from mcp_hub.utils.catalog import dump_json
+from mcp_hub.utils.jsonrpc import is_notification, jsonrpc_error
+from mcp_hub.utils.pool import CANCELLED_REASON, SessionFactory
+from mcp_hub.utils.streaming import ProgressCallback
+
+
+logger = logging.getLogger(__name__)
+
+
+# Upper bound for one newline-delimited message read from the server's stdout
+READ_LIMIT = 64 * 1024 * 1024
+# How long a stopped server gets to exit after its stdin is closed, before it is killed
+TERMINATE_TIMEOUT = 2.0
+
+
+class UpstreamClosedError(ConnectionError):
+    """Raised for requests that were pending, or sent, when the server process went away."""
+
+
+class UpstreamError(RuntimeError):
+    """A JSON-RPC error returned by the server for a request the gateway made itself."""
+
+    def __init__(self, error: Dict[str, Any]):
+        super().__init__(error.get("message", "Upstream error"))
+        self.error = error
+
+
+class RawNotification:
+    """Server notification as delivered to pool notification listeners."""
+
+    __slots__ = ("method", "params")
+
+    def __init__(self, method: str, params: Optional[Dict[str, Any]]):
+        self.method = method
+        self.params = params
+
+
+def restore_id(line: bytes, upstream_id: int, client_id: Any, message: Dict[str, Any]) -> bytes:
+    """Relay a raw response with the client's id in place of the upstream one.
+
+    The id is spliced into the original bytes when it appears before the
+    ``result``/``error`` member (the order every MCP SDK writes), so the payload
+    is never re-encoded; otherwise the parsed message is serialized again.
+    """
+    end = len(line)
+    for key in (b'"result"', b'"error"'):
+        position = line.find(key)
+        if position != -1:
+            end = min(end, position)
+    match = re.compile(rb'"id"\s*:\s*' + str(upstream_id).encode() + rb"(?=[\s,}])").search(line, 0, end)
+    if match is not None:
+        return line[:match.start()] + b'"id":' + dump_json(client_id) + line[match.end():]
+    return dump_json({**message, "id": client_id})
+
+
+class RawStdioSession:
+    """A stdio MCP client that forwards JSON-RPC messages without the SDK's object model.
+
+    Requests get ids from a per-process counter and responses are matched back by
+    that id, so any number of clients can share the process. Responses are kept as
+    the raw line read from stdout; only enough of it is parsed to route it. It also
+    offers the ``list_tools``/``call_tool`` subset of ``ClientSession`` the rest of
+    the gateway uses.
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process, message_handler=None, notify_cancelled: bool = True):
+        self.process = process
+        self.message_handler = message_handler
+        self.notify_cancelled = notify_cancelled
+        self.initialize_result: Optional[Dict[str, Any]] = None
+        self.closed = False
+        # Set once the server's stdout reached EOF; replicas watch it to notice the process exited
+        self.upstream_closed = asyncio.Event()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._progress: Dict[Any, ProgressCallback] = {}
+        self._reader: Optional[asyncio.Task] = None
+
+    def start_reading(self):
+        self._reader = asyncio.create_task(self._read_loop(), name="mcp-passthrough-reader")
+
+    async def _read_loop(self):
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if line:
+                    await self._dispatch(line)
+        except (asyncio.LimitOverrunError, ValueError) as e:
+            logger.error(f"Passthrough: unreadable message from upstream: {e}")
+        finally:
+            self.closed = True
+            self.upstream_closed.set()
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(UpstreamClosedError("MCP server process exited"))
+            self._pending.clear()
+
+    async def _dispatch(self, line: bytes):
+        try:
+            message = fastjson.loads(line)
+        except ValueError:
+            logger.warning(f"Passthrough: ignoring non-JSON output: {line[:200]!r}")
+            return
+        if not isinstance(message, dict):
+            return
+
+        method = message.get("method")
+        if method is None:
+            future = self._pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result((line, message))
+        elif is_notification(message):
+            await self._on_notification(method, message.get("params"))
+        else:
+            # Requests from the server (sampling, roots, ...) have no client to go to
+            reply = {"jsonrpc": "2.0", "id": message["id"], "result": {}} if method == "ping" else \
+                jsonrpc_error(message["id"], -32601, f"Method not supported by the gateway: {method}")
+            await self._write(reply)
+
+    async def _on_notification(self, method: str, params: Optional[Dict[str, Any]]):
+        if method == "notifications/progress" and params:
+            callback = self._progress.get(params.get("progressToken"))
+            if callback is not None:
+                try:
+                    await callback(params.get("progress"), params.get("total"), params.get("message"))
+                except Exception as e:
+                    logger.error(f"Passthrough: progress callback failed: {e}")
+                return
+        if self.message_handler is not None:
+            await self.message_handler(RawNotification(method, params))
+
+    async def _write(self, message: Dict[str, Any]):
+        if self.closed:
+            raise UpstreamClosedError("MCP server process exited")
+        self.process.stdin.write(dump_json(message) + b"\n")
+        await self.process.stdin.drain()
+
+    def _notify_cancelled(self, upstream_id: int):
+        """Tell the server to stop working on a request nobody waits for anymore."""
+        if self.closed or not self.notify_cancelled:
+            return
+        notification = {
+            "jsonrpc": "2.0",
+            "method": "notifications/cancelled",
+            "params": {"requestId": upstream_id, "reason": CANCELLED_REASON},
+        }
+        # Written without awaiting: the caller is being cancelled
+        self.process.stdin.write(dump_json(notification) + b"\n")
+
+    async def _request(self, message: Dict[str, Any],
+                       progress_callback: Optional[ProgressCallback] = None) -> Tuple[int, bytes, Dict[str, Any]]:
+        upstream_id = next(self._ids)
+        message = {**message, "id": upstream_id}
+        if progress_callback is not None:
+            # Tokens are per process, so give each request its own to keep clients apart
+            params = message.get("params") or {}
+            message["params"] = {**params, "_meta": {**(params.get("_meta") or {}), "progressToken": upstream_id}}
+            self._progress[upstream_id] = progress_callback
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[upstream_id] = future
+        try:
+            await self._write(message)
+            line, response = await future
+        except asyncio.CancelledError:
+            self._notify_cancelled(upstream_id)
+            raise
+        finally:
+            self._pending.pop(upstream_id, None)
+            self._progress.pop(upstream_id, None)
+        return upstream_id, line, response
+
+    async def send_raw(self, message: Dict[str, Any],
+                       progress_callback: Optional[ProgressCallback] = None) -> Optional[bytes]:
+        """Forward a client message and return the server's response bytes (None for notifications)."""
+        if is_notification(message):
+            await self._write(message)
+            return None
+        if progress_callback is None:
+            # Nobody listens for progress here: don't let the client's token reach the shared process
+            meta = (message.get("params") or {}).get("_meta") or {}
+            if "progressToken" in meta:
+                params = message["params"]
+                message = {**message, "params": {**params, "_meta": {k: v for k, v in meta.items()
+                                                                     if k != "progressToken"}}}
+        upstream_id, line, response = await self._request(message, progress_callback)
+        return restore_id(line, upstream_id, message.get("id"), response)
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None,
+                      progress_callback: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Send a request of the gateway's own and return its result."""
+        message: Dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        _, _, response = await self._request(message, progress_callback)
+        if "error" in response:
+            raise UpstreamError(response["error"])
+        return response.get("result") or {}
+
+    async def initialize(self):
+        self.initialize_result = await self.request("initialize", {
+            "protocolVersion": types.LATEST_PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "mcp-hub", "version": "1.0"},
+        })
+        await self._write({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    async def send_ping(self):
+        return await self.request("ping")
+
+    async def list_tools(self, cursor: Optional[str] = None) -> types.ListToolsResult:
+        return types.ListToolsResult.model_validate(
+            await self.request("tools/list", {"cursor": cursor} if cursor else None)
+        )
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None,
+                        progress_callback: Optional[ProgressCallback] = None, **_) -> types.CallToolResult:
+        params: Dict[str, Any] = {"name": name}
+        if arguments is not None:
+            params["arguments"] = arguments
+        return types.CallToolResult.model_validate(await self.request("tools/call", params, progress_callback))
+
+    async def read_resource(self, uri) -> types.ReadResourceResult:
+        return types.ReadResourceResult.model_validate(await self.request("resources/read", {"uri": str(uri)}))
+
+    async def subscribe_resource(self, uri):
+        return await self.request("resources/subscribe", {"uri": str(uri)})
+
+    async def close(self):
+        self.closed = True
+        process = self.process
+        if process.returncode is None:
+            process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), TERMINATE_TIMEOUT)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+
+def raw_stdio_session_factory(server_params: StdioServerParameters, notify_cancelled: bool = True) -> SessionFactory:
+    """Like ``stdio_session_factory``, but yields a ``RawStdioSession`` for passthrough servers."""
+
+    @asynccontextmanager
+    async def factory(message_handler=None):
+        process = await asyncio.create_subprocess_exec(
+            server_params.command, *server_params.args,
+            env=server_params.env, cwd=server_params.cwd,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=sys.stderr,
+            limit=READ_LIMIT,
+        )
+        session = RawStdioSession(process, message_handler, notify_cancelled)
+        session.start_reading()
+        try:
+            await session.initialize()
+            yield session
+        finally:
+            await session.close()
+
+    return factory
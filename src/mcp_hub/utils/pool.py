@@ -0,0 +1,632 @@
+import asyncio
+import logging
+import random
+import time
+import zlib
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, List, Optional
+
+import anyio
+from mcp import ClientSession, StdioServerParameters, types
+from mcp.client.stdio import stdio_client
+
+
+logger = logging.getLogger(__name__)
+
+
+SessionFactory = Callable[..., AsyncContextManager[Any]]
+NotificationListener = Callable[["Replica", Any], Awaitable[None]]
+ExitListener = Callable[["Replica"], None]
+RestartListener = Callable[["Replica"], None]
+IdleStopListener = Callable[["SessionPool"], None]
+
+DEFAULT_IDLE_TIMEOUT = 300.0
+# Floor on how often an idle pool re-checks whether it can scale to zero
+IDLE_CHECK_INTERVAL = 1.0
+# Pause before starting another standby after one failed to start
+STANDBY_RETRY_DELAY = 5.0
+# Longest a notifications/cancelled may take to reach the server
+CANCEL_NOTIFY_TIMEOUT = 1.0
+CANCELLED_REASON = "The gateway stopped waiting for the response"
+
+
+class NoHealthyReplicaError(RuntimeError):
+    """Raised when a pool has no connected replica to serve a request."""
+
+
+class RestartPolicy:
+    """When and how fast replicas that exited on their own are started again.
+
+    Consecutive failures back off exponentially from ``initial_delay`` up to
+    ``max_delay``, each delay drawn between half and all of its nominal value so
+    replicas crashing together don't restart in lockstep. A replica that stayed
+    up for ``max_delay`` starts over from ``initial_delay``. Requests arriving
+    while no replica is up wait up to ``request_wait`` for one to come back.
+    """
+
+    def __init__(self, enabled: bool = True, initial_delay: float = 0.5, max_delay: float = 30.0,
+                 request_wait: float = 5.0, rng: Optional[random.Random] = None):
+        self.enabled = enabled
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.request_wait = request_wait
+        self._rng = rng or random.Random()
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]]) -> "RestartPolicy":
+        cfg = cfg or {}
+        return cls(
+            enabled=cfg.get("enabled", True),
+            initial_delay=cfg.get("initialDelay", 0.5),
+            max_delay=cfg.get("maxDelay", 30.0),
+            request_wait=cfg.get("requestWait", 5.0),
+        )
+
+    def delay(self, failures: int) -> float:
+        """Seconds to wait before restart attempt number ``failures`` (0-based)."""
+        nominal = min(self.max_delay, self.initial_delay * 2 ** min(failures, 32))
+        return nominal * self._rng.uniform(0.5, 1.0)
+
+
+def validate_restart_config(where: str, cfg: Any) -> None:
+    """Validate the ``restart`` object of a server."""
+    if not isinstance(cfg, dict):
+        raise ValueError(f"{where} 'restart' must be an object")
+    if not isinstance(cfg.get("enabled", True), bool):
+        raise ValueError(f"{where} 'restart.enabled' must be a boolean")
+    for key in ("initialDelay", "maxDelay", "requestWait"):
+        value = cfg.get(key, 1)
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"{where} 'restart.{key}' must be a non-negative number")
+    if cfg.get("initialDelay", 0.5) > cfg.get("maxDelay", 30.0):
+        raise ValueError(f"{where} 'restart.initialDelay' must not exceed 'restart.maxDelay'")
+
+
+class CancellingClientSession(ClientSession):
+    """ClientSession that tells the server about requests the gateway stopped waiting for.
+
+    When a request is cancelled (its deadline expired or the client went away),
+    ``notifications/cancelled`` is sent for it so the server can stop working on it.
+    """
+
+    notify_cancelled = True
+
+    async def send_request(self, request, result_type, *args, **kwargs):
+        # Read before the first await: it is the id send_request is about to use
+        request_id = self._request_id
+        try:
+            return await super().send_request(request, result_type, *args, **kwargs)
+        except asyncio.CancelledError:
+            # initialize must not be cancelled, per the spec
+            if self.notify_cancelled and not isinstance(request.root, types.InitializeRequest):
+                await self._notify_cancelled(request_id)
+            raise
+
+    async def _notify_cancelled(self, request_id: int):
+        notification = types.ClientNotification(types.CancelledNotification(
+            method="notifications/cancelled",
+            params=types.CancelledNotificationParams(requestId=request_id, reason=CANCELLED_REASON),
+        ))
+        with anyio.CancelScope(shield=True), anyio.move_on_after(CANCEL_NOTIFY_TIMEOUT):
+            try:
+                await self.send_notification(notification)
+            except Exception as e:
+                logger.debug(f"Could not send notifications/cancelled for request {request_id}: {e}")
+
+
+@asynccontextmanager
+async def initialized_session(reader, writer, message_handler=None, notify_cancelled: bool = True):
+    """Run the MCP handshake over a transport's streams and yield the session.
+
+    Messages are relayed so the end of the server's output (the process exited,
+    the remote stream closed) can be noticed through ``session.upstream_closed``.
+    """
+    relay_writer, relay_reader = anyio.create_memory_object_stream(0)
+    upstream_closed = asyncio.Event()
+
+    async def relay():
+        try:
+            async with relay_writer:
+                async for message in reader:
+                    await relay_writer.send(message)
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            pass
+        finally:
+            upstream_closed.set()
+
+    async with anyio.create_task_group() as task_group:
+        task_group.start_soon(relay)
+        try:
+            session = CancellingClientSession(relay_reader, writer, message_handler=message_handler)
+            session.notify_cancelled = notify_cancelled
+            async with session:
+                # Some servers (notably Python FastMCP-based) strictly require
+                # initialize to be called prior to tools/list or other methods.
+                result = await session.initialize()
+                # Kept for endpoints that advertise what the server supports
+                session.initialize_result = result.model_dump(mode="json", by_alias=True, exclude_none=True)
+                session.upstream_closed = upstream_closed
+                yield session
+        finally:
+            task_group.cancel_scope.cancel()
+
+
+def stdio_session_factory(server_params: StdioServerParameters, notify_cancelled: bool = True) -> SessionFactory:
+    """Build a factory that spawns a stdio MCP server and yields an initialized session."""
+
+    @asynccontextmanager
+    async def factory(message_handler=None):
+        async with stdio_client(server_params) as (reader, writer, *_):
+            async with initialized_session(reader, writer, message_handler, notify_cancelled) as session:
+                yield session
+
+    return factory
+
+
+class Replica:
+    """One upstream MCP server process and its initialized ClientSession.
+
+    The client context is entered and exited by a dedicated task, so replicas can be
+    started and stopped from any task without tripping anyio's cancel scope checks.
+    """
+
+    def __init__(self, server_name: str, index: int, session_factory: SessionFactory):
+        self.server_name = server_name
+        self.index = index
+        self.session_factory = session_factory
+        self.session = None
+        self.outstanding = 0
+        self.notification_listeners: List[NotificationListener] = []
+        self.exit_listeners: List[ExitListener] = []
+        # Called before the listeners, by the pool that replaces exited replicas
+        self.on_exit: Optional[ExitListener] = None
+        self.started_at: Optional[float] = None
+        # Restarts that failed or crashed soon after, since it last ran stably
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._aborted = False
+        self._error: Optional[BaseException] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.server_name}#{self.index}"
+
+    @property
+    def is_alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self, spawn_semaphore: Optional[asyncio.Semaphore] = None):
+        """Spawn the process and wait until the MCP handshake has completed.
+
+        When a ``spawn_semaphore`` is given, it is held from spawn until the handshake
+        finishes, bounding how many servers cold-start at the same time.
+        """
+        # Replicas can be started again after a stop (lazy pools scaling back up)
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._aborted = False
+        self._error = None
+        async with spawn_semaphore or nullcontext():
+            self._task = asyncio.create_task(self._run(), name=f"mcp-replica-{self.name}")
+            await self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    async def _handle_message(self, message):
+        """Fan upstream notifications out to the registered listeners."""
+        # SDK sessions wrap notifications in a ``root`` model; passthrough sessions deliver them bare
+        notification = getattr(message, "root", message)
+        if getattr(notification, "method", None) is None or isinstance(message, Exception):
+            return
+        for listener in list(self.notification_listeners):
+            try:
+                await listener(self, notification)
+            except Exception as e:
+                logger.error(f"Notification listener failed for '{self.name}': {e}")
+
+    async def _run(self):
+        try:
+            async with self.session_factory(message_handler=self._handle_message) as session:
+                self.session = session
+                self.started_at = time.monotonic()
+                self._ready.set()
+                await self._wait_stop_or_exit(session)
+        except Exception as e:
+            if not self._ready.is_set():
+                self._error = e
+            else:
+                logger.error(f"Replica '{self.name}' exited: {type(e).__name__}: {e}")
+        finally:
+            self.session = None
+            exited_unexpectedly = (
+                self._ready.is_set() and self._error is None and (self._aborted or not self._stop.is_set())
+            )
+            self._ready.set()
+            if exited_unexpectedly:
+                if self.on_exit is not None:
+                    self.on_exit(self)
+                for listener in list(self.exit_listeners):
+                    listener(self)
+
+    async def _wait_stop_or_exit(self, session):
+        """Return when the replica is stopped or its server closed its output."""
+        upstream_closed = getattr(session, "upstream_closed", None)
+        if upstream_closed is None:
+            await self._stop.wait()
+            return
+        waiters = [asyncio.ensure_future(self._stop.wait()), asyncio.ensure_future(upstream_closed.wait())]
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        if not self._stop.is_set():
+            logger.error(f"Replica '{self.name}' exited: the server process closed its output")
+
+    async def abort(self, reason: str):
+        """Terminate a replica that stopped responding; listeners see it as exited, not stopped."""
+        if not self.is_alive:
+            return
+        logger.error(f"Replica '{self.name}' is not responding ({reason}), terminating it")
+        self._aborted = True
+        await self.stop()
+
+    async def stop(self):
+        """Close the session and terminate the process."""
+        self._stop.set()
+        if self._task is not None:
+            try:
+                await self._task
+            except BaseException as e:
+                logger.debug(f"Replica '{self.name}' raised during shutdown: {e}")
+
+
+class RoundRobinPolicy:
+    """Cycle through replicas in order."""
+
+    def __init__(self):
+        self._next = 0
+
+    def choose(self, replicas: List[Replica]) -> Replica:
+        replica = replicas[self._next % len(replicas)]
+        self._next += 1
+        return replica
+
+
+class LeastOutstandingPolicy:
+    """Pick the replica with the fewest in-flight requests."""
+
+    def choose(self, replicas: List[Replica]) -> Replica:
+        return min(replicas, key=lambda r: r.outstanding)
+
+
+class PowerOfTwoChoicesPolicy:
+    """Sample two replicas at random and keep the less loaded one."""
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._rng = rng or random.Random()
+
+    def choose(self, replicas: List[Replica]) -> Replica:
+        if len(replicas) == 1:
+            return replicas[0]
+        first, second = self._rng.sample(replicas, 2)
+        return first if first.outstanding <= second.outstanding else second
+
+
+BALANCING_POLICIES: Dict[str, Callable[[], Any]] = {
+    "round_robin": RoundRobinPolicy,
+    "least_outstanding": LeastOutstandingPolicy,
+    "power_of_two_choices": PowerOfTwoChoicesPolicy,
+}
+
+DEFAULT_POLICY = "round_robin"
+
+
+class SessionPool:
+    """A set of replicas for one configured server, with load balancing.
+
+    When ``sticky`` is enabled, requests carrying the same routing key (the HTTP
+    session id) always go to the same replica while it is alive, which keeps
+    stateful servers consistent for a client.
+
+    A ``lazy`` pool starts no process until the first request; requests arriving
+    during that cold start wait for the same spawn. With an ``idle_timeout`` it
+    stops its replicas again once no request has run for that long.
+
+    With ``standby`` set, that many spare replicas are kept started and
+    initialized next to the active ones. When an active replica exits, a ready
+    spare takes its place at once and a new spare is started in the background.
+    Otherwise the replica is restarted in place, as the ``restart`` policy says.
+    """
+
+    def __init__(self, server_name: str, session_factory: SessionFactory, replicas: int = 1,
+                 policy: str = DEFAULT_POLICY, sticky: bool = False,
+                 spawn_semaphore: Optional[asyncio.Semaphore] = None,
+                 lazy: bool = False, idle_timeout: Optional[float] = None, standby: int = 0,
+                 restart: Optional[RestartPolicy] = None, clock=time.monotonic):
+        if policy not in BALANCING_POLICIES:
+            raise ValueError(f"Unknown load balancing policy: {policy}")
+        self.server_name = server_name
+        self.session_factory = session_factory
+        self.replicas = [Replica(server_name, i, session_factory) for i in range(max(1, replicas))]
+        self.standby = standby
+        self.standbys: List[Replica] = []
+        self.promotions = 0
+        self._next_index = len(self.replicas)
+        self._refill: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.restart = restart or RestartPolicy()
+        self.restarts = 0
+        self._restarting: Dict[Replica, asyncio.Task] = {}
+        # Replaced by a fresh event every time a replica comes back, waking the requests waiting for it
+        self._recovered = asyncio.Event()
+        self.policy_name = policy
+        self.policy = BALANCING_POLICIES[policy]()
+        self.sticky = sticky
+        self.spawn_semaphore = spawn_semaphore
+        self.lazy = lazy
+        self.idle_timeout = idle_timeout if lazy else None
+        self._clock = clock
+        self.last_used = clock()
+        self.cold_starts = 0
+        self.idle_stops = 0
+        self._cold_start: Optional[asyncio.Task] = None
+        self._idle_reaper: Optional[asyncio.Task] = None
+        self._scaling_down: Optional[asyncio.Future] = None
+        self.notification_listeners: List[NotificationListener] = []
+        self.exit_listeners: List[ExitListener] = []
+        self.restart_listeners: List[RestartListener] = []
+        self.idle_stop_listeners: List[IdleStopListener] = []
+        for replica in self.replicas:
+            self._adopt(replica)
+
+    def _adopt(self, replica: Replica):
+        replica.notification_listeners = self.notification_listeners
+        replica.exit_listeners = self.exit_listeners
+        replica.on_exit = self._replace_exited
+
+    def add_notification_listener(self, listener: NotificationListener):
+        """Register ``listener(replica, notification)`` for upstream notifications."""
+        self.notification_listeners.append(listener)
+
+    def add_exit_listener(self, listener: ExitListener):
+        """Register ``listener(replica)``, called when a running replica exits without being stopped."""
+        self.exit_listeners.append(listener)
+
+    def add_restart_listener(self, listener: RestartListener):
+        """Register ``listener(replica)``, called when an exited replica was started again."""
+        self.restart_listeners.append(listener)
+
+    def add_idle_stop_listener(self, listener: IdleStopListener):
+        """Register ``listener(pool)``, called after a lazy pool stopped its idle replicas."""
+        self.idle_stop_listeners.append(listener)
+
+    @property
+    def healthy_replicas(self) -> List[Replica]:
+        return [r for r in self.replicas if r.is_alive]
+
+    def is_restarting(self, replica: Replica) -> bool:
+        return replica in self._restarting
+
+    @property
+    def outstanding(self) -> int:
+        """Upstream requests in flight across all replicas."""
+        return sum(r.outstanding for r in self.replicas)
+
+    @property
+    def session(self):
+        """Session of the first healthy replica, for callers that don't need balancing."""
+        healthy = self.healthy_replicas
+        return healthy[0].session if healthy else None
+
+    async def start(self):
+        """Start every replica concurrently; fail only if none of them comes up.
+
+        Lazy pools defer this to the first request.
+        """
+        if self.lazy:
+            logger.info(f"Server '{self.server_name}' will start on first use")
+            return
+        await self._start_replicas()
+
+    async def _start_replicas(self):
+        results = await asyncio.gather(
+            *(r.start(self.spawn_semaphore) for r in self.replicas), return_exceptions=True
+        )
+        errors = [e for e in results if isinstance(e, BaseException)]
+        for replica, result in zip(self.replicas, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Replica '{replica.name}' failed to start: {type(result).__name__}: {result}")
+        if len(errors) == len(self.replicas):
+            raise errors[0]
+        if len(self.replicas) > 1:
+            logger.info(
+                f"Server '{self.server_name}' running {len(self.healthy_replicas)}/{len(self.replicas)} "
+                f"replicas ({self.policy_name})"
+            )
+        self._stopping = False
+        self._schedule_refill()
+
+    @property
+    def ready_standbys(self) -> List[Replica]:
+        return [r for r in self.standbys if r.is_alive]
+
+    def _replace_exited(self, replica: Replica):
+        """Put a ready standby in the slot of a replica that exited, or restart it; then top the standbys up."""
+        if replica in self.standbys:
+            self.standbys.remove(replica)
+        elif replica in self.replicas and not self._stopping:
+            spare = next(iter(self.ready_standbys), None)
+            if spare is not None:
+                self.standbys.remove(spare)
+                slot = self.replicas.index(replica)
+                spare.index = replica.index
+                self.replicas[slot] = spare
+                self.promotions += 1
+                logger.info(f"Replica '{replica.name}' exited, promoted a standby in its place")
+            elif self.restart.enabled and replica not in self._restarting:
+                self._restarting[replica] = asyncio.create_task(
+                    self._restart_replica(replica), name=f"mcp-restart-{replica.name}"
+                )
+        self._schedule_refill()
+
+    async def _restart_replica(self, replica: Replica):
+        """Start an exited replica again, backing off while it keeps failing."""
+        try:
+            if replica.started_at is not None and time.monotonic() - replica.started_at >= self.restart.max_delay:
+                replica.failures = 0
+            while not self._stopping:
+                delay = self.restart.delay(replica.failures)
+                replica.failures += 1
+                logger.info(f"Restarting replica '{replica.name}' in {delay:.2f}s (attempt {replica.failures})")
+                await asyncio.sleep(delay)
+                if self._stopping:
+                    return
+                try:
+                    await replica.start(self.spawn_semaphore)
+                except Exception as e:
+                    logger.warning(f"Replica '{replica.name}' failed to restart: {type(e).__name__}: {e}")
+                    continue
+                self.restarts += 1
+                logger.info(f"Replica '{replica.name}' restarted")
+                for listener in list(self.restart_listeners):
+                    listener(replica)
+                recovered, self._recovered = self._recovered, asyncio.Event()
+                recovered.set()
+                return
+        except asyncio.CancelledError:
+            await replica.stop()
+            raise
+        finally:
+            if self._restarting.get(replica) is asyncio.current_task():
+                del self._restarting[replica]
+
+    async def _wait_for_recovery(self):
+        """Give a replica being restarted up to ``request_wait`` to come back."""
+        deadline = self._clock() + self.restart.request_wait
+        while not self.healthy_replicas and self._restarting:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._recovered.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+    def _schedule_refill(self):
+        if self.standby and not self._stopping and (self._refill is None or self._refill.done()):
+            self._refill = asyncio.create_task(self._fill_standbys(), name=f"mcp-standby-{self.server_name}")
+
+    async def _fill_standbys(self):
+        """Start spares, one at a time, until ``standby`` of them are ready."""
+        while not self._stopping and len(self.ready_standbys) < self.standby:
+            spare = Replica(self.server_name, self._next_index, self.session_factory)
+            self._next_index += 1
+            self._adopt(spare)
+            try:
+                await spare.start(self.spawn_semaphore)
+            except asyncio.CancelledError:
+                # Pool stopping: don't leave a half-started process behind
+                await spare.stop()
+                raise
+            except Exception as e:
+                logger.warning(f"Standby for '{self.server_name}' failed to start: {type(e).__name__}: {e}")
+                await asyncio.sleep(STANDBY_RETRY_DELAY)
+                continue
+            if self._stopping:
+                await spare.stop()
+                return
+            self.standbys.append(spare)
+            logger.info(f"Server '{self.server_name}' has {len(self.ready_standbys)}/{self.standby} standbys ready")
+
+    async def _stop_replicas(self):
+        """Stop the active replicas, the standbys and their refill."""
+        self._stopping = True
+        tasks = [task for task in [self._refill, *self._restarting.values()] if task is not None and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        standbys, self.standbys = self.standbys, []
+        await asyncio.gather(*(r.stop() for r in self.replicas + standbys), return_exceptions=True)
+
+    async def stop(self):
+        for task in (self._cold_start, self._idle_reaper):
+            if task is not None and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        await self._stop_replicas()
+
+    async def ensure_started(self):
+        """Bring a lazy pool's replicas up, sharing one cold start between concurrent callers."""
+        while self._scaling_down is not None:
+            await asyncio.shield(self._scaling_down)
+        if self.healthy_replicas:
+            return
+        if self._cold_start is None or self._cold_start.done():
+            self._cold_start = asyncio.create_task(self._start_cold(), name=f"mcp-cold-start-{self.server_name}")
+        try:
+            # A waiter giving up must not cancel the spawn the others are waiting on
+            await asyncio.shield(self._cold_start)
+        except Exception as e:
+            raise NoHealthyReplicaError(
+                f"Server '{self.server_name}' failed to start: {type(e).__name__}: {e}"
+            ) from e
+
+    async def _start_cold(self):
+        started = self._clock()
+        # Clear out replicas that died, so they can be started again
+        await self._stop_replicas()
+        await self._start_replicas()
+        self.cold_starts += 1
+        self.last_used = self._clock()
+        logger.info(f"Server '{self.server_name}' started on demand in {self._clock() - started:.2f}s")
+        if self.idle_timeout and (self._idle_reaper is None or self._idle_reaper.done()):
+            self._idle_reaper = asyncio.create_task(self._reap_idle(), name=f"mcp-idle-{self.server_name}")
+
+    async def _reap_idle(self):
+        """Stop the replicas once the pool has been idle for ``idle_timeout``, then exit."""
+        while True:
+            idle_for = self._clock() - self.last_used
+            if self.outstanding == 0 and idle_for >= self.idle_timeout:
+                break
+            await asyncio.sleep(max(self.idle_timeout - idle_for, IDLE_CHECK_INTERVAL))
+
+        # Set before the first await, so no request can lease a replica being stopped
+        self._scaling_down = asyncio.get_running_loop().create_future()
+        try:
+            logger.info(f"Server '{self.server_name}' idle for {self.idle_timeout:g}s, stopping it")
+            await self._stop_replicas()
+            self.idle_stops += 1
+            for listener in list(self.idle_stop_listeners):
+                listener(self)
+        finally:
+            self._scaling_down.set_result(None)
+            self._scaling_down = None
+
+    def select(self, key: Optional[str] = None) -> Replica:
+        """Pick a replica for a request, honouring sticky routing when enabled."""
+        healthy = self.healthy_replicas
+        if not healthy:
+            raise NoHealthyReplicaError(f"No healthy replica for server '{self.server_name}'")
+        if self.sticky and key:
+            replica = self.replicas[zlib.crc32(key.encode("utf-8")) % len(self.replicas)]
+            if replica.is_alive:
+                return replica
+        return self.policy.choose(healthy)
+
+    @asynccontextmanager
+    async def acquire(self, key: Optional[str] = None):
+        """Lease a session for one upstream request, tracking in-flight counts."""
+        if self.lazy:
+            await self.ensure_started()
+        if self._restarting and not self.healthy_replicas:
+            await self._wait_for_recovery()
+        replica = self.select(key)
+        replica.outstanding += 1
+        try:
+            yield replica.session
+        finally:
+            replica.outstanding -= 1
+            self.last_used = self._clock()
@@ -0,0 +1,134 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from mcp_hub.utils.pool import SessionFactory, initialized_session
+
+
+logger = logging.getLogger(__name__)
+
+
+STREAMABLE_HTTP = "streamable-http"
+SSE = "sse"
+TRANSPORTS = (STREAMABLE_HTTP, SSE)
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 100
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+
+def default_transport(url: str) -> str:
+    """Transport of a ``url`` server without an explicit one: SSE for ``.../sse`` endpoints."""
+    return SSE if urlsplit(url).path.rstrip("/").endswith("/sse") else STREAMABLE_HTTP
+
+
+def validate_remote_config(where: str, server_cfg: Dict[str, Any]) -> None:
+    """Validate the ``url``, ``transport`` and ``headers`` of a remote server."""
+    url = server_cfg["url"]
+    if not isinstance(url, str) or urlsplit(url).scheme not in ("http", "https") or not urlsplit(url).netloc:
+        raise ValueError(f"{where} 'url' must be an http(s) URL")
+    if server_cfg.get("transport", STREAMABLE_HTTP) not in TRANSPORTS:
+        raise ValueError(f"{where} 'transport' must be one of: {', '.join(TRANSPORTS)}")
+    headers = server_cfg.get("headers", {})
+    if not isinstance(headers, dict) or not all(isinstance(v, str) for v in headers.values()):
+        raise ValueError(f"{where} 'headers' must map header names to strings")
+
+
+def validate_http_pool_config(cfg: Any) -> None:
+    """Validate the ``httpPool`` object of the 'gateway' section."""
+    if not isinstance(cfg, dict):
+        raise ValueError("'gateway' 'httpPool' must be an object")
+    per_host = cfg.get("maxConnectionsPerHost", DEFAULT_MAX_CONNECTIONS_PER_HOST)
+    if not isinstance(per_host, int) or isinstance(per_host, bool) or per_host < 1:
+        raise ValueError("'gateway' 'httpPool.maxConnectionsPerHost' must be a positive integer")
+    expiry = cfg.get("keepaliveExpiry", DEFAULT_KEEPALIVE_EXPIRY)
+    if not isinstance(expiry, (int, float)) or isinstance(expiry, bool) or expiry < 0:
+        raise ValueError("'gateway' 'httpPool.keepaliveExpiry' must be a non-negative number")
+
+
+class HttpPool:
+    """Keep-alive HTTP connections to remote MCP servers, shared by every server on the same host.
+
+    Each host (scheme, host, port) gets its own connection pool of at most
+    ``max_connections_per_host`` connections, so one busy or slow host cannot
+    use up the connections of the others. Sessions get throwaway clients that
+    route their requests into these pools; closing a client leaves the pool open.
+    """
+
+    def __init__(self, max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+                 keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY):
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_connections_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._hosts: Dict[Tuple[bytes, bytes, Optional[int]], httpx.AsyncHTTPTransport] = {}
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]]) -> "HttpPool":
+        cfg = cfg or {}
+        return cls(
+            max_connections_per_host=cfg.get("maxConnectionsPerHost", DEFAULT_MAX_CONNECTIONS_PER_HOST),
+            keepalive_expiry=cfg.get("keepaliveExpiry", DEFAULT_KEEPALIVE_EXPIRY),
+        )
+
+    def transport_for(self, url: httpx.URL) -> httpx.AsyncHTTPTransport:
+        key = (url.raw_scheme, url.raw_host, url.port)
+        transport = self._hosts.get(key)
+        if transport is None:
+            transport = self._hosts[key] = httpx.AsyncHTTPTransport(limits=self.limits)
+        return transport
+
+    def client(self, headers: Optional[Dict[str, str]] = None, timeout: Optional[httpx.Timeout] = None,
+               auth: Optional[httpx.Auth] = None) -> httpx.AsyncClient:
+        """An ``httpx.AsyncClient`` over the shared pools, shaped like the SDK's ``create_mcp_http_client``."""
+        return httpx.AsyncClient(
+            transport=_PooledTransport(self),
+            headers=headers,
+            timeout=timeout if timeout is not None else httpx.Timeout(30.0),
+            auth=auth,
+            follow_redirects=True,
+        )
+
+    @property
+    def hosts(self) -> int:
+        return len(self._hosts)
+
+    async def aclose(self):
+        transports, self._hosts = list(self._hosts.values()), {}
+        for transport in transports:
+            await transport.aclose()
+
+
+class _PooledTransport(httpx.AsyncBaseTransport):
+    """Sends a client's requests through the pool of their host; closing it leaves the pools open."""
+
+    def __init__(self, pool: HttpPool):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool.transport_for(request.url).handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+
+def remote_session_factory(url: str, transport: str, http_pool: HttpPool, headers: Optional[Dict[str, str]] = None,
+                           notify_cancelled: bool = True) -> SessionFactory:
+    """Build a factory that connects to a remote MCP server over SSE or streamable HTTP."""
+
+    @asynccontextmanager
+    async def factory(message_handler=None):
+        if transport == SSE:
+            client = sse_client(url, headers=headers, httpx_client_factory=http_pool.client)
+        else:
+            client = streamablehttp_client(url, headers=headers, httpx_client_factory=http_pool.client)
+        async with client as (reader, writer, *_):
+            async with initialized_session(reader, writer, message_handler, notify_cancelled) as session:
+                yield session
+
+    return factory
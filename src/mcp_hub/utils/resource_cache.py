@@ -0,0 +1,172 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from pydantic import AnyUrl, ValidationError
+
+from mcp_hub.utils.coalesce import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
+
+RESOURCE_UPDATED = "notifications/resources/updated"
+RESOURCE_LIST_CHANGED = "notifications/resources/list_changed"
+DEFAULT_RESOURCE_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+# Reads a resource on one upstream session: (serialized result, whether that session is now subscribed to it)
+ResourceFetch = Callable[[bool], Awaitable[Tuple[bytes, bool]]]
+
+
+def validate_resource_cache_config(where: str, cfg: Any) -> None:
+    """Validate the ``resourceCache`` object of a server."""
+    if not isinstance(cfg, dict):
+        raise ValueError(f"{where} 'resourceCache' must be an object")
+    max_bytes = cfg.get("maxBytes", DEFAULT_RESOURCE_CACHE_MAX_BYTES)
+    if not isinstance(max_bytes, int) or isinstance(max_bytes, bool) or max_bytes < 1:
+        raise ValueError(f"{where} 'resourceCache.maxBytes' must be a positive integer")
+    ttl = cfg.get("ttl")
+    if ttl is not None and (not isinstance(ttl, (int, float)) or isinstance(ttl, bool) or ttl <= 0):
+        raise ValueError(f"{where} 'resourceCache.ttl' must be a positive number")
+
+
+def normalize_uri(uri: Any) -> str:
+    """Cache key of a URI, spelled the way the SDK parses it (``http://h`` is ``http://h/``)."""
+    try:
+        return str(AnyUrl(str(uri)))
+    except ValidationError:
+        return str(uri)
+
+
+class ResourceCache:
+    """Serialized ``resources/read`` results of one server, keyed by URI and bounded by ``max_bytes``.
+
+    The gateway subscribes to a URI upstream the first time it is read, and the
+    entry lives until the server reports it changed (``resources/updated``) or
+    its resource list changed. URIs the server cannot subscribe to are only
+    cached when a ``ttl`` is set. Concurrent misses of a URI share one read.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_RESOURCE_CACHE_MAX_BYTES, ttl: Optional[float] = None,
+                 clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._epoch = 0
+        self._single_flight = SingleFlight()
+        # URIs subscribed upstream, and URIs the server refused to subscribe to
+        self.subscribed: Set[str] = set()
+        self.unsubscribable: Set[str] = set()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _version(self, uri: str) -> Tuple[int, int]:
+        return self._epoch, self._versions.get(uri, 0)
+
+    def _forget(self, uri: str):
+        entry = self._entries.pop(uri, None)
+        if entry is not None:
+            self.size_bytes -= len(entry[0])
+
+    def get(self, uri: str) -> Optional[bytes]:
+        entry = self._entries.get(uri)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= self._clock():
+            self._forget(uri)
+            return None
+        self._entries.move_to_end(uri)
+        return entry[0]
+
+    def put(self, uri: str, result_bytes: bytes, expires_at: Optional[float] = None):
+        if len(result_bytes) > self.max_bytes:
+            return
+        self._forget(uri)
+        self._entries[uri] = (result_bytes, expires_at)
+        self.size_bytes += len(result_bytes)
+        while self.size_bytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+            self.evictions += 1
+
+    def invalidate(self, uri: str):
+        """Drop one URI; a read already in flight for it will not be cached."""
+        self._versions[uri] = self._versions.get(uri, 0) + 1
+        if uri in self._entries:
+            self.invalidations += 1
+        self._forget(uri)
+
+    def clear(self):
+        """Drop every entry, e.g. when the resource list changed."""
+        self._epoch += 1
+        self._versions.clear()
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def reset_subscriptions(self):
+        """Forget subscriptions and their entries after an upstream process went away."""
+        self.subscribed.clear()
+        self.unsubscribable.clear()
+        self.clear()
+
+    async def on_notification(self, replica, notification):
+        """Pool notification listener: evict what the server says has changed."""
+        if notification.method == RESOURCE_UPDATED:
+            params = notification.params
+            uri = params.get("uri") if isinstance(params, dict) else getattr(params, "uri", None)
+            if uri is not None:
+                logger.debug(f"Resource {uri} updated upstream ({replica.name}), evicting it")
+                self.invalidate(normalize_uri(uri))
+        elif notification.method == RESOURCE_LIST_CHANGED:
+            logger.info(f"Resource list changed upstream ({replica.name}), clearing resource cache")
+            self.clear()
+
+    def on_exit(self, replica):
+        """Pool exit listener: subscriptions die with the process that held them."""
+        self.reset_subscriptions()
+
+    async def get_or_fetch(self, uri: str, fetch: ResourceFetch) -> bytes:
+        """Return a cached read, or read (and subscribe) upstream on a miss.
+
+        ``fetch`` is told whether it should subscribe to the URI before reading it.
+        """
+        cached = self.get(uri)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        return await self._single_flight.do(uri, lambda: self._fetch(uri, fetch))
+
+    async def _fetch(self, uri: str, fetch: ResourceFetch) -> bytes:
+        version = self._version(uri)
+        should_subscribe = uri not in self.subscribed and uri not in self.unsubscribable
+        result_bytes, subscribed = await fetch(should_subscribe)
+        if self._version(uri) != version:
+            # Changed (or the process was replaced) while being read: serve this read but don't keep it
+            return result_bytes
+        if should_subscribe:
+            (self.subscribed if subscribed else self.unsubscribable).add(uri)
+        if uri in self.subscribed:
+            self.put(uri, result_bytes, self._clock() + self.ttl if self.ttl else None)
+        elif self.ttl:
+            self.put(uri, result_bytes, self._clock() + self.ttl)
+        return result_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self.size_bytes,
+            "maxBytes": self.max_bytes,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "subscribed": len(self.subscribed),
+        }
@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from mcp_hub.utils import fastjson
+from mcp_hub.utils.catalog import dump_json
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_RESULT_CACHE_MAX_BYTES = 1024 * 1024
+DEFAULT_RESULT_STORE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def validate_result_cache_config(where: str, cfg: Any) -> None:
+    """Validate the ``cache`` object of a tool."""
+    if not isinstance(cfg, dict):
+        raise ValueError(f"{where} 'cache' must be an object")
+    ttl = cfg.get("ttl")
+    if not isinstance(ttl, (int, float)) or isinstance(ttl, bool) or ttl <= 0:
+        raise ValueError(f"{where} 'cache.ttl' must be a positive number")
+    max_bytes = cfg.get("maxBytes", DEFAULT_RESULT_CACHE_MAX_BYTES)
+    if not isinstance(max_bytes, int) or isinstance(max_bytes, bool) or max_bytes < 1:
+        raise ValueError(f"{where} 'cache.maxBytes' must be a positive integer")
+    if not isinstance(cfg.get("disk", True), bool):
+        raise ValueError(f"{where} 'cache.disk' must be a boolean")
+
+
+def server_fingerprint(server_name: str, server_cfg: Dict[str, Any]) -> str:
+    """Identifies what produced a result, so persisted entries of a changed server are never served."""
+    origin = {key: server_cfg.get(key) for key in ("command", "args", "env")}
+    if server_cfg.get("url") is not None:
+        origin["url"] = server_cfg["url"]
+    digest = hashlib.sha256(dump_json(origin)).hexdigest()[:16]
+    return f"{server_name}:{digest}"
+
+
+class ResultStore:
+    """On-disk tier: one sqlite file shared by every cached tool, bounded by ``max_bytes``.
+
+    Expiry uses wall-clock time so entries stay valid across restarts. When the
+    file grows past its budget the least recently read entries are deleted.
+    Methods block; callers run them in a worker thread.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_RESULT_STORE_MAX_BYTES, clock=time.time):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at)")
+        self._db.execute("DELETE FROM results WHERE expires_at <= ?", (self._clock(),))
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """Return ``(value, expires_at)`` of a live entry."""
+        now = self._clock()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM results WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+        return row
+
+    def put(self, key: str, value: bytes, expires_at: float):
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), expires_at, now),
+            )
+            self._db.execute("DELETE FROM results WHERE expires_at <= ?", (now,))
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._db.execute("SELECT key, size FROM results ORDER BY accessed_at").fetchall()
+                evict = []
+                for old_key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    evict.append((old_key,))
+                    total -= size
+                self._db.executemany("DELETE FROM results WHERE key = ?", evict)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class ResultCache:
+    """Cache of one tool's ``tools/call`` results keyed by canonicalized arguments.
+
+    The memory tier is an LRU bounded by ``max_bytes`` of serialized results; with
+    a ``store`` attached, misses fall through to the shared on-disk tier and hits
+    there are promoted back to memory.
+    """
+
+    def __init__(self, namespace: str, ttl: float, max_bytes: int = DEFAULT_RESULT_CACHE_MAX_BYTES,
+                 store: Optional[ResultStore] = None, clock=time.time):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.store = store
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], int, float]]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _remember(self, key: str, result: Dict[str, Any], size: int, expires_at: float):
+        if size > self.max_bytes:
+            return
+        self._forget(key)
+        self._entries[key] = (result, size, expires_at)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.size_bytes -= evicted_size
+            self.evictions += 1
+
+    def _forget(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[1]
+
+    async def get(self, arguments_key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(arguments_key)
+        if entry is not None:
+            if entry[2] > self._clock():
+                self._entries.move_to_end(arguments_key)
+                self.hits += 1
+                return entry[0]
+            self._forget(arguments_key)
+
+        if self.store is not None:
+            try:
+                row = await asyncio.to_thread(self.store.get, f"{self.namespace}\0{arguments_key}")
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache store read failed for {self.namespace}: {e}")
+                row = None
+            if row is not None:
+                value, expires_at = row
+                result = fastjson.loads(value)
+                self._remember(arguments_key, result, len(value), expires_at)
+                self.disk_hits += 1
+                return result
+
+        self.misses += 1
+        return None
+
+    async def put(self, arguments_key: str, result: Dict[str, Any]):
+        value = dump_json(result)
+        expires_at = self._clock() + self.ttl
+        self._remember(arguments_key, result, len(value), expires_at)
+        if self.store is not None:
+            try:
+                await asyncio.to_thread(self.store.put, f"{self.namespace}\0{arguments_key}", value, expires_at)
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache store write failed for {self.namespace}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self.size_bytes,
+            "maxBytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+def create_result_caches(server_name: str, server_cfg: Dict[str, Any],
+                         store: Optional[ResultStore] = None) -> Dict[str, ResultCache]:
+    """Result caches of the tools that configure one, keyed by tool name."""
+    caches = {}
+    namespace = server_fingerprint(server_name, server_cfg)
+    for tool_name, tool_cfg in (server_cfg.get("tools") or {}).items():
+        cache_cfg = tool_cfg.get("cache")
+        if not cache_cfg:
+            continue
+        caches[tool_name] = ResultCache(
+            f"{namespace}/{tool_name}",
+            ttl=cache_cfg["ttl"],
+            max_bytes=cache_cfg.get("maxBytes", DEFAULT_RESULT_CACHE_MAX_BYTES),
+            store=store if cache_cfg.get("disk", True) else None,
+        )
+    return caches
@@ -0,0 +1,127 @@
+import asyncio
+import importlib.util
+import json
+from typing import Any, Callable, Dict, Optional
+
+
+DEFAULT = "default"
+PERFORMANCE = "performance"
+PROFILES = (DEFAULT, PERFORMANCE)
+
+# uvicorn's own defaults, kept by the default profile
+DEFAULT_BACKLOG = 2048
+DEFAULT_KEEP_ALIVE_TIMEOUT = 5.0
+# Room for connection bursts, and idle client connections kept long enough to be reused
+PERFORMANCE_BACKLOG = 8192
+PERFORMANCE_KEEP_ALIVE_TIMEOUT = 30.0
+
+
+def installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def validate_runtime_config(cfg: Any) -> None:
+    """Validate the ``runtime`` object of the 'gateway' section."""
+    if not isinstance(cfg, dict):
+        raise ValueError("'gateway' 'runtime' must be an object")
+    if cfg.get("profile", DEFAULT) not in PROFILES:
+        raise ValueError(f"'gateway' 'runtime.profile' must be one of: {', '.join(PROFILES)}")
+    for key in ("backlog", "limitConcurrency"):
+        value = cfg.get(key)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+            raise ValueError(f"'gateway' 'runtime.{key}' must be a positive integer")
+    keep_alive = cfg.get("keepAliveTimeout", DEFAULT_KEEP_ALIVE_TIMEOUT)
+    if not isinstance(keep_alive, (int, float)) or isinstance(keep_alive, bool) or keep_alive < 0:
+        raise ValueError("'gateway' 'runtime.keepAliveTimeout' must be a non-negative number")
+
+
+def read_runtime_config(config_path: Optional[str]) -> Dict[str, Any]:
+    """The ``gateway.runtime`` object of a config file, read before the event loop exists.
+
+    A missing or unreadable file gives an empty object; loading the config
+    later reports the actual problem.
+    """
+    if not config_path:
+        return {}
+    try:
+        with open(config_path, "r") as f:
+            config_data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    gateway_cfg = config_data.get("gateway") if isinstance(config_data, dict) else None
+    return gateway_cfg.get("runtime", {}) if isinstance(gateway_cfg, dict) else {}
+
+
+class RuntimeProfile:
+    """Event loop, HTTP parser and uvicorn socket settings the gateway runs with.
+
+    The ``default`` profile keeps the standard asyncio loop and uvicorn's
+    defaults. ``performance`` switches to uvloop and httptools when they are
+    installed, runs tasks eagerly on Python 3.12+ (a task that finishes without
+    blocking, such as a cache hit, never goes through the scheduler) and uses
+    a larger backlog and keep-alive timeout. ``backlog``, ``limit_concurrency``
+    and ``keep_alive_timeout`` override either profile.
+    """
+
+    def __init__(self, name: str = DEFAULT, backlog: Optional[int] = None,
+                 limit_concurrency: Optional[int] = None, keep_alive_timeout: Optional[float] = None):
+        performance = name == PERFORMANCE
+        self.name = name
+        self.backlog = backlog or (PERFORMANCE_BACKLOG if performance else DEFAULT_BACKLOG)
+        self.limit_concurrency = limit_concurrency
+        if keep_alive_timeout is None:
+            keep_alive_timeout = PERFORMANCE_KEEP_ALIVE_TIMEOUT if performance else DEFAULT_KEEP_ALIVE_TIMEOUT
+        self.keep_alive_timeout = keep_alive_timeout
+        self.uvloop = performance and installed("uvloop")
+        self.httptools = performance and installed("httptools")
+        self.eager_tasks = performance and hasattr(asyncio, "eager_task_factory")
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]], profile: Optional[str] = None,
+                    backlog: Optional[int] = None, limit_concurrency: Optional[int] = None,
+                    keep_alive_timeout: Optional[float] = None) -> "RuntimeProfile":
+        """The profile of a ``gateway.runtime`` object; command line values take precedence."""
+        cfg = cfg or {}
+        return cls(
+            name=profile or cfg.get("profile", DEFAULT),
+            backlog=backlog or cfg.get("backlog"),
+            limit_concurrency=limit_concurrency or cfg.get("limitConcurrency"),
+            keep_alive_timeout=keep_alive_timeout if keep_alive_timeout is not None else cfg.get("keepAliveTimeout"),
+        )
+
+    def loop_factory(self) -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+        if self.uvloop:
+            import uvloop
+            return uvloop.new_event_loop
+        return None
+
+    def run(self, main):
+        """Run the gateway's main coroutine on the event loop this profile asks for."""
+        with asyncio.Runner(loop_factory=self.loop_factory()) as runner:
+            if self.eager_tasks:
+                runner.get_loop().set_task_factory(asyncio.eager_task_factory)
+            return runner.run(main)
+
+    def uvicorn_options(self) -> Dict[str, Any]:
+        return {
+            "http": "httptools" if self.httptools else "auto",
+            "backlog": self.backlog,
+            "limit_concurrency": self.limit_concurrency,
+            "timeout_keep_alive": self.keep_alive_timeout,
+        }
+
+    def describe(self) -> str:
+        return (
+            f"{self.name} (loop: {'uvloop' if self.uvloop else 'asyncio'}, "
+            f"http: {'httptools' if self.httptools else 'auto'}, "
+            f"eager tasks: {'on' if self.eager_tasks else 'off'}, backlog: {self.backlog}, "
+            f"limit concurrency: {self.limit_concurrency or 'none'}, keep-alive: {self.keep_alive_timeout:g}s)"
+        )
+
+
+def running_loop_matches(profile: RuntimeProfile) -> bool:
+    """Whether the running loop is the one ``profile`` asks for (False when not started by ``run``)."""
+    loop = asyncio.get_running_loop()
+    if profile.uvloop and not type(loop).__module__.startswith("uvloop"):
+        return False
+    return not profile.eager_tasks or loop.get_task_factory() is asyncio.eager_task_factory
@@ -0,0 +1,84 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+DEFAULT_MAX_SESSIONS = 10000
+DEFAULT_SESSION_TTL = 3600.0
+
+
+class SessionState:
+    """Per-client MCP session state kept by the gateway."""
+
+    __slots__ = ("initialized", "last_seen")
+
+    def __init__(self, now: float):
+        self.initialized = False
+        self.last_seen = now
+
+
+class SessionStore:
+    """Bounded HTTP session store with idle TTL and LRU eviction.
+
+    Entries are kept in least-recently-used order, so both expired sessions and
+    the eviction victim are always at the front and every operation is O(1)
+    amortized. A ``ttl`` of None keeps idle sessions until they are evicted by size.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SESSIONS,
+                 ttl: Optional[float] = DEFAULT_SESSION_TTL, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def get(self, session_id: str) -> SessionState:
+        """Return the state of ``session_id``, creating it if unknown or expired."""
+        now = self._clock()
+        self._expire(now)
+        state = self._sessions.get(session_id)
+        if state is not None:
+            state.last_seen = now
+            self._sessions.move_to_end(session_id)
+            return state
+
+        while self._sessions and len(self._sessions) >= self.max_size:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+        state = self._sessions[session_id] = SessionState(now)
+        return state
+
+    def discard(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+    def clear(self) -> None:
+        self._sessions.clear()
+
+    def _expire(self, now: float) -> None:
+        if self.ttl is None:
+            return
+        cutoff = now - self.ttl
+        sessions = self._sessions
+        while sessions:
+            oldest = next(iter(sessions.values()))
+            if oldest.last_seen > cutoff:
+                break
+            sessions.popitem(last=False)
+            self.expirations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._sessions),
+            "maxSize": self.max_size,
+            "ttl": self.ttl,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
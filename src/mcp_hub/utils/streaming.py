@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+from mcp_hub.utils.catalog import dump_json
+from mcp_hub.utils.jsonrpc import encode_reply
+
+
+logger = logging.getLogger(__name__)
+
+
+EVENT_STREAM = "text/event-stream"
+KEEPALIVE_INTERVAL = 15.0
+
+# Called by the upstream session for every progress notification of a request
+ProgressCallback = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+StreamingHandler = Callable[..., Awaitable[Any]]
+
+
+def progress_token(message: Dict[str, Any]):
+    params = message.get("params") or {}
+    return (params.get("_meta") or {}).get("progressToken")
+
+
+def wants_event_stream(accept: str, message: Dict[str, Any]) -> bool:
+    """Decide whether a tools/call should be answered with an SSE stream.
+
+    Clients that accept only SSE always get a stream. Clients that accept both
+    JSON and SSE (the Streamable HTTP default) get one when they asked for progress
+    by sending a progressToken, so plain JSON clients keep the JSON body.
+    """
+    if message.get("method") != "tools/call" or "id" not in message or EVENT_STREAM not in accept:
+        return False
+    return "application/json" not in accept or progress_token(message) is not None
+
+
+def sse_event(data: bytes) -> bytes:
+    return b"event: message\ndata: " + data + b"\n\n"
+
+
+def progress_forwarder(token, queue: asyncio.Queue) -> Optional[ProgressCallback]:
+    """Build a progress callback that relays upstream progress as client notifications."""
+    if token is None:
+        return None
+
+    async def on_progress(progress: float, total: Optional[float], message: Optional[str]):
+        params: Dict[str, Any] = {"progressToken": token, "progress": progress}
+        if total is not None:
+            params["total"] = total
+        if message is not None:
+            params["message"] = message
+        notification = {"jsonrpc": "2.0", "method": "notifications/progress", "params": params}
+        queue.put_nowait(sse_event(dump_json(notification)))
+
+    return on_progress
+
+
+async def event_stream(message: Dict[str, Any], handle: StreamingHandler,
+                       keepalive: float = KEEPALIVE_INTERVAL) -> AsyncIterator[bytes]:
+    """Yield SSE events for one request: progress notifications, then the final response."""
+    queue: asyncio.Queue = asyncio.Queue()
+    on_progress = progress_forwarder(progress_token(message), queue)
+
+    async def run():
+        reply = await encode_reply(message, lambda m: handle(m, progress_callback=on_progress))
+        if reply is not None:
+            queue.put_nowait(sse_event(reply))
+        queue.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                # Comment line: keeps proxies from timing out an idle stream
+                yield b": keepalive\n\n"
+                continue
+            if event is None:
+                break
+            yield event
+    finally:
+        # Client went away before the tool finished
+        if not task.done():
+            task.cancel()
+
+
+def stream_response(message: Dict[str, Any], handle: StreamingHandler) -> StreamingResponse:
+    return StreamingResponse(
+        event_stream(message, handle),
+        media_type=EVENT_STREAM,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
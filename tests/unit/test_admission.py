@@ -0,0 +1,180 @@
+import asyncio
+
+import httpx
+import pytest
+
+from mcp_hub.main import create_sub_app, validate_server_config
+from mcp_hub.utils.admission import (
+    OVERLOADED_ERROR_CODE,
+    AdmissionControl,
+    ConcurrencyLimiter,
+    OverloadedError,
+)
+
+
+class SlowSession:
+    def __init__(self, delay=0.2):
+        self.delay = delay
+
+    async def call_tool(self, name, arguments=None):
+        await asyncio.sleep(self.delay)
+        content = type("FakeContent", (), {"type": "text", "text": name})()
+        return type("FakeResult", (), {"content": [content]})()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def hold(limiter, release: asyncio.Event, entered: list):
+    async with limiter.slot():
+        entered.append(True)
+        await release.wait()
+
+
+# Testa fila limitada: excedente é rejeitado na hora e a fila anda em ordem
+@pytest.mark.asyncio
+async def test_limiter_queue_and_reject():
+    limiter = ConcurrencyLimiter("srv", max_in_flight=1, max_queue=1, max_queue_wait=5)
+    release, entered = asyncio.Event(), []
+    first = asyncio.create_task(hold(limiter, release, entered))
+    second = asyncio.create_task(hold(limiter, release, entered))
+    await asyncio.sleep(0.01)
+    assert limiter.in_flight == 1 and limiter.queued == 1
+
+    with pytest.raises(OverloadedError) as exc:
+        async with limiter.slot():
+            pass
+    assert exc.value.retry_after >= 1
+    assert limiter.rejected == 1
+
+    release.set()
+    await asyncio.gather(first, second)
+    assert len(entered) == 2
+    assert limiter.in_flight == 0 and limiter.queued == 0
+
+
+# Testa tempo máximo de espera na fila
+@pytest.mark.asyncio
+async def test_limiter_queue_wait_timeout():
+    limiter = ConcurrencyLimiter("srv", max_in_flight=1, max_queue=5, max_queue_wait=0.05)
+    release, entered = asyncio.Event(), []
+    first = asyncio.create_task(hold(limiter, release, entered))
+    await asyncio.sleep(0.01)
+    with pytest.raises(OverloadedError):
+        async with limiter.slot():
+            pass
+    assert limiter.timed_out == 1 and limiter.queued == 0
+    release.set()
+    await first
+    assert limiter.in_flight == 0
+
+
+# Testa cancelamento de quem está na fila sem vazar vagas
+@pytest.mark.asyncio
+async def test_limiter_cancelled_waiter_releases_nothing():
+    limiter = ConcurrencyLimiter("srv", max_in_flight=1, max_queue=5, max_queue_wait=5)
+    release, entered = asyncio.Event(), []
+    first = asyncio.create_task(hold(limiter, release, entered))
+    waiting = asyncio.create_task(hold(limiter, release, entered))
+    await asyncio.sleep(0.01)
+    waiting.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    await first
+    assert limiter.in_flight == 0 and limiter.queued == 0
+    assert len(entered) == 1
+
+
+# Testa o modo adaptativo (AIMD): latência alta reduz o limite, latência normal recupera
+@pytest.mark.asyncio
+async def test_adaptive_limit_aimd():
+    clock = FakeClock()
+    limiter = ConcurrencyLimiter("srv", max_in_flight=10, max_queue=0, adaptive=True, clock=clock)
+
+    async def call(latency):
+        async with limiter.slot():
+            clock.now += latency
+
+    for _ in range(20):
+        await call(0.1)
+    assert limiter.limit == 10
+    for _ in range(60):
+        await call(1.0)
+    reduced = limiter.limit
+    assert reduced < 10
+    for _ in range(200):
+        await call(0.1)
+    assert limiter.limit > reduced
+
+
+def make_client(server_cfg):
+    app = create_sub_app("test", {"command": "echo", **server_cfg}, ["*"], None, False, None, 5, None)
+    app.state.session = SlowSession()
+    return app, httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def tool_call(req_id, name="slow"):
+    return {"jsonrpc": "2.0", "id": req_id, "method": "tools/call", "params": {"name": name}}
+
+
+# Testa 429 com Retry-After no endpoint e erro JSON-RPC dentro de batch
+@pytest.mark.asyncio
+async def test_endpoint_rejects_with_429():
+    app, client = make_client({"concurrency": {"maxInFlight": 1, "maxQueue": 0}})
+    async with client:
+        await client.post("/", json={"jsonrpc": "2.0", "id": 0, "method": "initialize"}, headers={"x-session-id": "s"})
+        headers = {"x-session-id": "s"}
+        first, second = await asyncio.gather(
+            client.post("/", json=tool_call(1), headers=headers),
+            client.post("/", json=tool_call(2), headers=headers),
+        )
+        statuses = sorted([first.status_code, second.status_code])
+        assert statuses == [200, 429]
+        rejected = first if first.status_code == 429 else second
+        assert int(rejected.headers["retry-after"]) >= 1
+
+        resp = await client.post("/", json=[tool_call(3), tool_call(4)], headers=headers)
+        errors = [entry for entry in resp.json() if "error" in entry]
+        assert len(errors) == 1
+        assert errors[0]["error"]["code"] == OVERLOADED_ERROR_CODE
+        assert errors[0]["error"]["data"]["retryAfter"] >= 1
+
+
+# Testa limite por ferramenta independente das demais
+@pytest.mark.asyncio
+async def test_per_tool_limit():
+    admission = AdmissionControl.from_config(
+        "srv", {"tools": {"search": {"concurrency": {"maxInFlight": 1, "maxQueue": 0}}}}
+    )
+    release = asyncio.Event()
+
+    async def run(tool):
+        async with admission.admit(tool):
+            await release.wait()
+
+    busy = asyncio.create_task(run("search"))
+    await asyncio.sleep(0.01)
+    with pytest.raises(OverloadedError):
+        await run("search")
+    other = asyncio.create_task(run("lookup"))
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.gather(busy, other)
+    assert admission.stats()["tools"]["search"]["rejected"] == 1
+
+
+@pytest.mark.parametrize("server_cfg", [
+    {"concurrency": {"maxQueue": 1}},
+    {"concurrency": {"maxInFlight": 0}},
+    {"concurrency": {"maxInFlight": 2, "maxQueueWait": 0}},
+    {"tools": {"x": {"concurrency": {"maxInFlight": 1, "adaptive": "yes"}}}},
+    {"tools": ["x"]},
+])
+def test_invalid_concurrency_config(server_cfg):
+    with pytest.raises(ValueError):
+        validate_server_config("srv", {"command": "echo", **server_cfg})
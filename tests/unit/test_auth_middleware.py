@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
@@ -106,3 +107,73 @@ def test_apikeymiddleware_invalid_basic_no_colon():
     assert resp.status_code == 401
     assert resp.json()["detail"] == "Invalid Basic Authentication format"
 
+
+# Testa que respostas em streaming passam pelo middleware sem buffer
+@pytest.mark.asyncio
+async def test_apikeymiddleware_streaming_response():
+    from fastapi.responses import StreamingResponse
+    async def endpoint(scope, receive, send):
+        async def chunks():
+            for i in range(3):
+                yield f"data: {i}\n\n"
+        await StreamingResponse(chunks(), media_type="text/event-stream")(scope, receive, send)
+    app = APIKeyMiddleware(endpoint, api_key="mykey")
+    sent = []
+    async def receive():
+        # O cliente nunca desconecta; o StreamingResponse cancela esta espera ao terminar
+        await asyncio.Event().wait()
+    async def send(message):
+        sent.append(message)
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"authorization", b"Bearer mykey")]}
+    await app(scope, receive, send)
+    assert sent[0]["status"] == 200
+    bodies = [m["body"] for m in sent[1:] if m.get("body")]
+    assert bodies == [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n"]
+
+# Testa que apps montados com o middleware não verificam de novo
+def test_apikeymiddleware_checks_once_when_nested(monkeypatch):
+    calls = []
+    original = APIKeyMiddleware.check
+    def counting_check(self, authorization):
+        calls.append(authorization)
+        return original(self, authorization)
+    monkeypatch.setattr(APIKeyMiddleware, "check", counting_check)
+    sub_app = FastAPI()
+    sub_app.add_middleware(APIKeyMiddleware, api_key="mykey")
+    @sub_app.get("/test")
+    async def test():
+        return {"ok": True}
+    app = FastAPI()
+    app.add_middleware(APIKeyMiddleware, api_key="mykey")
+    app.mount("/sub", sub_app)
+    client = TestClient(app)
+    assert client.get("/sub/test", headers={"Authorization": "Bearer mykey"}).status_code == 200
+    assert len(calls) == 1
+    assert client.get("/sub/test", headers={"Authorization": "Bearer nope"}).status_code == 403
+
+# Testa cache de credenciais Basic decodificadas e OPTIONS sem autenticação
+def test_apikeymiddleware_basic_cache_and_options():
+    import base64
+    from mcp_hub.utils.auth import decode_basic_password
+    app = FastAPI()
+    app.add_middleware(APIKeyMiddleware, api_key="mykey")
+    @app.options("/test")
+    async def options():
+        return {"ok": True}
+    client = TestClient(app)
+    assert client.options("/test").status_code == 200
+    creds = base64.b64encode(b"user:mykey").decode()
+    decode_basic_password.cache_clear()
+    assert decode_basic_password(creds) == b"mykey"
+    assert decode_basic_password(creds) == b"mykey"
+    assert decode_basic_password.cache_info().hits == 1
+
+# Testa que o 401 sem header anuncia Bearer e Basic
+def test_apikeymiddleware_missing_auth_advertises_schemes():
+    app = FastAPI()
+    app.add_middleware(APIKeyMiddleware, api_key="mykey")
+    @app.get("/test")
+    async def test():
+        return {"ok": True}
+    resp = TestClient(app).get("/test")
+    assert resp.headers["www-authenticate"] == "Bearer, Basic"
@@ -0,0 +1,158 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from starlette.routing import Mount
+
+from mcp_hub.main import lifespan, mount_config_servers, reload_config_handler
+
+
+class FakePool:
+    def __init__(self):
+        self.outstanding = 0
+
+
+def make_fake_lifespan(events, delay=0.0, broken=()):
+    @asynccontextmanager
+    async def fake_lifespan(app: FastAPI):
+        await asyncio.sleep(delay)
+        if app.state.command == "fail" or app.state.server_name in broken:
+            raise RuntimeError("boom")
+        events.append(("start", app.state.server_name, tuple(app.state.args)))
+        app.state.session_pool = FakePool()
+        app.state.is_connected = True
+        yield
+        events.append(("stop", app.state.server_name, tuple(app.state.args)))
+
+    return fake_lifespan
+
+
+def make_main_app(config_data, events, delay=0.0, broken=()):
+    main_app = FastAPI(lifespan=lifespan)
+    fake_lifespan = make_fake_lifespan(events, delay, broken)
+    mount_config_servers(main_app, config_data, ["*"], None, False, None, 5, fake_lifespan, "/")
+    main_app.state.config_data = config_data
+    main_app.state.lifespan = fake_lifespan
+    main_app.state.path_prefix = "/"
+    return main_app
+
+
+def mounted(main_app):
+    return {route.path: route.app for route in main_app.router.routes if isinstance(route, Mount)}
+
+
+async def wait_for(predicate, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline
+        await asyncio.sleep(0.01)
+
+
+# Testa que o servidor alterado sobe antes da troca e o inalterado é preservado
+@pytest.mark.asyncio
+async def test_reload_warms_changed_server_and_keeps_unchanged():
+    events = []
+    config = {"mcpServers": {"a": {"command": "echo", "args": ["1"]}, "b": {"command": "echo"}}}
+    main_app = make_main_app(config, events)
+
+    async with main_app.router.lifespan_context(main_app):
+        before = mounted(main_app)
+        before["/a/mcp"].state.http_sessions.get("client").initialized = True
+
+        new_config = {"mcpServers": {"a": {"command": "echo", "args": ["2"]}, "b": {"command": "echo"}}}
+        await reload_config_handler(main_app, new_config)
+
+        after = mounted(main_app)
+        assert after["/b/mcp"] is before["/b/mcp"]
+        green = after["/a/mcp"]
+        assert green is not before["/a/mcp"]
+        assert green.state.is_connected is True
+        assert green.state.http_sessions.get("client").initialized is True
+        await wait_for(lambda: ("stop", "a", ("1",)) in events)
+        assert ("stop", "b", ()) not in events
+        assert main_app.state.metrics.upstream_restarts.labels("a").value == 1
+        assert main_app.state.metrics.upstream_restarts.labels("b").value == 0
+
+    assert ("stop", "a", ("2",)) in events
+    assert ("stop", "b", ()) in events
+
+
+# Testa que requisições em andamento mantêm o servidor antigo até drenar
+@pytest.mark.asyncio
+async def test_reload_drains_in_flight_requests():
+    events = []
+    config = {"gateway": {"drainTimeout": 5}, "mcpServers": {"a": {"command": "echo", "args": ["1"]}}}
+    main_app = make_main_app(config, events)
+
+    async with main_app.router.lifespan_context(main_app):
+        blue = mounted(main_app)["/a/mcp"]
+        blue.state.session_pool.outstanding = 1
+
+        new_config = {**config, "mcpServers": {"a": {"command": "echo", "args": ["2"]}}}
+        await reload_config_handler(main_app, new_config)
+        assert mounted(main_app)["/a/mcp"] is not blue
+
+        await asyncio.sleep(0.2)
+        assert ("stop", "a", ("1",)) not in events
+        blue.state.session_pool.outstanding = 0
+        await wait_for(lambda: ("stop", "a", ("1",)) in events)
+
+
+# Testa que a rota antiga continua servindo enquanto o novo servidor aquece
+@pytest.mark.asyncio
+async def test_routes_swap_only_after_warm_up():
+    events = []
+    config = {"mcpServers": {"a": {"command": "echo", "args": ["1"]}}}
+    main_app = make_main_app(config, events, delay=0.2)
+
+    async with main_app.router.lifespan_context(main_app):
+        blue = mounted(main_app)["/a/mcp"]
+        reload = asyncio.create_task(
+            reload_config_handler(main_app, {"mcpServers": {"a": {"command": "echo", "args": ["2"]}}})
+        )
+        await asyncio.sleep(0.1)
+        assert mounted(main_app)["/a/mcp"] is blue
+        await reload
+        assert mounted(main_app)["/a/mcp"] is not blue
+
+
+# Testa que falha ao subir a nova versão mantém a versão anterior
+@pytest.mark.asyncio
+async def test_failed_green_keeps_previous_version():
+    events = []
+    config = {"mcpServers": {"a": {"command": "echo", "args": ["1"]}}}
+    main_app = make_main_app(config, events)
+
+    async with main_app.router.lifespan_context(main_app):
+        blue = mounted(main_app)["/a/mcp"]
+        new_config = {"mcpServers": {"a": {"command": "fail"}, "new": {"command": "fail"}}}
+        await reload_config_handler(main_app, new_config)
+
+        assert mounted(main_app)["/a/mcp"] is blue
+        assert "/new/mcp" not in mounted(main_app)
+        assert blue.state.is_connected is True
+        # A configuração aplicada reflete o que está rodando, para o próximo reload tentar de novo
+        assert main_app.state.config_data["mcpServers"] == {"a": {"command": "echo", "args": ["1"]}}
+
+
+# Testa que um servidor que falhou no boot é tentado de novo mesmo sem mudança de config
+@pytest.mark.asyncio
+async def test_reload_retries_server_that_failed_at_boot():
+    events = []
+    broken = {"a"}
+    config = {"mcpServers": {"a": {"command": "echo"}, "b": {"command": "echo"}}}
+    main_app = make_main_app(config, events, broken=broken)
+
+    async with main_app.router.lifespan_context(main_app):
+        before = mounted(main_app)
+        assert getattr(before["/a/mcp"].state, "session_pool", None) is None
+
+        broken.clear()
+        await reload_config_handler(main_app, config)
+        after = mounted(main_app)
+        assert after["/a/mcp"] is not before["/a/mcp"]
+        assert after["/a/mcp"].state.is_connected is True
+        assert after["/b/mcp"] is before["/b/mcp"]
+        assert [e for e in events if e[0] == "start"].count(("start", "b", ())) == 1
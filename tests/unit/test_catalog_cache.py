@@ -0,0 +1,151 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_hub.main import create_sub_app, unmount_servers
+from mcp_hub.utils.catalog import CatalogCache, jsonrpc_result_bytes
+
+
+class FakeTool:
+    def __init__(self, name):
+        self.name = name
+        self.description = f"desc {name}"
+        self.inputSchema = {"type": "object"}
+
+
+class CountingSession:
+    def __init__(self):
+        self.calls = 0
+        self.tools = [FakeTool("tool1")]
+
+    async def list_tools(self):
+        self.calls += 1
+        return type("FakeToolsResult", (), {"tools": list(self.tools)})()
+
+
+def make_app(server_cfg=None):
+    app = create_sub_app("test", server_cfg or {"command": "echo"}, ["*"], None, False, None, 5, None)
+    session = CountingSession()
+    app.state.session = session
+    client = TestClient(app)
+    resp = client.post("/", json={"jsonrpc": "2.0", "id": 1, "method": "initialize"})
+    headers = {"x-session-id": resp.json()["result"]["sessionId"]}
+    return app, session, client, headers
+
+
+# Testa que tools/list repetido não volta ao upstream
+def test_tools_list_served_from_cache():
+    app, session, client, headers = make_app()
+    for i in range(3):
+        resp = client.post("/", json={"jsonrpc": "2.0", "id": i, "method": "tools/list"}, headers=headers)
+        assert resp.status_code == 200
+        assert resp.json() == {
+            "jsonrpc": "2.0",
+            "id": i,
+            "result": {"tools": [{"name": "tool1", "description": "desc tool1", "inputSchema": {"type": "object"}}]},
+        }
+    assert session.calls == 1
+    assert app.state.tools_cache.hits == 2
+
+
+# Testa invalidação via notifications/tools/list_changed
+@pytest.mark.asyncio
+async def test_list_changed_invalidates_cache():
+    app, session, client, headers = make_app()
+    client.post("/", json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"}, headers=headers)
+    session.tools.append(FakeTool("tool2"))
+
+    notification = type("Notification", (), {"method": "notifications/tools/list_changed"})()
+    replica = type("Replica", (), {"name": "test#0"})()
+    await app.state.tools_cache.on_notification(replica, notification)
+
+    resp = client.post("/", json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"}, headers=headers)
+    assert [t["name"] for t in resp.json()["result"]["tools"]] == ["tool1", "tool2"]
+    assert session.calls == 2
+
+
+# Testa que toolsCacheTtl = 0 desativa o cache
+def test_tools_cache_disabled():
+    app, session, client, headers = make_app({"command": "echo", "toolsCacheTtl": 0})
+    for i in range(2):
+        client.post("/", json={"jsonrpc": "2.0", "id": i, "method": "tools/list"}, headers=headers)
+    assert session.calls == 2
+
+
+# Testa expiração por TTL
+def test_catalog_cache_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("mcp_hub.utils.catalog.time.monotonic", lambda: now[0])
+    cache = CatalogCache(ttl=10)
+    cache.store([{"name": "a"}])
+    assert cache.get() == b'{"tools":[{"name":"a"}]}'
+    now[0] += 11
+    assert cache.get() is None
+
+
+# Testa que buscas concorrentes compartilham uma única ida ao upstream
+@pytest.mark.asyncio
+async def test_catalog_cache_single_fetch():
+    cache = CatalogCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return [{"name": "a"}]
+
+    results = await asyncio.gather(*(cache.get_or_fetch(fetch) for _ in range(5)))
+    assert len(calls) == 1
+    assert len(set(results)) == 1
+
+
+# Testa que cancelar quem iniciou a busca não cancela os outros que esperam por ela
+@pytest.mark.asyncio
+async def test_catalog_fetch_survives_cancelled_waiter():
+    cache = CatalogCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return [{"name": "a"}]
+
+    first = asyncio.create_task(cache.get_or_fetch(fetch))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(cache.get_or_fetch(fetch))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert json.loads(await second) == {"tools": [{"name": "a"}]}
+    assert first.cancelled() and len(calls) == 1
+    assert cache.get() is not None
+
+
+# Testa que a invalidação durante a busca não guarda catálogo antigo
+@pytest.mark.asyncio
+async def test_catalog_cache_invalidated_during_fetch():
+    cache = CatalogCache()
+
+    async def fetch():
+        cache.invalidate()
+        return [{"name": "stale"}]
+
+    await cache.get_or_fetch(fetch)
+    assert cache.get() is None
+
+
+def test_unmount_invalidates_cache():
+    from fastapi import FastAPI
+
+    main_app = FastAPI()
+    sub_app = create_sub_app("srv", {"command": "echo"}, None, None, False, None, 5, None)
+    sub_app.state.tools_cache.store([{"name": "a"}])
+    main_app.mount("/srv/mcp", sub_app)
+    unmount_servers(main_app, "/", ["srv"])
+    assert sub_app.state.tools_cache.get() is None
+
+
+def test_jsonrpc_result_bytes():
+    body = jsonrpc_result_bytes("abc", b'{"tools":[]}')
+    assert json.loads(body) == {"jsonrpc": "2.0", "id": "abc", "result": {"tools": []}}
@@ -0,0 +1,159 @@
+import asyncio
+
+import httpx
+import pytest
+
+from mcp_hub.main import create_sub_app, validate_server_config
+from mcp_hub.utils.coalesce import SingleFlight, canonical_arguments
+
+
+class CountingSession:
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = []
+
+    async def call_tool(self, name, arguments=None):
+        self.calls.append((name, arguments))
+        await asyncio.sleep(self.delay)
+        content = type("FakeContent", (), {"type": "text", "text": f"{name}:{len(self.calls)}"})()
+        return type("FakeResult", (), {"content": [content]})()
+
+
+def make_client(server_cfg):
+    app = create_sub_app("test", {"command": "echo", **server_cfg}, ["*"], None, False, None, 5, None)
+    app.state.session = CountingSession()
+    return app, httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def tool_call(req_id, name, arguments):
+    return {"jsonrpc": "2.0", "id": req_id, "method": "tools/call",
+            "params": {"name": name, "arguments": arguments}}
+
+
+def test_canonical_arguments_ignores_key_order():
+    assert canonical_arguments({"a": 1, "b": [1, 2]}) == canonical_arguments({"b": [1, 2], "a": 1})
+    assert canonical_arguments(None) == canonical_arguments({})
+    assert canonical_arguments({"a": 1}) != canonical_arguments({"a": "1"})
+
+
+# Testa que chamadas idênticas simultâneas compartilham uma execução
+@pytest.mark.asyncio
+async def test_single_flight_shares_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"inFlight": 0, "executions": 1, "coalesced": 4}
+
+    # Depois de terminar, uma nova chamada executa de novo
+    await flight.do("k", fetch)
+    assert len(calls) == 2
+
+
+# Testa que o erro é entregue a todos os participantes
+@pytest.mark.asyncio
+async def test_single_flight_shares_exception():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+# Testa que cancelar um participante não cancela a chamada dos demais
+@pytest.mark.asyncio
+async def test_single_flight_cancel_one_waiter():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        await asyncio.sleep(0.05)
+        return "value"
+
+    first = asyncio.create_task(flight.do("k", fetch))
+    await started.wait()
+    second = asyncio.create_task(flight.do("k", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "value"
+
+
+# Testa que a chamada é cancelada quando todos desistem
+@pytest.mark.asyncio
+async def test_single_flight_cancel_all_waiters():
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def fetch():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.create_task(flight.do("k", fetch))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert flight.in_flight == 0
+
+
+# Testa coalescência no endpoint apenas para ferramentas marcadas
+@pytest.mark.asyncio
+async def test_endpoint_coalesces_marked_tools_only():
+    app, client = make_client({"tools": {"search": {"coalesce": True}}})
+    headers = {"x-session-id": "s"}
+    async with client:
+        await client.post("/", json={"jsonrpc": "2.0", "id": 0, "method": "initialize"}, headers=headers)
+        responses = await asyncio.gather(
+            client.post("/", json=tool_call(1, "search", {"q": "x", "n": 1}), headers=headers),
+            client.post("/", json=tool_call(2, "search", {"n": 1, "q": "x"}), headers=headers),
+            client.post("/", json=tool_call(3, "search", {"q": "other"}), headers=headers),
+        )
+        assert [r.json()["id"] for r in responses] == [1, 2, 3]
+        texts = [r.json()["result"]["content"][0]["text"] for r in responses]
+        assert texts[0] == texts[1]
+        assert len(app.state.session.calls) == 2
+
+        await asyncio.gather(
+            client.post("/", json=tool_call(4, "write", {"v": 1}), headers=headers),
+            client.post("/", json=tool_call(5, "write", {"v": 1}), headers=headers),
+        )
+        assert len(app.state.session.calls) == 4
+
+
+def test_invalid_coalesce_config():
+    with pytest.raises(ValueError):
+        validate_server_config("srv", {"command": "echo", "tools": {"search": {"coalesce": "yes"}}})
+
+
+# Testa que, com eager tasks, uma chamada que terminou sem suspender não é reaproveitada depois
+@pytest.mark.asyncio
+@pytest.mark.skipif(not hasattr(asyncio, "eager_task_factory"), reason="eager tasks need Python 3.12+")
+async def test_eager_call_not_shared_after_finishing():
+    loop = asyncio.get_running_loop()
+    loop.set_task_factory(asyncio.eager_task_factory)
+    try:
+        flight = SingleFlight()
+        results = iter(["first", "second"])
+
+        async def fn():
+            return next(results)
+
+        assert await flight.do("k", fn) == "first"
+        assert await flight.do("k", fn) == "second"
+        assert flight.in_flight == 0
+    finally:
+        loop.set_task_factory(None)
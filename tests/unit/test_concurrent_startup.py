@@ -0,0 +1,100 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+
+from mcp_hub.main import lifespan, load_config, mount_config_servers
+
+
+def make_fake_lifespan(stats):
+    @asynccontextmanager
+    async def fake_lifespan(app: FastAPI):
+        async with app.state.spawn_semaphore:
+            stats["running"] += 1
+            stats["peak"] = max(stats["peak"], stats["running"])
+            await asyncio.sleep(0.2)
+            stats["running"] -= 1
+        if app.state.command == "fail":
+            raise RuntimeError("boom")
+        app.state.is_connected = True
+        yield
+        stats["closed"].append(app.title)
+
+    return fake_lifespan
+
+
+def make_main_app(servers, max_spawns, stats):
+    main_app = FastAPI(lifespan=lifespan)
+    main_app.state.max_concurrent_spawns = max_spawns
+    config_data = {"mcpServers": {name: {"command": cmd} for name, cmd in servers.items()}}
+    mount_config_servers(
+        main_app, config_data, ["*"], None, False, None, 5, make_fake_lifespan(stats), "/"
+    )
+    return main_app
+
+
+# Testa que os servidores sobem em paralelo e falhas ficam isoladas
+@pytest.mark.asyncio
+async def test_servers_start_concurrently():
+    stats = {"running": 0, "peak": 0, "closed": []}
+    servers = {f"srv{i}": "echo" for i in range(5)}
+    servers["broken"] = "fail"
+    main_app = make_main_app(servers, 10, stats)
+
+    started = time.perf_counter()
+    async with main_app.router.lifespan_context(main_app):
+        elapsed = time.perf_counter() - started
+        assert elapsed < 0.6
+        assert stats["peak"] == 6
+    assert sorted(stats["closed"]) == sorted(f"srv{i} MCP Proxy" for i in range(5))
+    assert "[srv0 MCP Proxy]" in main_app.description
+    assert "broken" not in main_app.description
+
+
+# Testa que o semáforo limita quantos servidores sobem ao mesmo tempo
+@pytest.mark.asyncio
+async def test_spawn_semaphore_bounds_startup():
+    stats = {"running": 0, "peak": 0, "closed": []}
+    main_app = make_main_app({f"srv{i}": "echo" for i in range(6)}, 2, stats)
+
+    async with main_app.router.lifespan_context(main_app):
+        assert stats["peak"] == 2
+    assert len(stats["closed"]) == 6
+
+
+def test_load_config_gateway_section(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text('{"gateway": {"maxConcurrentSpawns": 0}, "mcpServers": {"a": {"command": "echo"}}}')
+    with pytest.raises(ValueError):
+        load_config(str(config_path))
+    config_path.write_text('{"gateway": {"maxConcurrentSpawns": 3}, "mcpServers": {"a": {"command": "echo"}}}')
+    assert load_config(str(config_path))["gateway"]["maxConcurrentSpawns"] == 3
+
+
+# Testa o lifespan real dos sub-apps: o semáforo chega até as réplicas do pool
+@pytest.mark.asyncio
+async def test_real_sub_app_lifespan_honours_spawn_semaphore(monkeypatch):
+    stats = {"running": 0, "peak": 0}
+
+    def fake_session_factory(server_params, **options):
+        @asynccontextmanager
+        async def factory(message_handler=None):
+            stats["running"] += 1
+            stats["peak"] = max(stats["peak"], stats["running"])
+            await asyncio.sleep(0.1)  # spawn + handshake
+            stats["running"] -= 1
+            yield object()
+
+        return factory
+
+    monkeypatch.setattr("mcp_hub.main.stdio_session_factory", fake_session_factory)
+    main_app = FastAPI(lifespan=lifespan)
+    main_app.state.max_concurrent_spawns = 2
+    config_data = {"mcpServers": {f"srv{i}": {"command": "echo", "replicas": 2} for i in range(3)}}
+    mount_config_servers(main_app, config_data, ["*"], None, False, None, 5, lifespan, "/")
+
+    async with main_app.router.lifespan_context(main_app):
+        assert stats["peak"] == 2
+        assert all(route.app.state.is_connected for route in main_app.routes if hasattr(route.app, "state"))
@@ -0,0 +1,180 @@
+import asyncio
+import sys
+import textwrap
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from mcp import StdioServerParameters
+
+from mcp_hub.main import create_hub_endpoint, create_sub_app, mount_config_servers, validate_server_config
+from mcp_hub.utils.deadlines import Deadlines, requested_timeout
+from mcp_hub.utils.passthrough import raw_stdio_session_factory
+from mcp_hub.utils.pool import stdio_session_factory
+
+
+class FakeTool:
+    def __init__(self, name):
+        self.name = name
+        self.description = name
+        self.inputSchema = {}
+
+
+class SlowSession:
+    def __init__(self):
+        self.cancelled = []
+
+    async def list_tools(self):
+        return type("FakeToolsResult", (), {"tools": [FakeTool("slow"), FakeTool("fast")]})()
+
+    async def call_tool(self, name, arguments=None):
+        try:
+            await asyncio.sleep(10 if name == "slow" else 0)
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        content = type("FakeContent", (), {"type": "text", "text": name})()
+        return type("FakeResult", (), {"content": [content]})()
+
+
+def call(req_id, name):
+    return {"jsonrpc": "2.0", "id": req_id, "method": "tools/call", "params": {"name": name, "arguments": {}}}
+
+
+# Testa a combinação do prazo configurado com o pedido pelo cliente
+def test_resolve_deadline():
+    deadlines = Deadlines.from_config({"timeout": 30, "tools": {"build": {"timeout": 600}, "x": {}}}, default=5)
+    assert deadlines.resolve("build", None) == 600
+    assert deadlines.resolve("other", None) == 30
+    assert deadlines.resolve("build", 10) == 10
+    assert deadlines.resolve("other", 60) == 30
+    assert Deadlines.from_config({}, default=5).resolve(None, None) == 5
+    assert Deadlines().resolve("x", 7) == 7 and Deadlines().resolve("x", None) is None
+
+    assert requested_timeout({"x-mcp-timeout": "2.5"}) == 2.5
+    assert requested_timeout({}) is None
+    for bad in ("abc", "0", "-1", "nan", "inf"):
+        with pytest.raises(ValueError, match="x-mcp-timeout"):
+            requested_timeout({"x-mcp-timeout": bad})
+
+
+# Testa o endpoint: prazo do servidor, limite por ferramenta, cabeçalho do cliente e cancelamento da chamada
+@pytest.mark.asyncio
+async def test_proxy_times_out_and_cancels():
+    server_cfg = {"command": "x", "timeout": 10, "tools": {"slow": {"timeout": 0.05}}}
+    app = create_sub_app("s", server_cfg, ["*"], None, False, None, None, None)
+    app.state.session = session = SlowSession()
+    headers = {"x-session-id": "s1"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        await client.post("/", json={"jsonrpc": "2.0", "id": 0, "method": "initialize"}, headers=headers)
+        reply = (await client.post("/", json=call(1, "slow"), headers=headers)).json()
+        assert reply == {"jsonrpc": "2.0", "id": 1, "error": {"code": -32001, "message": "Request timed out after 0.05s"}}
+        assert session.cancelled == ["slow"]
+
+        fast = (await client.post("/", json=call(2, "fast"), headers={**headers, "x-mcp-timeout": "1"})).json()
+        assert fast["result"]["content"][0]["text"] == "fast"
+
+        session.cancelled.clear()
+        app.state.deadlines = Deadlines.from_config({"timeout": 10})
+        short = (await client.post("/", json=call(3, "slow"), headers={**headers, "x-mcp-timeout": "0.05"})).json()
+        assert short["error"]["code"] == -32001 and session.cancelled == ["slow"]
+
+        bad = await client.post("/", json=call(4, "fast"), headers={**headers, "x-mcp-timeout": "soon"})
+        assert bad.status_code == 400
+
+
+# Testa o prazo no endpoint agregado /mcp
+@pytest.mark.asyncio
+async def test_hub_call_times_out():
+    main_app = FastAPI(title="Hub")
+    config_data = {"mcpServers": {"build": {"command": "x", "timeout": 0.05}}}
+    mount_config_servers(main_app, config_data, ["*"], None, False, None, None, None, "/")
+    create_hub_endpoint(main_app, "/")
+    sub_app = next(r.app for r in main_app.routes if getattr(r, "path", "") == "/build/mcp")
+    sub_app.state.session = session = SlowSession()
+    headers = {"x-session-id": "h1"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main_app), base_url="http://test") as client:
+        await client.post("/mcp", json={"jsonrpc": "2.0", "id": 0, "method": "initialize"}, headers=headers)
+        reply = (await client.post("/mcp", json=call(1, "build__slow"), headers=headers)).json()
+        assert reply["error"]["code"] == -32001 and session.cancelled == ["slow"]
+
+
+# Testa o prazo do tools/list no /mcp: o maior prazo dos servidores, encurtado pelo cliente
+@pytest.mark.asyncio
+async def test_hub_list_times_out():
+    main_app = FastAPI(title="Hub")
+    config_data = {"mcpServers": {"build": {"command": "x", "timeout": 0.05}, "docs": {"command": "x", "timeout": 0.2}}}
+    mount_config_servers(main_app, config_data, ["*"], None, False, None, None, None, "/")
+    create_hub_endpoint(main_app, "/")
+    hanging = asyncio.Event()
+
+    class HangingSession(SlowSession):
+        async def list_tools(self):
+            await hanging.wait()
+
+    for route in main_app.routes:
+        if getattr(route, "path", "") in ("/build/mcp", "/docs/mcp"):
+            route.app.state.session = HangingSession()
+    assert main_app.state.hub_deadlines.resolve(None, None) == 0.2
+    headers = {"x-session-id": "h1"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main_app), base_url="http://test") as client:
+        await client.post("/mcp", json={"jsonrpc": "2.0", "id": 0, "method": "initialize"}, headers=headers)
+        message = {"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
+        reply = (await client.post("/mcp", json=message, headers={**headers, "x-mcp-timeout": "0.01"})).json()
+        assert reply["error"] == {"code": -32001, "message": "Request timed out after 0.01s"}
+        reply = (await client.post("/mcp", json=message, headers=headers)).json()
+        assert reply["error"]["message"] == "Request timed out after 0.2s"
+
+
+SERVER_NOTICING_CANCEL = textwrap.dedent('''
+    import sys
+    import anyio
+    from mcp.server.fastmcp import FastMCP
+    mcp = FastMCP("slow")
+    marker = sys.argv[1]
+
+    @mcp.tool()
+    async def slow() -> str:
+        try:
+            await anyio.sleep(30)
+        except anyio.get_cancelled_exc_class():
+            open(marker, "w").write("cancelled")
+            raise
+        return "done"
+
+    mcp.run()
+''')
+
+
+# Testa com um servidor real que o cancelamento chega upstream como notifications/cancelled
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_factory", [stdio_session_factory, raw_stdio_session_factory])
+@pytest.mark.parametrize("notify_cancelled", [True, False])
+async def test_cancel_reaches_server(tmp_path, make_factory, notify_cancelled):
+    script = tmp_path / "slow.py"
+    script.write_text(SERVER_NOTICING_CANCEL)
+    marker = tmp_path / "cancelled"
+    params = StdioServerParameters(command=sys.executable, args=[str(script), str(marker)])
+    async with make_factory(params, notify_cancelled=notify_cancelled)() as session:
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(0.5):
+                await session.call_tool("slow")
+        for _ in range(50):
+            if marker.exists():
+                break
+            await asyncio.sleep(0.02)
+        assert marker.exists() == notify_cancelled
+
+
+# Testa validação de timeout do servidor e por ferramenta
+def test_timeout_config():
+    validate_server_config("s", {"command": "x", "timeout": 30, "tools": {"t": {"timeout": 0.5}}})
+    app = create_sub_app("s", {"command": "x", "notifyCancelled": False}, ["*"], None, False, None, None, None)
+    assert app.state.notify_cancelled is False
+    for cfg, message in [
+        ({"command": "x", "notifyCancelled": "no"}, "Server 's' 'notifyCancelled' must be a boolean"),
+        ({"command": "x", "timeout": 0}, "Server 's' 'timeout' must be a positive number"),
+        ({"command": "x", "tools": {"t": {"timeout": "1"}}}, "Server 's' tool 't' 'timeout' must be a positive number"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            validate_server_config("s", cfg)
@@ -0,0 +1,65 @@
+import json
+
+import httpx
+import pytest
+
+from mcp_hub.main import create_sub_app
+from mcp_hub.utils import fastjson
+
+
+class BigSession:
+    def __init__(self, size):
+        self.size = size
+
+    async def call_tool(self, name, arguments=None):
+        content = type("FakeContent", (), {"type": "text", "text": "é" * self.size})()
+        return type("FakeResult", (), {"content": [content]})()
+
+
+def make_client(size=10):
+    app = create_sub_app("test", {"command": "echo"}, ["*"], None, False, None, 5, None)
+    app.state.session = BigSession(size)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+# Testa que a serialização rápida produz o mesmo JSON compacto da biblioteca padrão
+@pytest.mark.parametrize("data", [
+    {"a": [1, 2.5, None, True], "texto": "ação ✓", "nested": {"x": {}}},
+    [{"jsonrpc": "2.0", "id": 1, "result": {"content": []}}],
+])
+def test_dumps_matches_stdlib(data):
+    expected = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert fastjson.dumps(data) == expected
+    assert fastjson.loads(fastjson.dumps(data)) == data
+
+
+# Testa o fallback para a biblioteca padrão quando o orjson não aceita o valor
+def test_dumps_falls_back_for_unsupported_values():
+    assert fastjson.loads(fastjson.dumps({1: 2**70})) == {"1": 2**70}
+
+
+# Testa erros de parse e de requisição inválida com o corpo lido diretamente
+@pytest.mark.asyncio
+async def test_invalid_bodies():
+    async with make_client() as client:
+        resp = await client.post("/", content=b"{not json", headers={"content-type": "application/json"})
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == -32700
+
+        resp = await client.post("/", content=b"42", headers={"content-type": "application/json"})
+        assert resp.status_code == 400
+        assert resp.json()["error"]["code"] == -32600
+
+
+# Testa um resultado grande (1 MB) pelo caminho rápido
+@pytest.mark.asyncio
+async def test_large_result_roundtrip():
+    headers = {"x-session-id": "s"}
+    async with make_client(size=512 * 1024) as client:
+        await client.post("/", json={"jsonrpc": "2.0", "id": 0, "method": "initialize"}, headers=headers)
+        resp = await client.post("/", json={"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                                             "params": {"name": "big", "arguments": {"blob": "x" * 1024 * 1024}}},
+                                 headers=headers)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/json"
+        assert len(resp.json()["result"]["content"][0]["text"]) == 512 * 1024
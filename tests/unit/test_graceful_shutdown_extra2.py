@@ -8,8 +8,12 @@ def test_graceful_shutdown_track_task_done():
     shutdown = GracefulShutdown()
     async def dummy():
         return 42
-    task = asyncio.create_task(dummy())
-    asyncio.get_event_loop().run_until_complete(task)
+    loop = asyncio.new_event_loop()
+    try:
+        task = loop.create_task(dummy())
+        loop.run_until_complete(task)
+    finally:
+        loop.close()
     shutdown.track_task(task)
     # Task já finalizada deve ser removida imediatamente
     assert task not in shutdown.tasks
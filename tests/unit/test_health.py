@@ -0,0 +1,212 @@
+import asyncio
+import sys
+import textwrap
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from mcp import StdioServerParameters
+
+from mcp_hub.main import GracefulShutdown, add_health_endpoints, create_sub_app, validate_server_config
+from mcp_hub.utils.health import HealthProber, server_health
+from mcp_hub.utils.pool import RestartPolicy, SessionPool, stdio_session_factory
+
+
+class FakeSession:
+    def __init__(self, tag, hang):
+        self.tag = tag
+        self.hang = hang
+        self.pings = 0
+        self.upstream_closed = asyncio.Event()
+
+    async def send_ping(self):
+        self.pings += 1
+        if self.hang:
+            await asyncio.Event().wait()
+
+
+def fake_factory(hung_attempts=()):
+    state = {"attempts": 0, "sessions": []}
+
+    @asynccontextmanager
+    async def factory(message_handler=None):
+        state["attempts"] += 1
+        session = FakeSession(f"process-{state['attempts']}", state["attempts"] in hung_attempts)
+        state["sessions"].append(session)
+        yield session
+
+    return factory, state
+
+
+def fast_restarts():
+    return RestartPolicy(initial_delay=0.01, max_delay=0.05)
+
+
+async def wait_for(condition, timeout=2.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.005)
+    await asyncio.wait_for(poll(), timeout)
+
+
+# Testa que um ping respondido registra a latência e deixa a réplica saudável
+@pytest.mark.asyncio
+async def test_probe_records_latency():
+    factory, state = fake_factory()
+    pool = SessionPool("srv", factory)
+    await pool.start()
+    try:
+        prober = HealthProber(pool, timeout=0.5)
+        await prober.probe_once()
+        health = server_health(pool, prober)
+        assert health["status"] == "healthy" and health["ready"]
+        replica = health["replicas"][0]
+        assert replica["latencyMs"] is not None and replica["consecutiveFailures"] == 0
+    finally:
+        await pool.stop()
+
+
+# Testa que um processo travado é abortado depois do limite de falhas e reiniciado pelo pool
+@pytest.mark.asyncio
+async def test_hung_replica_is_replaced():
+    factory, state = fake_factory(hung_attempts={1})
+    pool = SessionPool("srv", factory, restart=fast_restarts())
+    exited = []
+    pool.add_exit_listener(exited.append)
+    await pool.start()
+    try:
+        prober = HealthProber(pool, timeout=0.02, failure_threshold=2)
+        await prober.probe_once()
+        health = server_health(pool, prober)
+        assert health["status"] == "unhealthy" and health["replicas"][0]["error"] == "ping timed out"
+
+        await prober.probe_once()
+        assert prober.hung == 1 and len(exited) == 1
+        await wait_for(lambda: pool.restarts == 1)
+        await prober.probe_once()
+        assert server_health(pool, prober)["status"] == "healthy"
+        assert state["sessions"][1].pings == 1
+    finally:
+        await pool.stop()
+
+
+# Testa os estados do servidor: degradado, ocioso (lazy) e sem pool
+@pytest.mark.asyncio
+async def test_server_status():
+    factory, state = fake_factory(hung_attempts={2})
+    pool = SessionPool("srv", factory, replicas=2, restart=RestartPolicy(enabled=False))
+    await pool.start()
+    try:
+        prober = HealthProber(pool, timeout=0.02, failure_threshold=5)
+        await prober.probe_once()
+        health = server_health(pool, prober)
+        assert health["status"] == "degraded" and health["ready"]
+        assert [r["status"] for r in health["replicas"]] == ["healthy", "unhealthy"]
+    finally:
+        await pool.stop()
+
+    lazy_pool = SessionPool("lazy", factory, lazy=True)
+    await lazy_pool.start()
+    assert server_health(lazy_pool, None)["status"] == "idle"
+    assert server_health(None, None) == {"status": "unhealthy", "ready": False, "replicas": []}
+
+
+# Testa os endpoints: respondem do cache, sem pings extras, e prontidão cai com servidor fora ou no shutdown
+@pytest.mark.asyncio
+async def test_health_endpoints():
+    main_app = FastAPI()
+    main_app.state.shutdown_handler = GracefulShutdown()
+    add_health_endpoints(main_app)
+    factory, state = fake_factory()
+    up = create_sub_app("up", {"command": "x"}, ["*"], None, False, None, 5, None)
+    down = create_sub_app("down", {"command": "x"}, ["*"], None, False, None, 5, None)
+    main_app.mount("/up/mcp", up)
+    main_app.mount("/down/mcp", down)
+    pool = SessionPool("up", factory)
+    await pool.start()
+    up.state.session_pool = pool
+    up.state.health_prober = HealthProber(pool)
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main_app), base_url="http://test") as client:
+            assert (await client.get("/health/live")).json() == {"status": "alive"}
+            ready = await client.get("/health/ready")
+            assert ready.status_code == 503
+            assert ready.json() == {"status": "not ready", "servers": {"up": "healthy", "down": "unhealthy"}}
+            assert (await client.get("/health")).json()["status"] == "degraded"
+
+            main_app.router.routes = [r for r in main_app.router.routes if getattr(r, "app", None) is not down]
+            assert (await client.get("/health/ready")).status_code == 200
+            detail = (await client.get("/health/servers/up")).json()
+            assert detail["replicas"][0]["name"] == "up#0"
+            assert (await client.get("/health/servers")).json()["up"] == detail
+            assert (await client.get("/health/servers/nope")).status_code == 404
+            assert state["sessions"][0].pings == 0
+
+            main_app.state.shutdown_handler.shutdown_event.set()
+            draining = await client.get("/health/ready")
+            assert draining.status_code == 503 and draining.json()["shuttingDown"] is True
+    finally:
+        await pool.stop()
+
+
+SERVER_THAT_HANGS = textwrap.dedent('''
+    import os
+    import time
+    from mcp.server.fastmcp import FastMCP
+    mcp = FastMCP("hangs")
+
+    @mcp.tool()
+    def pid() -> str:
+        return str(os.getpid())
+
+    @mcp.tool()
+    def hang() -> str:
+        time.sleep(3600)
+        return "never"
+
+    mcp.run()
+''')
+
+
+# Testa com um processo real travado: o prober detecta e o pool sobe outro processo
+@pytest.mark.asyncio
+async def test_real_hung_server_replaced(tmp_path):
+    script = tmp_path / "hangs.py"
+    script.write_text(SERVER_THAT_HANGS)
+    params = StdioServerParameters(command=sys.executable, args=[str(script)])
+    pool = SessionPool("hangs", stdio_session_factory(params), restart=fast_restarts())
+    await pool.start()
+    prober = HealthProber(pool, interval=0.05, timeout=0.2, failure_threshold=2)
+    try:
+        session = pool.session
+        first_pid = (await session.call_tool("pid")).content[0].text
+        hung_call = asyncio.create_task(session.call_tool("hang"))
+        await asyncio.sleep(0.2)
+        prober.start()
+        await wait_for(lambda: pool.restarts == 1, timeout=15)
+        async with pool.acquire() as new_session:
+            assert (await new_session.call_tool("pid")).content[0].text != first_pid
+        assert prober.hung == 1
+        hung_call.cancel()
+        await asyncio.gather(hung_call, return_exceptions=True)
+    finally:
+        await prober.stop()
+        await pool.stop()
+
+
+# Testa validação de healthCheck
+def test_health_check_config():
+    server_cfg = {"command": "x", "healthCheck": {"interval": 30, "timeout": 2, "failureThreshold": 5}}
+    validate_server_config("s", server_cfg)
+    app = create_sub_app("s", server_cfg, ["*"], None, False, None, 5, None)
+    prober = HealthProber.from_config(None, app.state.health_check)
+    assert (prober.interval, prober.timeout, prober.failure_threshold) == (30, 2, 5)
+    assert HealthProber.from_config(None, {"enabled": False}) is None
+    for bad, message in [
+        ("yes", "'healthCheck' must be an object"),
+        ({"interval": 0}, "'healthCheck.interval' must be a positive number"),
+        ({"failureThreshold": 0}, "'healthCheck.failureThreshold' must be a positive integer"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            validate_server_config("s", {"command": "x", "healthCheck": bad})
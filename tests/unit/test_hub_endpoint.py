@@ -0,0 +1,184 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from mcp import McpError
+from mcp.types import ErrorData
+
+from mcp_hub.main import create_hub_endpoint, mount_config_servers, reload_config_handler
+from mcp_hub.utils.aggregate import AggregatedCatalog, InvalidCursorError, decode_cursor, encode_cursor
+from mcp_hub.utils.passthrough import UpstreamClosedError
+
+
+class FakeTool:
+    def __init__(self, name):
+        self.name = name
+        self.description = f"desc {name}"
+        self.inputSchema = {}
+
+
+class FakeSession:
+    def __init__(self, server, tools):
+        self.server = server
+        self.tools = [FakeTool(t) for t in tools]
+        self.list_calls = 0
+        self.calls = []
+
+    async def list_tools(self):
+        self.list_calls += 1
+        return type("FakeToolsResult", (), {"tools": self.tools})()
+
+    async def call_tool(self, name, arguments=None):
+        self.calls.append((name, arguments))
+        content = type("FakeContent", (), {"type": "text", "text": f"{self.server}:{name}"})()
+        return type("FakeResult", (), {"content": [content]})()
+
+
+def make_hub(page_size=500):
+    main_app = FastAPI(title="Hub")
+    config_data = {"mcpServers": {"time": {"command": "echo"}, "git": {"command": "echo"}}}
+    mount_config_servers(main_app, config_data, ["*"], None, False, None, 5, None, "/")
+    main_app.state.config_data = config_data
+    main_app.state.path_prefix = "/"
+    create_hub_endpoint(main_app, "/", page_size=page_size)
+    sessions = {
+        "time": FakeSession("time", ["now", "convert"]),
+        "git": FakeSession("git", ["log"]),
+    }
+    for route in main_app.router.routes:
+        if isinstance(getattr(route, "app", None), FastAPI):
+            route.app.state.session = sessions[route.app.state.server_name]
+    client = TestClient(main_app)
+    resp = client.post("/mcp", json={"jsonrpc": "2.0", "id": 1, "method": "initialize"})
+    headers = {"x-session-id": resp.json()["result"]["sessionId"]}
+    return main_app, sessions, client, headers
+
+
+# Testa catálogo agregado com nomes com namespace
+def test_hub_lists_namespaced_tools():
+    main_app, sessions, client, headers = make_hub()
+    resp = client.post("/mcp", json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"}, headers=headers)
+    names = [t["name"] for t in resp.json()["result"]["tools"]]
+    assert names == ["time__now", "time__convert", "git__log"]
+    assert "nextCursor" not in resp.json()["result"]
+
+    # Segunda chamada vem do catálogo já montado
+    client.post("/mcp", json={"jsonrpc": "2.0", "id": 3, "method": "tools/list"}, headers=headers)
+    assert sessions["time"].list_calls == 1
+
+
+# Testa roteamento de tools/call pelo índice
+def test_hub_routes_tool_call():
+    main_app, sessions, client, headers = make_hub()
+    resp = client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "git__log", "arguments": {"n": 1}}},
+        headers=headers,
+    )
+    assert resp.json()["result"]["content"][0]["text"] == "git:log"
+    assert sessions["git"].calls == [("log", {"n": 1})]
+    assert main_app.state.hub_catalog.resolve("time__now")[0] == "time"
+
+    resp = client.post(
+        "/mcp", json={"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "nope"}}, headers=headers
+    )
+    assert resp.json()["error"]["code"] == -32602
+
+
+# Testa que erros do servidor chegam pelo hub como no endpoint do servidor: erro JSON-RPC ou 503
+def test_hub_relays_upstream_tool_errors():
+    main_app, sessions, client, headers = make_hub()
+
+    async def bad_args(name, arguments=None):
+        raise McpError(ErrorData(code=-32602, message="bad args"))
+
+    async def gone(name, arguments=None):
+        raise UpstreamClosedError("server exited")
+
+    call = {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "git__log"}}
+    client.post("/git/mcp/", json={"jsonrpc": "2.0", "id": 1, "method": "initialize"}, headers=headers)
+    sessions["git"].call_tool = bad_args
+    for path, name in (("/mcp", "git__log"), ("/git/mcp/", "log")):
+        resp = client.post(path, json={**call, "params": {"name": name}}, headers=headers)
+        assert resp.status_code == 200
+        assert resp.json() == {"jsonrpc": "2.0", "id": 2, "error": {"code": -32602, "message": "bad args"}}
+
+    sessions["git"].call_tool = gone
+    resp = client.post("/mcp", json=call, headers=headers)
+    assert resp.status_code == 503 and resp.json() == {"detail": "server exited"}
+
+
+# Testa paginação por cursor
+def test_hub_pagination():
+    main_app, sessions, client, headers = make_hub(page_size=2)
+    names = []
+    cursor = None
+    for i in range(5):
+        params = {"cursor": cursor} if cursor else {}
+        resp = client.post(
+            "/mcp", json={"jsonrpc": "2.0", "id": i, "method": "tools/list", "params": params}, headers=headers
+        )
+        result = resp.json()["result"]
+        names += [t["name"] for t in result["tools"]]
+        cursor = result.get("nextCursor")
+        if not cursor:
+            break
+    assert names == ["time__now", "time__convert", "git__log"]
+
+    resp = client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 9, "method": "tools/list", "params": {"cursor": "bogus"}},
+        headers=headers,
+    )
+    assert resp.json()["error"]["code"] == -32602
+
+
+# Testa que o hub exige initialize
+def test_hub_requires_initialize():
+    main_app, sessions, client, headers = make_hub()
+    resp = client.post("/mcp", json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"}, headers={"x-session-id": "new"})
+    assert resp.json()["error"]["message"] == "Bad Request: Server not initialized"
+
+
+# Testa que o índice é reconstruído após reload
+@pytest.mark.asyncio
+async def test_hub_index_rebuilt_on_reload():
+    main_app, sessions, client, headers = make_hub()
+    client.post("/mcp", json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"}, headers=headers)
+    assert "git__log" in main_app.state.hub_catalog.index
+
+    await reload_config_handler(main_app, {"mcpServers": {"time": {"command": "echo"}}})
+    resp = client.post("/mcp", json={"jsonrpc": "2.0", "id": 3, "method": "tools/list"}, headers=headers)
+    assert [t["name"] for t in resp.json()["result"]["tools"]] == ["time__now", "time__convert"]
+    assert "git__log" not in main_app.state.hub_catalog.index
+
+
+def test_cursor_roundtrip():
+    assert decode_cursor(encode_cursor(3)) == 3
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(InvalidCursorError):
+        AggregatedCatalog().page(encode_cursor(5))
+
+
+# Testa colisão de nomes com namespace: o primeiro servidor vence, sem sobrescrever
+@pytest.mark.asyncio
+async def test_catalog_skips_colliding_names(caplog):
+    from mcp_hub.utils.catalog import CatalogCache
+
+    def sub_app(name):
+        app = type("FakeApp", (), {})()
+        app.state = type("State", (), {"tools_cache": CatalogCache(), "server_name": name})()
+        return app
+
+    first, second = sub_app("a__b"), sub_app("a")
+    tools = {id(first): [{"name": "c"}], id(second): [{"name": "b__c"}, {"name": "d"}]}
+
+    async def fetch_tools(app):
+        return tools[id(app)]
+
+    catalog = AggregatedCatalog()
+    await catalog.refresh([("a__b", first), ("a", second)], fetch_tools)
+    assert catalog.resolve("a__b__c") == ("a__b", first, "c")
+    assert catalog.resolve("a__d") == ("a", second, "d")
+    assert catalog.tool_count == 2
+    assert "collides" in caplog.text
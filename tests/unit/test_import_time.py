@@ -0,0 +1,47 @@
+import subprocess
+import sys
+
+# Budgets for the cumulative import time, in seconds; generous so slow CI machines pass,
+# but an accidental import of the server stack into the CLI blows them
+CLI_BUDGET = 0.3
+MAIN_BUDGET = 3.0
+
+
+def imported_modules(code, *args):
+    """Run ``code`` in a fresh interpreter with ``-X importtime``: module name -> cumulative seconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args], capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            modules.setdefault(name.strip(), int(cumulative) / 1e6)
+    return modules
+
+
+# Testa que o pacote do CLI não carrega o servidor (FastAPI, SDK do MCP, uvicorn) e fica dentro do orçamento
+def test_cli_import_budget():
+    modules = imported_modules("import mcp_hub")
+    assert modules["mcp_hub"] < CLI_BUDGET, f"import mcp_hub took {modules['mcp_hub']:.3f}s"
+    for heavy in ("mcp_hub.main", "fastapi", "mcp", "uvicorn", "dotenv"):
+        assert heavy not in modules, f"import mcp_hub imports {heavy}"
+
+
+# Testa que --help responde sem importar mcp_hub.main
+def test_cli_help_skips_main():
+    modules = imported_modules("from mcp_hub import app; app()", "--help")
+    assert "mcp_hub" in modules and "mcp_hub.main" not in modules
+
+
+# Testa que mcp_hub.main não carrega dependências opcionais nem troca asyncio.create_task
+def test_main_import_budget():
+    modules = imported_modules(
+        "import asyncio, mcp_hub.main; assert asyncio.create_task.__module__ == 'asyncio.tasks'"
+    )
+    assert modules["mcp_hub.main"] < MAIN_BUDGET, f"import mcp_hub.main took {modules['mcp_hub.main']:.3f}s"
+    for optional in ("mcp_hub.utils.config_watcher", "watchdog", "jwt", "passlib", "uvloop"):
+        assert optional not in modules, f"import mcp_hub.main imports {optional}"
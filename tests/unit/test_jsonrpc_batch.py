@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_hub.main import create_sub_app
+
+
+class SlowSession:
+    def __init__(self, delay=0.2):
+        self.delay = delay
+
+    async def list_tools(self):
+        return type("FakeToolsResult", (), {"tools": []})()
+
+    async def call_tool(self, name, arguments=None):
+        if name == "boom":
+            raise RuntimeError("tool crashed")
+        await asyncio.sleep(self.delay)
+        content = type("FakeContent", (), {"type": "text", "text": f"{name}:{arguments}"})()
+        return type("FakeResult", (), {"content": [content]})()
+
+
+def make_client():
+    app = create_sub_app("test", {"command": "echo"}, ["*"], None, False, None, 5, None)
+    app.state.session = SlowSession()
+    client = TestClient(app)
+    resp = client.post("/", json={"jsonrpc": "2.0", "id": 0, "method": "initialize"})
+    return client, {"x-session-id": resp.json()["result"]["sessionId"]}
+
+
+def call(req_id, name, **arguments):
+    return {"jsonrpc": "2.0", "id": req_id, "method": "tools/call", "params": {"name": name, "arguments": arguments}}
+
+
+# Testa batch executado em paralelo com respostas na ordem do pedido
+def test_batch_runs_concurrently_in_order():
+    client, headers = make_client()
+    batch = [call(i, "echo", n=i) for i in range(5)]
+    started = time.perf_counter()
+    resp = client.post("/", json=batch, headers=headers)
+    elapsed = time.perf_counter() - started
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [entry["id"] for entry in data] == [0, 1, 2, 3, 4]
+    assert data[3]["result"]["content"][0]["text"] == "echo:{'n': 3}"
+    assert elapsed < 0.6
+
+
+# Testa notificações dentro do batch (sem resposta) e erros isolados por entrada
+def test_batch_notifications_and_errors():
+    client, headers = make_client()
+    batch = [
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        call("a", "boom"),
+        {"jsonrpc": "2.0", "id": "b", "method": "tools/list"},
+        {"jsonrpc": "2.0", "id": "c", "method": "does/not/exist"},
+        "garbage",
+    ]
+    data = client.post("/", json=batch, headers=headers).json()
+    assert len(data) == 4
+    assert data[0]["id"] == "a" and data[0]["error"]["code"] == -32603
+    assert data[1] == {"jsonrpc": "2.0", "id": "b", "result": {"tools": []}}
+    assert data[2]["error"]["code"] == -32601
+    assert data[3]["error"]["code"] == -32600
+
+
+# Testa batch só com notificações e batch vazio
+def test_batch_only_notifications_and_empty():
+    client, headers = make_client()
+    resp = client.post("/", json=[{"jsonrpc": "2.0", "method": "notifications/initialized"}], headers=headers)
+    assert resp.status_code == 204
+    resp = client.post("/", json=[], headers=headers)
+    assert resp.json()["error"]["code"] == -32600
+
+
+# Testa initialize e tools/list no mesmo batch
+def test_batch_initialize_first():
+    client, _ = make_client()
+    batch = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+    ]
+    data = client.post("/", json=batch, headers={"x-session-id": "batch-session"}).json()
+    assert data[0]["result"]["sessionId"] == "batch-session"
+    assert "result" in data[1]
+
+
+# Testa que notificações avulsas retornam 204
+def test_single_notification_no_content():
+    client, headers = make_client()
+    resp = client.post("/", json={"jsonrpc": "2.0", "method": "notifications/cancelled"}, headers=headers)
+    assert resp.status_code == 204
+
+
+# Testa que qualquer requisição sem id é notificação: executa, mas não recebe resposta
+def test_requests_without_id_get_no_reply():
+    client, headers = make_client()
+    calls = []
+    session = client.app.state.session
+    original = session.call_tool
+    async def tracking_call_tool(name, arguments=None):
+        calls.append(name)
+        return await original(name, arguments)
+    session.call_tool = tracking_call_tool
+
+    no_id_call = {"jsonrpc": "2.0", "method": "tools/call", "params": {"name": "echo", "arguments": {}}}
+    resp = client.post("/", json=[no_id_call, {"jsonrpc": "2.0", "method": "ping"}], headers=headers)
+    assert resp.status_code == 204
+    resp = client.post("/", json=[no_id_call, call(1, "echo")], headers=headers)
+    assert [entry["id"] for entry in resp.json()] == [1]
+
+    resp = client.post("/", json=no_id_call, headers=headers)
+    assert resp.status_code == 204 and resp.content == b""
+    resp = client.post("/", json={"jsonrpc": "2.0", "method": "tools/call", "params": {"name": "boom"}}, headers=headers)
+    assert resp.status_code == 204
+    assert calls == ["echo"] * 4 + ["boom"]
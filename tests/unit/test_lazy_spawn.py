@@ -0,0 +1,151 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from mcp_hub.main import create_sub_app, validate_server_config
+from mcp_hub.utils import pool as pool_module
+from mcp_hub.utils.pool import NoHealthyReplicaError, SessionPool
+
+
+class FakeSession:
+    def __init__(self, tag):
+        self.tag = tag
+
+
+def counting_factory(spawn_delay=0.0, fail_first=0, stop_gate=None):
+    state = {"spawned": 0, "running": 0, "attempts": 0}
+
+    @asynccontextmanager
+    async def factory(message_handler=None):
+        state["attempts"] += 1
+        await asyncio.sleep(spawn_delay)
+        if state["attempts"] <= fail_first:
+            raise RuntimeError("spawn failed")
+        state["spawned"] += 1
+        state["running"] += 1
+        try:
+            yield FakeSession(f"process-{state['spawned']}")
+        finally:
+            if stop_gate is not None:
+                await stop_gate.wait()
+            state["running"] -= 1
+
+    return factory, state
+
+
+@pytest.fixture(autouse=True)
+def fast_idle_checks(monkeypatch):
+    monkeypatch.setattr(pool_module, "IDLE_CHECK_INTERVAL", 0.01)
+
+
+# Testa que um pool lazy não inicia nada no boot e que pedidos simultâneos compartilham um único spawn
+@pytest.mark.asyncio
+async def test_lazy_pool_shares_one_cold_start():
+    factory, state = counting_factory(spawn_delay=0.05)
+    pool = SessionPool("srv", factory, replicas=2, lazy=True)
+    await pool.start()
+    try:
+        assert state["spawned"] == 0 and pool.healthy_replicas == []
+
+        async def use():
+            async with pool.acquire() as session:
+                return session.tag
+
+        tags = await asyncio.gather(*(use() for _ in range(10)))
+        assert state["spawned"] == 2 and pool.cold_starts == 1
+        assert set(tags) == {"process-1", "process-2"}
+    finally:
+        await pool.stop()
+    assert state["running"] == 0
+
+
+# Testa que o pool ocioso para os processos e volta a subir no próximo pedido
+@pytest.mark.asyncio
+async def test_idle_pool_scales_to_zero_and_back():
+    factory, state = counting_factory()
+    pool = SessionPool("srv", factory, lazy=True, idle_timeout=0.05)
+    stopped = []
+    pool.add_idle_stop_listener(stopped.append)
+    await pool.start()
+    try:
+        async with pool.acquire() as session:
+            assert session.tag == "process-1"
+        await asyncio.sleep(0.2)
+        assert state["running"] == 0 and pool.idle_stops == 1 and stopped == [pool]
+
+        async with pool.acquire() as session:
+            assert session.tag == "process-2"
+        assert pool.cold_starts == 2
+    finally:
+        await pool.stop()
+
+
+# Testa que um pedido em andamento impede a parada por ociosidade
+@pytest.mark.asyncio
+async def test_in_flight_request_keeps_pool_running():
+    factory, state = counting_factory()
+    pool = SessionPool("srv", factory, lazy=True, idle_timeout=0.05)
+    await pool.start()
+    try:
+        async with pool.acquire():
+            await asyncio.sleep(0.15)
+            assert state["running"] == 1
+        assert pool.idle_stops == 0
+    finally:
+        await pool.stop()
+
+
+# Testa que um pedido chegando durante a parada espera e recebe um processo novo
+@pytest.mark.asyncio
+async def test_request_during_scale_down_waits_for_new_process():
+    stop_gate = asyncio.Event()
+    factory, state = counting_factory(stop_gate=stop_gate)
+    pool = SessionPool("srv", factory, lazy=True, idle_timeout=0.05)
+    await pool.start()
+    try:
+        async with pool.acquire():
+            pass
+        while pool._scaling_down is None:
+            await asyncio.sleep(0.005)
+
+        async def use():
+            async with pool.acquire() as session:
+                return session.tag
+
+        waiting = asyncio.create_task(use())
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        stop_gate.set()
+        assert await waiting == "process-2"
+    finally:
+        stop_gate.set()
+        await pool.stop()
+
+
+# Testa falha no spawn: vira NoHealthyReplicaError e o próximo pedido tenta de novo
+@pytest.mark.asyncio
+async def test_failed_cold_start_is_retried():
+    factory, state = counting_factory(fail_first=1)
+    pool = SessionPool("srv", factory, lazy=True)
+    await pool.start()
+    try:
+        with pytest.raises(NoHealthyReplicaError, match="failed to start"):
+            async with pool.acquire():
+                pass
+        async with pool.acquire() as session:
+            assert session.tag == "process-1"
+    finally:
+        await pool.stop()
+
+
+# Testa validação e estado de lazy/idleTimeout
+def test_lazy_config():
+    server_cfg = {"command": "x", "lazy": True, "idleTimeout": 0}
+    validate_server_config("s", server_cfg)
+    app = create_sub_app("s", server_cfg, ["*"], None, False, None, 5, None)
+    assert app.state.lazy is True and app.state.idle_timeout is None
+    with pytest.raises(ValueError, match="'lazy' must be a boolean"):
+        validate_server_config("s", {"command": "x", "lazy": "yes"})
+    with pytest.raises(ValueError, match="'idleTimeout' must be a non-negative number"):
+        validate_server_config("s", {"command": "x", "lazy": True, "idleTimeout": -1})
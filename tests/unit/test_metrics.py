@@ -0,0 +1,114 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from mcp_hub.main import create_sub_app, gateway_metrics, mount_config_servers
+from mcp_hub.utils.metrics import Counter, GatewayMetrics, Histogram, MetricsRegistry, method_label
+from mcp_hub.utils.pool import SessionPool
+
+
+class FakeSession:
+    async def call_tool(self, name, arguments=None):
+        if name == "boom":
+            raise RuntimeError("upstream failed")
+        content = type("FakeContent", (), {"type": "text", "text": "x" * 100})()
+        return type("FakeResult", (), {"content": [content]})()
+
+
+def sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} not found in:\n{text}")
+
+
+# Testa o formato de exposição do Prometheus
+def test_render_exposition_format():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("demo_total", "Demo counter.", ("server",)))
+    histogram = registry.register(Histogram("demo_seconds", "Demo histogram.", ("server",), (0.1, 1.0)))
+    counter.labels('a"b').inc()
+    counter.labels('a"b').inc(2)
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.labels("s").observe(value)
+
+    text = registry.render()
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{server="a\\"b"} 3' in text
+    assert 'demo_seconds_bucket{server="s",le="0.1"} 2' in text
+    assert 'demo_seconds_bucket{server="s",le="1.0"} 3' in text
+    assert 'demo_seconds_bucket{server="s",le="+Inf"} 4' in text
+    assert 'demo_seconds_count{server="s"} 4' in text
+    assert sample(text, 'demo_seconds_sum{server="s"}') == pytest.approx(5.65)
+
+
+def test_method_label_bounds_cardinality():
+    assert method_label("tools/call") == "tools/call"
+    assert method_label("notifications/cancelled") == "notifications"
+    assert method_label("made/up") == "other"
+    assert method_label(None) == "other"
+
+
+# Testa contagem, erros por código e tamanhos no endpoint de um servidor
+@pytest.mark.asyncio
+async def test_proxy_records_request_metrics():
+    metrics = GatewayMetrics()
+    app = create_sub_app("srv", {"command": "echo"}, ["*"], None, False, None, 5, None)
+    app.state.session = FakeSession()
+    app.state.metrics = metrics
+    headers = {"x-session-id": "s"}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        await client.post("/", json={"jsonrpc": "2.0", "id": 0, "method": "initialize"}, headers=headers)
+        await client.post("/", json={"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                                     "params": {"name": "echo"}}, headers=headers)
+        await client.post("/", json={"jsonrpc": "2.0", "id": 2, "method": "nope"}, headers=headers)
+        resp = await client.post("/", json=[{"jsonrpc": "2.0", "id": 3, "method": "tools/call",
+                                             "params": {"name": "boom"}}], headers=headers)
+        assert resp.status_code == 200
+
+    text = metrics.render()
+    assert sample(text, 'mcp_hub_requests_total{server="srv",method="tools/call"}') == 2
+    assert sample(text, 'mcp_hub_requests_total{server="srv",method="other"}') == 1
+    assert sample(text, 'mcp_hub_request_errors_total{server="srv",method="other",code="-32601"}') == 1
+    assert sample(text, 'mcp_hub_request_errors_total{server="srv",method="tools/call",code="-32603"}') == 1
+    assert sample(text, 'mcp_hub_request_duration_seconds_count{server="srv",method="tools/call"}') == 2
+    assert sample(text, 'mcp_hub_requests_in_flight{server="srv"}') == 0
+    assert sample(text, 'mcp_hub_request_size_bytes_count{server="srv"}') == 4
+    assert sample(text, 'mcp_hub_response_size_bytes_sum{server="srv"}') > 100
+
+
+# Testa métricas lidas na coleta: sessões, réplicas e saídas inesperadas do upstream
+@pytest.mark.asyncio
+async def test_state_metrics_and_upstream_exits():
+    main_app = FastAPI()
+    config = {"mcpServers": {"srv": {"command": "echo", "replicas": 2}}}
+    mount_config_servers(main_app, config, ["*"], None, False, None, 5, None, "/")
+    metrics = gateway_metrics(main_app)
+    sub_app = main_app.router.routes[-1].app
+    sub_app.state.http_sessions.get("client")
+
+    @asynccontextmanager
+    async def factory(message_handler=None):
+        yield FakeSession()
+
+    pool = SessionPool("srv", factory, replicas=2)
+    pool.add_exit_listener(lambda replica: metrics.upstream_exits.labels("srv").inc())
+    await pool.start()
+    sub_app.state.session_pool = pool
+
+    text = metrics.render()
+    assert sample(text, 'mcp_hub_sessions{server="srv"}') == 1
+    assert sample(text, 'mcp_hub_upstream_replicas{server="srv",state="configured"}') == 2
+    assert sample(text, 'mcp_hub_upstream_replicas{server="srv",state="healthy"}') == 2
+
+    # O processo morre sem ter sido parado (o task group do cliente cancela a réplica)
+    pool.replicas[0]._task.cancel()
+    await asyncio.gather(pool.replicas[0]._task, return_exceptions=True)
+    await pool.stop()
+    text = metrics.render()
+    assert sample(text, 'mcp_hub_upstream_exits_total{server="srv"}') == 1
+    assert sample(text, 'mcp_hub_upstream_replicas{server="srv",state="healthy"}') == 0
@@ -0,0 +1,243 @@
+import asyncio
+import json
+import sys
+import textwrap
+
+import httpx
+import pytest
+from mcp import StdioServerParameters
+
+from mcp_hub.main import create_sub_app, validate_server_config
+from mcp_hub.utils.passthrough import UpstreamClosedError, raw_stdio_session_factory, restore_id
+from mcp_hub.utils.pool import SessionPool
+
+
+# Servidor MCP mínimo em JSON por linha, sem depender do SDK
+FAKE_SERVER = textwrap.dedent('''
+    import json, os, sys, threading, time
+
+    lock = threading.Lock()
+    waiting = {}
+
+    def send(message):
+        with lock:
+            sys.stdout.write(json.dumps(message) + "\\n")
+            sys.stdout.flush()
+
+    def call_tool(req_id, params):
+        name = params["name"]
+        arguments = params.get("arguments") or {}
+        if name == "sleep":
+            time.sleep(arguments["seconds"])
+            send({"jsonrpc": "2.0", "id": req_id, "result": {"content": [{"type": "text", "text": arguments["tag"]}]}})
+        elif name == "image":
+            content = {"type": "image", "data": "aGk=", "mimeType": "image/png"}
+            send({"jsonrpc": "2.0", "id": req_id, "result": {"content": [content]}})
+        elif name == "progress":
+            token = params["_meta"]["progressToken"]
+            for step in (1, 2):
+                send({"jsonrpc": "2.0", "method": "notifications/progress",
+                      "params": {"progressToken": token, "progress": step, "total": 2}})
+            send({"jsonrpc": "2.0", "id": req_id, "result": {"content": [{"type": "text", "text": str(token)}]}})
+        elif name == "ask":
+            waiting["srv-1"] = req_id
+            send({"jsonrpc": "2.0", "id": "srv-1", "method": "ping"})
+        elif name == "notify":
+            send({"jsonrpc": "2.0", "method": "notifications/resources/updated", "params": {"uri": "mem://a"}})
+            send({"jsonrpc": "2.0", "id": req_id, "result": {"content": []}})
+        elif name == "exit":
+            os._exit(0)
+
+    for line in sys.stdin:
+        message = json.loads(line)
+        method, req_id = message.get("method"), message.get("id")
+        if method is None:
+            # Resposta do gateway a um pedido do servidor
+            send({"jsonrpc": "2.0", "id": waiting.pop(req_id),
+                  "result": {"content": [{"type": "text", "text": json.dumps(message)}]}})
+        elif method == "initialize":
+            send({"jsonrpc": "2.0", "id": req_id, "result": {
+                "protocolVersion": "2025-06-18",
+                "capabilities": {"resources": {"subscribe": True}, "prompts": {}, "tools": {}},
+                "serverInfo": {"name": "fake", "version": "9.9"},
+            }})
+        elif method == "tools/list":
+            tool = {"name": "image", "title": "Image", "inputSchema": {}, "annotations": {"readOnlyHint": True},
+                    "outputSchema": {"type": "object"}, "_meta": {"k": 1}}
+            send({"jsonrpc": "2.0", "id": req_id, "result": {"tools": [tool], "nextCursor": "page-2"}})
+        elif method == "tools/call":
+            threading.Thread(target=call_tool, args=(req_id, message["params"])).start()
+        elif method == "resources/read":
+            uri = message["params"]["uri"]
+            send({"jsonrpc": "2.0", "id": req_id, "result": {"contents": [{"uri": uri, "text": "body of " + uri}]}})
+        elif method == "prompts/list":
+            send({"jsonrpc": "2.0", "id": req_id, "result": {"prompts": [{"name": "greet"}]}})
+        elif method == "ping":
+            send({"jsonrpc": "2.0", "id": req_id, "result": {}})
+        elif req_id is not None:
+            send({"jsonrpc": "2.0", "id": req_id, "error": {"code": -32601, "message": "Method not found"}})
+''')
+
+
+@pytest.fixture
+def server_params(tmp_path):
+    script = tmp_path / "fake_server.py"
+    script.write_text(FAKE_SERVER)
+    return StdioServerParameters(command=sys.executable, args=[str(script)])
+
+
+def call(req_id, name, **arguments):
+    return {"jsonrpc": "2.0", "id": req_id, "method": "tools/call", "params": {"name": name, "arguments": arguments}}
+
+
+# Testa que respostas fora de ordem voltam para o pedido certo, com o id original do cliente
+@pytest.mark.asyncio
+async def test_concurrent_requests_get_their_own_ids(server_params):
+    async with raw_stdio_session_factory(server_params)() as session:
+        slow, fast = await asyncio.gather(
+            session.send_raw(call("client-a", "sleep", seconds=0.3, tag="slow")),
+            session.send_raw(call(7, "sleep", seconds=0, tag="fast")),
+        )
+    assert json.loads(slow) == {"jsonrpc": "2.0", "id": "client-a", "result": {"content": [{"type": "text", "text": "slow"}]}}
+    assert json.loads(fast)["id"] == 7
+    assert json.loads(fast)["result"]["content"][0]["text"] == "fast"
+
+
+# Testa que o id é trocado direto nos bytes, sem re-serializar o resultado
+def test_restore_id_splices_bytes():
+    line = b'{"jsonrpc": "2.0", "id": 12, "result": {"id": 12, "text": "\\u00e9"}}'
+    relayed = restore_id(line, 12, "abc", json.loads(line))
+    assert relayed == b'{"jsonrpc": "2.0", "id":"abc", "result": {"id": 12, "text": "\\u00e9"}}'
+    # id depois do resultado: cai no caminho re-serializado
+    line = b'{"jsonrpc":"2.0","result":{"id":3},"id":3}'
+    assert json.loads(restore_id(line, 3, 1, json.loads(line))) == {"jsonrpc": "2.0", "result": {"id": 3}, "id": 1}
+
+
+# Testa progresso: token remapeado por processo e entregue ao callback do pedido
+@pytest.mark.asyncio
+async def test_progress_is_routed_to_callback(server_params):
+    events = []
+
+    async def on_progress(progress, total, message):
+        events.append((progress, total))
+
+    async with raw_stdio_session_factory(server_params)() as session:
+        message = call(1, "progress")
+        message["params"]["_meta"] = {"progressToken": "client-token"}
+        reply = json.loads(await session.send_raw(message, on_progress))
+    assert events == [(1, 2), (2, 2)]
+    # O servidor viu o token do gateway, não o do cliente
+    assert reply["result"]["content"][0]["text"] != "client-token"
+
+
+# Testa que pedidos do servidor (ping) são respondidos pelo gateway
+@pytest.mark.asyncio
+async def test_server_ping_is_answered(server_params):
+    async with raw_stdio_session_factory(server_params)() as session:
+        reply = json.loads(await session.send_raw(call(1, "ask")))
+    answer = json.loads(reply["result"]["content"][0]["text"])
+    assert answer == {"jsonrpc": "2.0", "id": "srv-1", "result": {}}
+
+
+# Testa que notificações do servidor chegam ao message_handler e a saída do processo falha os pendentes
+@pytest.mark.asyncio
+async def test_notifications_and_upstream_exit(server_params):
+    received = []
+
+    async def handler(notification):
+        received.append((notification.method, notification.params))
+
+    async with raw_stdio_session_factory(server_params)(message_handler=handler) as session:
+        assert session.initialize_result["serverInfo"]["name"] == "fake"
+        await session.send_raw(call(1, "notify"))
+        assert received == [("notifications/resources/updated", {"uri": "mem://a"})]
+        with pytest.raises(UpstreamClosedError):
+            await session.send_raw(call(2, "exit"))
+        with pytest.raises(UpstreamClosedError):
+            await session.send_raw(call(3, "sleep", seconds=0, tag="late"))
+
+
+async def passthrough_app(server_params, server_cfg):
+    validate_server_config("fake", server_cfg)
+    app = create_sub_app("fake", server_cfg, ["*"], None, False, None, 5, None)
+    pool = SessionPool("fake", raw_stdio_session_factory(server_params))
+    await pool.start()
+    app.state.session_pool = pool
+    app.state.session = pool.session
+    return app, pool
+
+
+# Testa o endpoint em modo passthrough: capacidades do servidor, resources, prompts, ping e imagens
+@pytest.mark.asyncio
+async def test_proxy_passthrough_methods(server_params):
+    app, pool = await passthrough_app(server_params, {"command": "fake", "passthrough": True})
+    headers = {"x-session-id": "s1"}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            async def rpc(req_id, method, params=None):
+                message = {"jsonrpc": "2.0", "id": req_id, "method": method}
+                if params is not None:
+                    message["params"] = params
+                return (await client.post("/", json=message, headers=headers)).json()
+
+            assert (await rpc(1, "ping")) == {"jsonrpc": "2.0", "id": 1, "result": {}}
+            assert (await rpc(2, "resources/read", {"uri": "mem://a"}))["error"]["code"] == -32000
+
+            init = (await rpc(3, "initialize"))["result"]
+            assert init["serverInfo"] == {"name": "fake", "version": "9.9"}
+            assert "resources" in init["capabilities"]
+
+            read = await rpc(4, "resources/read", {"uri": "mem://a"})
+            assert read == {"jsonrpc": "2.0", "id": 4, "result": {"contents": [{"uri": "mem://a", "text": "body of mem://a"}]}}
+            assert (await rpc(5, "prompts/list"))["result"]["prompts"] == [{"name": "greet"}]
+            assert (await rpc(6, "completion/complete", {}))["error"]["code"] == -32601
+
+            image = await rpc(7, "tools/call", {"name": "image"})
+            assert image["result"]["content"] == [{"type": "image", "data": "aGk=", "mimeType": "image/png"}]
+    finally:
+        await pool.stop()
+
+
+# Testa que o caminho normal também preserva conteúdo não-texto, e que ferramentas com cache não são repassadas cruas
+@pytest.mark.asyncio
+async def test_cached_tool_keeps_image_content(server_params):
+    server_cfg = {"command": "fake", "passthrough": True, "tools": {"image": {"cache": {"ttl": 60}}}}
+    app, pool = await passthrough_app(server_params, server_cfg)
+    headers = {"x-session-id": "s1"}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            await client.post("/", json={"jsonrpc": "2.0", "id": 1, "method": "initialize"}, headers=headers)
+            for _ in range(2):
+                resp = await client.post("/", json=call(2, "image"), headers=headers)
+                assert resp.json()["result"]["content"] == [{"type": "image", "data": "aGk=", "mimeType": "image/png"}]
+        assert app.state.result_caches["image"].stats()["hits"] == 1
+    finally:
+        await pool.stop()
+
+
+# Testa validação do campo passthrough
+def test_passthrough_config_validation():
+    validate_server_config("s", {"command": "x", "passthrough": True})
+    with pytest.raises(ValueError, match="'passthrough' must be a boolean"):
+        validate_server_config("s", {"command": "x", "passthrough": "yes"})
+
+
+# Testa que o tools/list em passthrough repassa o resultado do servidor inteiro, também quando vem do cache
+@pytest.mark.asyncio
+async def test_passthrough_tools_list_is_relayed(server_params):
+    app, pool = await passthrough_app(server_params, {"command": "fake", "passthrough": True})
+    headers = {"x-session-id": "s1"}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            await client.post("/", json={"jsonrpc": "2.0", "id": 1, "method": "initialize"}, headers=headers)
+            for req_id in (2, 3):
+                message = {"jsonrpc": "2.0", "id": req_id, "method": "tools/list"}
+                result = (await client.post("/", json=message, headers=headers)).json()["result"]
+                assert result["nextCursor"] == "page-2"
+                assert result["tools"] == [{
+                    "name": "image", "title": "Image", "inputSchema": {}, "annotations": {"readOnlyHint": True},
+                    "outputSchema": {"type": "object"}, "_meta": {"k": 1},
+                }]
+        assert (app.state.tools_cache.hits, app.state.tools_cache.misses) == (1, 1)
+    finally:
+        await pool.stop()
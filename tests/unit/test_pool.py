@@ -0,0 +1,148 @@
+import asyncio
+import random
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_hub.main import create_sub_app, validate_server_config
+from mcp_hub.utils.pool import (
+    LeastOutstandingPolicy,
+    NoHealthyReplicaError,
+    PowerOfTwoChoicesPolicy,
+    RoundRobinPolicy,
+    SessionPool,
+)
+
+
+class FakeSession:
+    def __init__(self, tag):
+        self.tag = tag
+
+    async def list_tools(self):
+        return type("FakeToolsResult", (), {"tools": []})()
+
+    async def call_tool(self, name, arguments=None):
+        content = type("FakeContent", (), {"type": "text", "text": self.tag})()
+        return type("FakeResult", (), {"content": [content]})()
+
+
+def fake_factory():
+    counter = {"n": 0}
+
+    @asynccontextmanager
+    async def factory(message_handler=None):
+        counter["n"] += 1
+        yield FakeSession(f"replica-{counter['n']}")
+
+    return factory
+
+
+def failing_factory():
+    @asynccontextmanager
+    async def factory(message_handler=None):
+        raise RuntimeError("spawn failed")
+        yield
+
+    return factory
+
+
+# Testa que o pool inicia todas as réplicas e distribui em round-robin
+@pytest.mark.asyncio
+async def test_pool_round_robin():
+    pool = SessionPool("srv", fake_factory(), replicas=3)
+    await pool.start()
+    try:
+        assert len(pool.healthy_replicas) == 3
+        tags = []
+        for _ in range(6):
+            async with pool.acquire() as session:
+                tags.append(session.tag)
+        assert tags[:3] == tags[3:]
+        assert len(set(tags)) == 3
+    finally:
+        await pool.stop()
+    assert pool.healthy_replicas == []
+
+
+# Testa roteamento sticky: mesma chave sempre vai para a mesma réplica
+@pytest.mark.asyncio
+async def test_pool_sticky_routing():
+    pool = SessionPool("srv", fake_factory(), replicas=4, sticky=True)
+    await pool.start()
+    try:
+        for key in ("a", "b", "session-123"):
+            chosen = {pool.select(key).index for _ in range(10)}
+            assert len(chosen) == 1
+    finally:
+        await pool.stop()
+
+
+# Testa que o pool falha apenas quando nenhuma réplica sobe
+@pytest.mark.asyncio
+async def test_pool_start_all_failed():
+    pool = SessionPool("srv", failing_factory(), replicas=2)
+    with pytest.raises(RuntimeError):
+        await pool.start()
+    with pytest.raises(NoHealthyReplicaError):
+        pool.select()
+
+
+# Testa contagem de requisições em andamento
+@pytest.mark.asyncio
+async def test_pool_tracks_outstanding():
+    pool = SessionPool("srv", fake_factory(), replicas=2, policy="least_outstanding")
+    await pool.start()
+    try:
+        async with pool.acquire():
+            busy = [r for r in pool.replicas if r.outstanding == 1]
+            assert len(busy) == 1
+            # least_outstanding escolhe a réplica livre
+            assert pool.select().outstanding == 0
+        assert all(r.outstanding == 0 for r in pool.replicas)
+    finally:
+        await pool.stop()
+
+
+def test_policies_choose():
+    replicas = [type("R", (), {"outstanding": n})() for n in (3, 0, 5)]
+    rr = RoundRobinPolicy()
+    assert [rr.choose(replicas) for _ in range(3)] == replicas
+    assert LeastOutstandingPolicy().choose(replicas) is replicas[1]
+    p2c = PowerOfTwoChoicesPolicy(random.Random(0))
+    for _ in range(20):
+        assert p2c.choose(replicas) is not replicas[2]
+
+
+def test_validate_server_config_replicas():
+    validate_server_config("srv", {"command": "echo", "replicas": 2, "loadBalancing": "power_of_two_choices"})
+    with pytest.raises(ValueError):
+        validate_server_config("srv", {"command": "echo", "replicas": 0})
+    with pytest.raises(ValueError):
+        validate_server_config("srv", {"command": "echo", "loadBalancing": "random"})
+
+
+# Testa o proxy usando o pool de réplicas
+@pytest.mark.asyncio
+async def test_proxy_uses_session_pool():
+    app = create_sub_app("srv", {"command": "echo", "replicas": 2}, ["*"], None, False, None, 5, None)
+    assert app.state.replicas == 2
+    pool = SessionPool("srv", fake_factory(), replicas=2)
+    await pool.start()
+    try:
+        app.state.session_pool = pool
+        app.state.session = pool.session
+        client = TestClient(app)
+        resp = client.post("/", json={"jsonrpc": "2.0", "id": 1, "method": "initialize"})
+        sid = resp.json()["result"]["sessionId"]
+        texts = set()
+        for i in range(4):
+            resp = client.post(
+                "/",
+                json={"jsonrpc": "2.0", "id": i, "method": "tools/call", "params": {"name": "t"}},
+                headers={"x-session-id": sid},
+            )
+            texts.add(resp.json()["result"]["content"][0]["text"])
+        assert texts == {"replica-1", "replica-2"}
+    finally:
+        await pool.stop()
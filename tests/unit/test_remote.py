@@ -0,0 +1,157 @@
+import asyncio
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+
+import httpx
+import pytest
+
+from mcp_hub.main import ServerRunner, create_sub_app, lifespan, validate_gateway_config, validate_server_config
+from mcp_hub.utils.pool import SessionPool
+from mcp_hub.utils.remote import HttpPool, default_transport, remote_session_factory
+
+
+REMOTE_SERVER = textwrap.dedent('''
+    import sys
+    from mcp.server.fastmcp import FastMCP
+    mcp = FastMCP("remote", host="127.0.0.1", port=int(sys.argv[2]))
+
+    @mcp.tool()
+    def echo(text: str) -> str:
+        return text
+
+    mcp.run(transport=sys.argv[1])
+''')
+
+ENDPOINTS = {"sse": "/sse", "streamable-http": "/mcp"}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+@pytest.fixture(params=["streamable-http", "sse"])
+def remote_server(request, tmp_path):
+    script = tmp_path / "remote.py"
+    script.write_text(REMOTE_SERVER)
+    port = free_port()
+    process = subprocess.Popen([sys.executable, str(script), request.param, str(port)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        yield request.param, f"http://127.0.0.1:{port}{ENDPOINTS[request.param]}"
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def connections(http_pool: HttpPool, url: str) -> int:
+    return len(http_pool.transport_for(httpx.URL(url))._pool.connections)
+
+
+# Testa réplicas de um servidor remoto real: todas as sessões usam o mesmo pool de conexões do host
+@pytest.mark.asyncio
+async def test_remote_replicas_share_connections(remote_server):
+    transport, url = remote_server
+    assert default_transport(url) == transport
+    http_pool = HttpPool(max_connections_per_host=4)
+    pool = SessionPool("remote", remote_session_factory(url, transport, http_pool), replicas=2)
+    await pool.start()
+    try:
+        results = await asyncio.gather(*(
+            pool.replicas[i % 2].session.call_tool("echo", {"text": str(i)}) for i in range(10)
+        ))
+        assert [r.content[0].text for r in results] == [str(i) for i in range(10)]
+        assert http_pool.hosts == 1
+        assert 0 < connections(http_pool, url) <= 4
+    finally:
+        await pool.stop()
+        await http_pool.aclose()
+    assert http_pool.hosts == 0
+
+
+# Testa que fechar o cliente de uma sessão (como o SDK faz) mantém as conexões do pool abertas
+@pytest.mark.asyncio
+async def test_client_close_keeps_pool_open():
+    requests = []
+
+    async def app(scope, receive, send):
+        requests.append(scope["path"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    http_pool = HttpPool()
+    shared = httpx.ASGITransport(app=app)
+    http_pool._hosts[(b"http", b"a", None)] = shared
+    async with http_pool.client(headers={"x-test": "1"}) as client:
+        assert (await client.get("http://a/one")).text == "ok"
+    async with http_pool.client() as client:
+        assert (await client.get("http://a/two")).text == "ok"
+    assert requests == ["/one", "/two"]
+    assert http_pool.transport_for(httpx.URL("http://a/")) is shared
+    assert http_pool.transport_for(httpx.URL("http://b:81/")) is not shared
+    await http_pool.aclose()
+
+
+# Testa o gateway com um servidor configurado por 'url': o endpoint faz proxy da chamada
+@pytest.mark.asyncio
+async def test_gateway_proxies_remote_server(remote_server):
+    transport, url = remote_server
+    app = create_sub_app("remote", {"url": url}, ["*"], None, False, None, 10, lifespan)
+    assert app.state.server_type == transport
+    http_pool = HttpPool()
+    runner = ServerRunner(app, http_pool=http_pool)
+    assert await runner.start() is None
+    try:
+        headers = {"x-session-id": "r1"}
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            await client.post("/", json={"jsonrpc": "2.0", "id": 0, "method": "initialize"}, headers=headers)
+            call = {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                    "params": {"name": "echo", "arguments": {"text": "hi"}}}
+            reply = (await client.post("/", json=call, headers=headers)).json()
+            assert reply["result"]["content"][0]["text"] == "hi"
+    finally:
+        await runner.stop()
+        await http_pool.aclose()
+
+
+# Testa validação de url, transport, headers e gateway.httpPool
+def test_remote_config():
+    validate_server_config("r", {"url": "https://example.com/mcp", "transport": "sse", "headers": {"a": "b"}})
+    validate_gateway_config({"httpPool": {"maxConnectionsPerHost": 10, "keepaliveExpiry": 5}})
+    pool = HttpPool.from_config({"maxConnectionsPerHost": 10})
+    assert pool.limits.max_connections == 10 and pool.limits.max_keepalive_connections == 10
+    assert default_transport("http://h/sse") == "sse" and default_transport("http://h/mcp") == "streamable-http"
+    for cfg, message in [
+        ({}, "Server 'r' must have a 'command' field or a 'url'"),
+        ({"url": "ftp://h/"}, "Server 'r' 'url' must be an http\\(s\\) URL"),
+        ({"url": "http://h/", "command": "x"}, "either a 'command' or a 'url'"),
+        ({"url": "http://h/", "transport": "ws"}, "'transport' must be one of: streamable-http, sse"),
+        ({"url": "http://h/", "headers": {"a": 1}}, "'headers' must map header names to strings"),
+        ({"url": "http://h/", "passthrough": True}, "'passthrough' is only supported for 'command' servers"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            validate_server_config("r", cfg)
+    for bad, message in [
+        ({"httpPool": []}, "'httpPool' must be an object"),
+        ({"httpPool": {"maxConnectionsPerHost": 0}}, "'httpPool.maxConnectionsPerHost' must be a positive integer"),
+        ({"httpPool": {"keepaliveExpiry": -1}}, "'httpPool.keepaliveExpiry' must be a non-negative number"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            validate_gateway_config(bad)
@@ -0,0 +1,223 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from mcp import McpError, types
+
+from mcp_hub.main import create_sub_app, validate_server_config
+from mcp_hub.utils.pool import SessionPool
+from mcp_hub.utils.resource_cache import ResourceCache, normalize_uri
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def fetcher(body=b'{"contents":[]}', subscribed=True):
+    calls = []
+
+    async def fetch(subscribe):
+        calls.append(subscribe)
+        return body, subscribed
+
+    return fetch, calls
+
+
+def updated(uri):
+    return types.ResourceUpdatedNotification(
+        method="notifications/resources/updated", params=types.ResourceUpdatedNotificationParams(uri=uri)
+    )
+
+
+class FakeReplica:
+    name = "srv#0"
+
+
+# Testa que a primeira leitura assina o URI e as seguintes vêm do cache
+@pytest.mark.asyncio
+async def test_read_subscribes_once_and_hits():
+    cache = ResourceCache()
+    fetch, calls = fetcher()
+    for _ in range(3):
+        assert await cache.get_or_fetch("mem://a", fetch) == b'{"contents":[]}'
+    assert calls == [True]
+    assert cache.stats()["hits"] == 2 and cache.stats()["subscribed"] == 1
+
+
+# Testa que resources/updated remove só o URI alterado e a releitura não assina de novo
+@pytest.mark.asyncio
+async def test_updated_notification_evicts_uri():
+    cache = ResourceCache()
+    fetch, calls = fetcher()
+    await cache.get_or_fetch("mem://a", fetch)
+    await cache.get_or_fetch("mem://b", fetch)
+    await cache.on_notification(FakeReplica(), updated("mem://a"))
+    assert cache.get("mem://a") is None and cache.get("mem://b") is not None
+    await cache.get_or_fetch("mem://a", fetch)
+    assert calls == [True, True, False]
+    assert cache.stats()["invalidations"] == 1
+
+
+# Testa que uma atualização durante a leitura impede que o conteúdo velho seja guardado
+@pytest.mark.asyncio
+async def test_update_during_read_is_not_cached():
+    cache = ResourceCache()
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def fetch(subscribe):
+        started.set()
+        await release.wait()
+        return b"old", True
+
+    task = asyncio.create_task(cache.get_or_fetch("mem://a", fetch))
+    await started.wait()
+    cache.invalidate("mem://a")
+    release.set()
+    assert await task == b"old"
+    assert cache.get("mem://a") is None
+
+
+# Testa leituras concorrentes do mesmo URI compartilhando uma única leitura upstream
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_read():
+    cache = ResourceCache()
+    calls = []
+
+    async def fetch(subscribe):
+        calls.append(subscribe)
+        await asyncio.sleep(0.01)
+        return b"body", True
+
+    results = await asyncio.gather(*(cache.get_or_fetch("mem://a", fetch) for _ in range(5)))
+    assert results == [b"body"] * 5 and calls == [True]
+
+
+# Testa servidor sem subscribe: sem ttl nada é guardado, com ttl expira
+@pytest.mark.asyncio
+async def test_unsubscribable_uri_needs_ttl():
+    fetch, calls = fetcher(subscribed=False)
+    cache = ResourceCache()
+    await cache.get_or_fetch("mem://a", fetch)
+    await cache.get_or_fetch("mem://a", fetch)
+    assert calls == [True, False]
+    assert cache.stats()["entries"] == 0
+
+    clock = FakeClock()
+    cache = ResourceCache(ttl=10, clock=clock)
+    fetch, calls = fetcher(subscribed=False)
+    await cache.get_or_fetch("mem://a", fetch)
+    await cache.get_or_fetch("mem://a", fetch)
+    clock.now += 11
+    await cache.get_or_fetch("mem://a", fetch)
+    assert calls == [True, False]
+
+
+# Testa o orçamento em bytes, list_changed e a saída do processo
+@pytest.mark.asyncio
+async def test_budget_list_changed_and_exit():
+    cache = ResourceCache(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+    cache.put("c", b"12345")
+    assert cache.get("b") is None and cache.stats()["evictions"] == 1
+    cache.put("huge", b"x" * 11)
+    assert cache.get("huge") is None
+
+    await cache.on_notification(FakeReplica(), types.ResourceListChangedNotification(
+        method="notifications/resources/list_changed"))
+    assert cache.stats()["entries"] == 0
+
+    cache.subscribed.add("a")
+    cache.on_exit(FakeReplica())
+    assert cache.subscribed == set()
+
+
+# Testa que URIs são normalizados como o SDK faz
+def test_normalize_uri():
+    assert normalize_uri("http://host") == "http://host/"
+    assert normalize_uri("mem://a") == "mem://a"
+    assert normalize_uri("not a uri") == "not a uri"
+
+
+class FakeSession:
+    def __init__(self, message_handler):
+        self.message_handler = message_handler
+        self.initialize_result = {"capabilities": {"resources": {"subscribe": True}}}
+        self.reads = 0
+        self.subscriptions = []
+
+    async def subscribe_resource(self, uri):
+        self.subscriptions.append(str(uri))
+
+    async def read_resource(self, uri):
+        self.reads += 1
+        if str(uri) == "mem://missing":
+            raise McpError(types.ErrorData(code=-32002, message="Resource not found"))
+        return types.ReadResourceResult(
+            contents=[types.TextResourceContents(uri=uri, text=f"read {self.reads}", mimeType="text/plain")]
+        )
+
+    async def list_resources(self, cursor=None):
+        return types.ListResourcesResult(resources=[types.Resource(uri="mem://a", name="a")])
+
+    async def list_resource_templates(self, cursor=None):
+        return types.ListResourceTemplatesResult(resourceTemplates=[])
+
+
+# Testa o endpoint: resources/list, leitura em cache e invalidação por notificação do servidor
+@pytest.mark.asyncio
+async def test_proxy_reads_resources_through_cache():
+    sessions = []
+
+    @asynccontextmanager
+    async def factory(message_handler=None):
+        sessions.append(FakeSession(message_handler))
+        yield sessions[-1]
+
+    server_cfg = {"command": "fake", "resourceCache": {"maxBytes": 4096}}
+    validate_server_config("fake", server_cfg)
+    app = create_sub_app("fake", server_cfg, ["*"], None, False, None, 5, None)
+    pool = SessionPool("fake", factory)
+    pool.add_notification_listener(app.state.resource_cache.on_notification)
+    await pool.start()
+    app.state.session_pool = pool
+    app.state.session = pool.session
+    headers = {"x-session-id": "s1"}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            async def rpc(req_id, method, params=None):
+                message = {"jsonrpc": "2.0", "id": req_id, "method": method, "params": params or {}}
+                return (await client.post("/", json=message, headers=headers)).json()
+
+            init = await rpc(1, "initialize")
+            assert init["result"]["capabilities"] == {"tools": {}, "resources": {}}
+            assert (await rpc(2, "resources/list"))["result"]["resources"] == [{"uri": "mem://a", "name": "a"}]
+
+            first = await rpc(3, "resources/read", {"uri": "mem://a"})
+            second = await rpc(4, "resources/read", {"uri": "mem://a"})
+            assert first["result"]["contents"][0]["text"] == second["result"]["contents"][0]["text"] == "read 1"
+            assert sessions[0].subscriptions == ["mem://a"]
+
+            await sessions[0].message_handler(types.ServerNotification(updated("mem://a")))
+            third = await rpc(5, "resources/read", {"uri": "mem://a"})
+            assert third["result"]["contents"][0]["text"] == "read 2"
+
+            missing = await rpc(6, "resources/read", {"uri": "mem://missing"})
+            assert missing["error"] == {"code": -32002, "message": "Resource not found"}
+            assert (await rpc(7, "resources/read", {}))["error"]["code"] == -32602
+    finally:
+        await pool.stop()
+
+
+# Testa validação de resourceCache
+def test_resource_cache_config_validation():
+    validate_server_config("s", {"command": "x", "resourceCache": {"maxBytes": 1024, "ttl": 30}})
+    for bad in ({"maxBytes": 0}, {"ttl": -1}, "yes"):
+        with pytest.raises(ValueError, match="resourceCache"):
+            validate_server_config("s", {"command": "x", "resourceCache": bad})
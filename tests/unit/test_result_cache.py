@@ -0,0 +1,214 @@
+import sqlite3
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import mcp_hub.main
+from mcp_hub.main import (
+    close_result_store,
+    create_sub_app,
+    mount_config_servers,
+    result_cache_stats,
+    swap_config_servers,
+    validate_gateway_config,
+    validate_server_config,
+)
+from mcp_hub.utils.result_cache import ResultCache, ResultStore, create_result_caches
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingSession:
+    def __init__(self):
+        self.calls = 0
+
+    async def call_tool(self, name, arguments=None):
+        self.calls += 1
+        content = type("FakeContent", (), {"type": "text", "text": f"{name}:{self.calls}"})()
+        return type("FakeResult", (), {"content": [content], "isError": name == "broken"})()
+
+
+def result(text):
+    return {"content": [{"type": "text", "text": text}]}
+
+
+# Testa acerto, expiração por TTL e contadores do nível em memória
+@pytest.mark.asyncio
+async def test_memory_tier_hit_and_expiry():
+    clock = FakeClock()
+    cache = ResultCache("srv/tool", ttl=10, clock=clock)
+    assert await cache.get("k") is None
+    await cache.put("k", result("a"))
+    assert await cache.get("k") == result("a")
+    clock.now += 11
+    assert await cache.get("k") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["entries"] == 0
+
+
+# Testa o orçamento em bytes com despejo LRU
+@pytest.mark.asyncio
+async def test_memory_tier_byte_budget():
+    entry_size = len(b'{"content":[{"type":"text","text":"x0"}]}')
+    cache = ResultCache("srv/tool", ttl=60, max_bytes=entry_size * 2)
+    await cache.put("a", result("x0"))
+    await cache.put("b", result("x1"))
+    await cache.get("a")
+    await cache.put("c", result("x2"))
+    assert await cache.get("b") is None
+    assert await cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= entry_size * 2
+
+    # Resultado maior que o orçamento não é guardado
+    await cache.put("big", result("y" * 1000))
+    assert await cache.get("big") is None
+
+
+# Testa que o nível em disco sobrevive a um reinício
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    store = ResultStore(path)
+    cache = ResultCache("srv/tool", ttl=60, store=store)
+    await cache.put("k", result("persisted"))
+    store.close()
+
+    store = ResultStore(path)
+    cache = ResultCache("srv/tool", ttl=60, store=store)
+    assert await cache.get("k") == result("persisted")
+    assert cache.stats()["diskHits"] == 1
+    # Promovido para a memória
+    assert await cache.get("k") == result("persisted")
+    assert cache.stats()["hits"] == 1
+    store.close()
+
+
+# Testa expiração e orçamento do nível em disco
+def test_disk_tier_expiry_and_budget(tmp_path):
+    clock = FakeClock()
+    store = ResultStore(str(tmp_path / "results.sqlite"), max_bytes=10, clock=clock)
+    store.put("old", b"123456", clock.now + 5)
+    clock.now += 1
+    store.put("new", b"123456", clock.now + 100)
+    assert store.get("old") is None
+    assert store.get("new") is not None
+    clock.now += 200
+    assert store.get("new") is None
+    store.close()
+
+
+# Testa que mudar o comando do servidor invalida entradas persistidas
+def test_namespace_changes_with_server_config(tmp_path):
+    cfg = {"command": "echo", "args": ["1"], "tools": {"t": {"cache": {"ttl": 5}}}}
+    first = create_result_caches("srv", cfg)["t"].namespace
+    assert create_result_caches("srv", cfg)["t"].namespace == first
+    assert create_result_caches("srv", {**cfg, "args": ["2"]})["t"].namespace != first
+
+
+# Testa cache no endpoint: acertos não chegam ao upstream e erros não são guardados
+@pytest.mark.asyncio
+async def test_endpoint_serves_cached_results():
+    cfg = {"command": "echo", "tools": {"lookup": {"cache": {"ttl": 60}}, "broken": {"cache": {"ttl": 60}}}}
+    app = create_sub_app("test", cfg, ["*"], None, False, None, 5, None)
+    app.state.session = CountingSession()
+    headers = {"x-session-id": "s"}
+
+    def call(req_id, name, arguments):
+        return {"jsonrpc": "2.0", "id": req_id, "method": "tools/call",
+                "params": {"name": name, "arguments": arguments}}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        await client.post("/", json={"jsonrpc": "2.0", "id": 0, "method": "initialize"}, headers=headers)
+        first = await client.post("/", json=call(1, "lookup", {"a": 1, "b": 2}), headers=headers)
+        second = await client.post("/", json=call(2, "lookup", {"b": 2, "a": 1}), headers=headers)
+        assert second.json()["id"] == 2
+        assert second.json()["result"] == first.json()["result"]
+        assert app.state.session.calls == 1
+
+        for req_id in (3, 4):
+            resp = await client.post("/", json=call(req_id, "broken", {}), headers=headers)
+            assert resp.json()["result"]["isError"] is True
+        assert app.state.session.calls == 3
+
+    stats = app.state.result_caches["lookup"].stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+@pytest.mark.parametrize("tool_cfg", [
+    {"cache": {}},
+    {"cache": {"ttl": 0}},
+    {"cache": {"ttl": 5, "maxBytes": 0}},
+    {"cache": {"ttl": 5, "disk": "no"}},
+])
+def test_invalid_result_cache_config(tool_cfg):
+    with pytest.raises(ValueError):
+        validate_server_config("srv", {"command": "echo", "tools": {"t": tool_cfg}})
+
+
+def test_invalid_result_store_config():
+    with pytest.raises(ValueError):
+        validate_gateway_config({"resultCachePath": 1})
+    with pytest.raises(ValueError):
+        validate_gateway_config({"resultCacheMaxBytes": 0})
+
+
+# Testa que os servidores montados usam o armazenamento em disco do gateway
+def test_mount_attaches_gateway_store(tmp_path):
+    config = {
+        "gateway": {"resultCachePath": str(tmp_path / "results.sqlite")},
+        "mcpServers": {"srv": {"command": "echo", "tools": {
+            "kept": {"cache": {"ttl": 5}}, "memory": {"cache": {"ttl": 5, "disk": False}},
+        }}},
+    }
+    main_app = FastAPI()
+    mount_config_servers(main_app, config, ["*"], None, False, None, 5, None, "/")
+    sub_app = main_app.router.routes[-1].app
+    assert sub_app.state.result_caches["kept"].store is main_app.state.result_store
+    assert sub_app.state.result_caches["memory"].store is None
+    sub_app.state.session = CountingSession()
+    assert set(result_cache_stats(main_app)["srv"]) == {"kept", "memory"}
+    main_app.state.result_store.close()
+
+
+# Testa que o reload que troca resultCachePath fecha o armazenamento antigo e os caches são criados uma vez só
+@pytest.mark.asyncio
+async def test_reload_replaces_gateway_store(tmp_path, monkeypatch):
+    builds = []
+    monkeypatch.setattr(mcp_hub.main, "create_result_caches",
+                        lambda *args: builds.append(args[0]) or create_result_caches(*args))
+    servers = {
+        "srv": {"command": "echo", "tools": {"t": {"cache": {"ttl": 5}}}},
+        "other": {"command": "cat", "tools": {"t": {"cache": {"ttl": 5}}}},
+    }
+    config = {"gateway": {"resultCachePath": str(tmp_path / "a.sqlite")}, "mcpServers": servers}
+    main_app = FastAPI()
+    mount_config_servers(main_app, config, ["*"], None, False, None, 5, None, "/")
+    main_app.state.config_data = config
+    old_store = main_app.state.result_store
+    assert builds == ["srv", "other"]
+
+    changed = {**servers, "srv": {**servers["srv"], "args": ["x"]}}
+    await swap_config_servers(main_app, {"gateway": {"resultCachePath": str(tmp_path / "b.sqlite")},
+                                         "mcpServers": changed})
+    new_store = main_app.state.result_store
+    assert new_store is not old_store and new_store.path.endswith("b.sqlite")
+    with pytest.raises(sqlite3.ProgrammingError):
+        old_store.get("k")
+    caches = {route.app.state.server_name: route.app.state.result_caches["t"] for route in main_app.router.routes
+              if hasattr(getattr(route, "app", None), "state")}
+    assert caches["srv"].store is new_store and caches["other"].store is new_store
+
+    await swap_config_servers(main_app, {"mcpServers": changed})
+    assert main_app.state.result_store is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        new_store.get("k")
+    close_result_store(main_app)
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+import mcp_hub.utils.runtime as runtime
+from mcp_hub.main import validate_gateway_config
+from mcp_hub.utils.runtime import RuntimeProfile, read_runtime_config, running_loop_matches
+
+
+# Testa que o perfil padrão mantém o loop asyncio e os padrões do uvicorn
+def test_default_profile():
+    profile = RuntimeProfile()
+    assert profile.loop_factory() is None and not profile.eager_tasks
+    assert profile.uvicorn_options() == {
+        "http": "auto", "backlog": 2048, "limit_concurrency": None, "timeout_keep_alive": 5.0,
+    }
+    assert profile.run(asyncio.sleep(0, "ok")) == "ok"
+
+
+# Testa o perfil performance: usa uvloop e httptools só quando instalados
+def test_performance_profile(monkeypatch):
+    monkeypatch.setattr(runtime, "installed", lambda module: False)
+    fallback = RuntimeProfile("performance")
+    assert fallback.loop_factory() is None and fallback.uvicorn_options()["http"] == "auto"
+    assert fallback.backlog == runtime.PERFORMANCE_BACKLOG
+    assert fallback.keep_alive_timeout == runtime.PERFORMANCE_KEEP_ALIVE_TIMEOUT
+    assert fallback.eager_tasks == hasattr(asyncio, "eager_task_factory")
+
+    monkeypatch.setattr(runtime, "installed", lambda module: True)
+    assert RuntimeProfile("performance").uvicorn_options()["http"] == "httptools"
+
+
+# Testa que run() roda a corrotina no loop pedido pelo perfil
+def test_profile_runs_requested_loop():
+    pytest.importorskip("uvloop")
+    profile = RuntimeProfile("performance")
+
+    async def main():
+        return type(asyncio.get_running_loop()).__module__, running_loop_matches(profile)
+
+    module, matches = profile.run(main())
+    assert module.startswith("uvloop") and matches
+    assert asyncio.run(main())[1] is False
+
+
+# Testa a precedência da linha de comando sobre gateway.runtime e a validação
+def test_runtime_config(tmp_path):
+    config = tmp_path / "config.json"
+    config.write_text('{"gateway": {"runtime": {"profile": "performance", "backlog": 100, "limitConcurrency": 50}}}')
+    cfg = read_runtime_config(str(config))
+    validate_gateway_config({"runtime": cfg})
+    profile = RuntimeProfile.from_config(cfg, profile="default", limit_concurrency=10, keep_alive_timeout=0)
+    assert (profile.name, profile.backlog, profile.limit_concurrency, profile.keep_alive_timeout) == (
+        "default", 100, 10, 0
+    )
+    assert read_runtime_config(str(tmp_path / "missing.json")) == {} and read_runtime_config(None) == {}
+    for bad, message in [
+        ({"runtime": "fast"}, "'gateway' 'runtime' must be an object"),
+        ({"runtime": {"profile": "turbo"}}, "'runtime.profile' must be one of: default, performance"),
+        ({"runtime": {"backlog": 0}}, "'runtime.backlog' must be a positive integer"),
+        ({"runtime": {"keepAliveTimeout": -1}}, "'runtime.keepAliveTimeout' must be a non-negative number"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            validate_gateway_config(bad)
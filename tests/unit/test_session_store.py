@@ -0,0 +1,69 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from mcp_hub.main import create_session_store, create_sub_app, session_store_stats, validate_gateway_config
+from mcp_hub.utils.sessions import SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# Testa eviction LRU quando o limite é atingido
+def test_lru_eviction():
+    store = SessionStore(max_size=2, ttl=None)
+    store.get("a").initialized = True
+    store.get("b")
+    store.get("a")  # "a" passa a ser o mais recente
+    store.get("c")
+    assert "b" not in store
+    assert store.get("a").initialized is True
+    assert store.stats()["evictions"] == 1
+    assert len(store) == 2
+
+
+# Testa expiração por inatividade
+def test_idle_ttl_expiry():
+    clock = FakeClock()
+    store = SessionStore(max_size=10, ttl=60, clock=clock)
+    store.get("old").initialized = True
+    clock.now = 30
+    store.get("recent")
+    clock.now = 61
+    assert store.get("old").initialized is False
+    assert "recent" in store
+    assert store.stats()["expirations"] == 1
+
+
+# Testa que sessões anônimas não crescem sem limite no endpoint
+def test_proxy_sessions_are_bounded():
+    app = create_sub_app("test", {"command": "echo"}, ["*"], None, False, None, 5, None)
+    app.state.session = object()
+    app.state.http_sessions = SessionStore(max_size=3)
+    client = TestClient(app)
+    for i in range(10):
+        client.post("/", json={"jsonrpc": "2.0", "id": i, "method": "initialize"}, headers={"user-agent": f"ua-{i}"})
+    assert len(app.state.http_sessions) == 3
+    assert app.state.http_sessions.evictions == 7
+
+
+def test_session_store_from_gateway_config():
+    store = create_session_store({"maxSessions": 5, "sessionTtl": 0})
+    assert store.max_size == 5 and store.ttl is None
+    assert create_session_store({}).stats()["maxSize"] == 10000
+
+    main_app = FastAPI()
+    sub_app = create_sub_app("time", {"command": "echo"}, ["*"], None, False, None, 5, None)
+    main_app.mount("/time/mcp", sub_app)
+    assert session_store_stats(main_app)["time"]["size"] == 0
+
+
+@pytest.mark.parametrize("gateway_cfg", [{"maxSessions": 0}, {"maxSessions": "1"}, {"sessionTtl": -1}])
+def test_invalid_session_settings(gateway_cfg):
+    with pytest.raises(ValueError):
+        validate_gateway_config(gateway_cfg)
@@ -0,0 +1,149 @@
+import asyncio
+import sys
+import textwrap
+from contextlib import asynccontextmanager
+
+import pytest
+from mcp import StdioServerParameters
+
+from mcp_hub.main import create_sub_app, validate_server_config
+from mcp_hub.utils import pool as pool_module
+from mcp_hub.utils.passthrough import raw_stdio_session_factory
+from mcp_hub.utils.pool import Replica, SessionPool, stdio_session_factory
+
+
+class FakeSession:
+    def __init__(self, tag):
+        self.tag = tag
+        self.upstream_closed = asyncio.Event()
+
+
+def fake_factory(fail_attempts=()):
+    state = {"attempts": 0, "running": 0, "sessions": []}
+
+    @asynccontextmanager
+    async def factory(message_handler=None):
+        state["attempts"] += 1
+        if state["attempts"] in fail_attempts:
+            raise RuntimeError("spawn failed")
+        session = FakeSession(f"process-{state['attempts']}")
+        state["sessions"].append(session)
+        state["running"] += 1
+        try:
+            yield session
+        finally:
+            state["running"] -= 1
+
+    return factory, state
+
+
+async def wait_for(condition, timeout=2.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.005)
+    await asyncio.wait_for(poll(), timeout)
+
+
+# Testa que o fim da saída do servidor encerra a réplica e avisa os listeners
+@pytest.mark.asyncio
+async def test_replica_notices_upstream_exit():
+    factory, state = fake_factory()
+    replica = Replica("srv", 0, factory)
+    exited = []
+    replica.exit_listeners.append(exited.append)
+    await replica.start()
+    state["sessions"][0].upstream_closed.set()
+    await wait_for(lambda: exited)
+    assert not replica.is_alive and state["running"] == 0
+
+
+# Testa que um standby pronto assume na hora o lugar da réplica que saiu e outro é iniciado
+@pytest.mark.asyncio
+async def test_standby_promoted_and_refilled():
+    factory, state = fake_factory()
+    pool = SessionPool("srv", factory, standby=1)
+    await pool.start()
+    try:
+        await wait_for(lambda: len(pool.ready_standbys) == 1)
+        active, spare = pool.replicas[0].session, pool.standbys[0].session
+        active.upstream_closed.set()
+        await wait_for(lambda: pool.promotions == 1)
+        async with pool.acquire() as session:
+            assert session is spare
+        await wait_for(lambda: len(pool.ready_standbys) == 1)
+        assert state["running"] == 2 and pool.replicas[0].index == 0
+    finally:
+        await pool.stop()
+    assert state["running"] == 0 and pool.standbys == []
+
+
+# Testa que um standby que falha ao iniciar é tentado de novo
+@pytest.mark.asyncio
+async def test_failed_standby_is_retried(monkeypatch):
+    monkeypatch.setattr(pool_module, "STANDBY_RETRY_DELAY", 0.01)
+    factory, state = fake_factory(fail_attempts={2})
+    pool = SessionPool("srv", factory, standby=1)
+    await pool.start()
+    try:
+        await wait_for(lambda: len(pool.ready_standbys) == 1)
+        assert state["attempts"] == 3
+    finally:
+        await pool.stop()
+
+
+# Testa que a saída de um standby só dispara a reposição, sem mexer nas réplicas ativas
+@pytest.mark.asyncio
+async def test_standby_exit_is_replaced():
+    factory, state = fake_factory()
+    pool = SessionPool("srv", factory, standby=1)
+    await pool.start()
+    try:
+        await wait_for(lambda: len(pool.ready_standbys) == 1)
+        active = pool.replicas[0]
+        pool.standbys[0].session.upstream_closed.set()
+        await wait_for(lambda: state["attempts"] == 3 and len(pool.ready_standbys) == 1)
+        assert pool.replicas[0] is active and pool.promotions == 0
+    finally:
+        await pool.stop()
+
+
+SERVER_THAT_DIES = textwrap.dedent('''
+    import os
+    from mcp.server.fastmcp import FastMCP
+    mcp = FastMCP("dies")
+
+    @mcp.tool()
+    def die() -> str:
+        os._exit(0)
+
+    mcp.run()
+''')
+
+
+# Testa a detecção de saída do processo real, pelo SDK e pelo modo passthrough
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_factory", [stdio_session_factory, raw_stdio_session_factory])
+async def test_process_exit_detected(tmp_path, make_factory):
+    script = tmp_path / "dies.py"
+    script.write_text(SERVER_THAT_DIES)
+    replica = Replica("dies", 0, make_factory(StdioServerParameters(command=sys.executable, args=[str(script)])))
+    exited = []
+    replica.exit_listeners.append(exited.append)
+    await replica.start()
+    try:
+        with pytest.raises(Exception):
+            await replica.session.call_tool("die")
+        await wait_for(lambda: exited, timeout=10)
+        assert not replica.is_alive
+    finally:
+        await replica.stop()
+
+
+# Testa validação de standby
+def test_standby_config():
+    validate_server_config("s", {"command": "x", "standby": 2})
+    app = create_sub_app("s", {"command": "x", "standby": 2}, ["*"], None, False, None, 5, None)
+    assert app.state.standby == 2
+    for bad in (-1, 1.5, True):
+        with pytest.raises(ValueError, match="'standby' must be a non-negative integer"):
+            validate_server_config("s", {"command": "x", "standby": bad})
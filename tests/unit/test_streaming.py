@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_hub.main import create_sub_app
+from mcp_hub.utils.streaming import event_stream, wants_event_stream
+
+
+class ProgressSession:
+    async def list_tools(self):
+        return type("FakeToolsResult", (), {"tools": []})()
+
+    async def call_tool(self, name, arguments=None, progress_callback=None):
+        if progress_callback:
+            for step in (1, 2):
+                await progress_callback(step, 2, f"step {step}")
+        content = type("FakeContent", (), {"type": "text", "text": "done"})()
+        return type("FakeResult", (), {"content": [content]})()
+
+
+def parse_events(body: str):
+    return [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+
+
+def make_client():
+    app = create_sub_app("test", {"command": "echo"}, ["*"], None, False, None, 5, None)
+    app.state.session = ProgressSession()
+    client = TestClient(app)
+    resp = client.post("/", json={"jsonrpc": "2.0", "id": 0, "method": "initialize"})
+    return client, resp.json()["result"]["sessionId"]
+
+
+def tool_call(meta=None):
+    params = {"name": "slow", "arguments": {"x": 1}}
+    if meta:
+        params["_meta"] = meta
+    return {"jsonrpc": "2.0", "id": 7, "method": "tools/call", "params": params}
+
+
+# Testa resposta SSE com progresso encaminhado e resultado final
+def test_tools_call_streams_progress():
+    client, sid = make_client()
+    resp = client.post(
+        "/",
+        json=tool_call({"progressToken": "tok"}),
+        headers={"x-session-id": sid, "accept": "application/json, text/event-stream"},
+    )
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(resp.text)
+    assert [e["method"] for e in events[:2]] == ["notifications/progress"] * 2
+    assert events[0]["params"] == {"progressToken": "tok", "progress": 1, "total": 2, "message": "step 1"}
+    assert events[-1] == {"jsonrpc": "2.0", "id": 7, "result": {"content": [{"type": "text", "text": "done"}]}}
+
+
+# Testa que clientes JSON continuam recebendo JSON
+def test_tools_call_json_without_progress_token():
+    client, sid = make_client()
+    resp = client.post(
+        "/", json=tool_call(), headers={"x-session-id": sid, "accept": "application/json, text/event-stream"}
+    )
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json()["result"]["content"][0]["text"] == "done"
+
+
+# Testa erro dentro do stream (sessão não inicializada)
+def test_stream_reports_errors_as_events():
+    client, _ = make_client()
+    resp = client.post("/", json=tool_call(), headers={"x-session-id": "new", "accept": "text/event-stream"})
+    events = parse_events(resp.text)
+    assert events == [{"jsonrpc": "2.0", "id": 7, "error": {"code": -32000, "message": "Bad Request: Server not initialized"}}]
+
+
+def test_wants_event_stream():
+    assert wants_event_stream("text/event-stream", tool_call())
+    assert not wants_event_stream("application/json, text/event-stream", tool_call())
+    assert wants_event_stream("application/json, text/event-stream", tool_call({"progressToken": 1}))
+    assert not wants_event_stream("*/*", tool_call({"progressToken": 1}))
+    assert not wants_event_stream("text/event-stream", {"method": "tools/list"})
+
+
+# Testa keepalive enquanto a ferramenta não responde
+@pytest.mark.asyncio
+async def test_event_stream_keepalive():
+    async def handle(message, progress_callback=None):
+        await asyncio.sleep(0.25)
+        return {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+
+    events = [event async for event in event_stream(tool_call(), handle, keepalive=0.1)]
+    assert events[0] == b": keepalive\n\n"
+    assert events[-1].startswith(b"event: message\ndata: ")
@@ -0,0 +1,192 @@
+import asyncio
+import random
+import sys
+import textwrap
+from contextlib import asynccontextmanager
+
+import pytest
+from mcp import StdioServerParameters
+
+from mcp_hub.main import create_sub_app, validate_server_config
+from mcp_hub.utils.pool import NoHealthyReplicaError, RestartPolicy, SessionPool, stdio_session_factory
+
+
+class FakeSession:
+    def __init__(self, tag):
+        self.tag = tag
+        self.upstream_closed = asyncio.Event()
+
+
+def fake_factory(fail_attempts=()):
+    state = {"attempts": 0, "running": 0, "sessions": []}
+
+    @asynccontextmanager
+    async def factory(message_handler=None):
+        state["attempts"] += 1
+        if state["attempts"] in fail_attempts:
+            raise RuntimeError("spawn failed")
+        session = FakeSession(f"process-{state['attempts']}")
+        state["sessions"].append(session)
+        state["running"] += 1
+        try:
+            yield session
+        finally:
+            state["running"] -= 1
+
+    return factory, state
+
+
+def fast_restarts(**overrides):
+    return RestartPolicy(**{"initial_delay": 0.01, "max_delay": 0.05, "request_wait": 2.0, **overrides})
+
+
+async def wait_for(condition, timeout=2.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.005)
+    await asyncio.wait_for(poll(), timeout)
+
+
+# Testa o backoff exponencial com jitter e o teto de maxDelay
+def test_restart_delay_backoff():
+    policy = RestartPolicy(initial_delay=0.5, max_delay=4.0, rng=random.Random(7))
+    for failures, nominal in [(0, 0.5), (1, 1.0), (2, 2.0), (3, 4.0), (10, 4.0), (500, 4.0)]:
+        delay = policy.delay(failures)
+        assert nominal / 2 <= delay <= nominal
+
+
+# Testa que uma réplica que saiu é reiniciada e os listeners são avisados
+@pytest.mark.asyncio
+async def test_exited_replica_is_restarted():
+    factory, state = fake_factory()
+    pool = SessionPool("srv", factory, restart=fast_restarts())
+    restarted = []
+    pool.add_restart_listener(restarted.append)
+    await pool.start()
+    try:
+        state["sessions"][0].upstream_closed.set()
+        await wait_for(lambda: pool.restarts == 1)
+        async with pool.acquire() as session:
+            assert session.tag == "process-2"
+        assert restarted == [pool.replicas[0]]
+    finally:
+        await pool.stop()
+    assert state["running"] == 0
+
+
+# Testa que reinícios que falham continuam com backoff até dar certo
+@pytest.mark.asyncio
+async def test_failed_restarts_back_off():
+    factory, state = fake_factory(fail_attempts={2, 3})
+    pool = SessionPool("srv", factory, restart=fast_restarts())
+    await pool.start()
+    try:
+        state["sessions"][0].upstream_closed.set()
+        await wait_for(lambda: pool.restarts == 1)
+        assert state["attempts"] == 4 and pool.replicas[0].failures == 3
+    finally:
+        await pool.stop()
+
+
+# Testa que pedidos durante o reinício esperam a réplica voltar em vez de falhar
+@pytest.mark.asyncio
+async def test_request_waits_for_restart():
+    factory, state = fake_factory()
+    pool = SessionPool("srv", factory, restart=fast_restarts(initial_delay=0.1, max_delay=0.1))
+    await pool.start()
+    try:
+        state["sessions"][0].upstream_closed.set()
+        await wait_for(lambda: not pool.healthy_replicas)
+        async with pool.acquire() as session:
+            assert session.tag == "process-2"
+    finally:
+        await pool.stop()
+
+
+# Testa que a espera é limitada por requestWait
+@pytest.mark.asyncio
+async def test_request_wait_is_bounded():
+    factory, state = fake_factory()
+    pool = SessionPool("srv", factory, restart=fast_restarts(initial_delay=5, max_delay=5, request_wait=0.05))
+    await pool.start()
+    try:
+        state["sessions"][0].upstream_closed.set()
+        await wait_for(lambda: not pool.healthy_replicas)
+        with pytest.raises(NoHealthyReplicaError):
+            async with pool.acquire():
+                pass
+    finally:
+        await pool.stop()
+    assert state["attempts"] == 1
+
+
+# Testa restart desabilitado: a réplica continua fora
+@pytest.mark.asyncio
+async def test_restart_disabled():
+    factory, state = fake_factory()
+    pool = SessionPool("srv", factory, restart=fast_restarts(enabled=False))
+    await pool.start()
+    try:
+        state["sessions"][0].upstream_closed.set()
+        await wait_for(lambda: not pool.healthy_replicas)
+        await asyncio.sleep(0.05)
+        assert state["attempts"] == 1
+        with pytest.raises(NoHealthyReplicaError):
+            async with pool.acquire():
+                pass
+    finally:
+        await pool.stop()
+
+
+SERVER_THAT_DIES = textwrap.dedent('''
+    import os
+    from mcp.server.fastmcp import FastMCP
+    mcp = FastMCP("dies")
+
+    @mcp.tool()
+    def pid() -> str:
+        return str(os.getpid())
+
+    @mcp.tool()
+    def die() -> str:
+        os._exit(1)
+
+    mcp.run()
+''')
+
+
+# Testa com um processo real: depois de morrer, um novo processo é iniciado e inicializado
+@pytest.mark.asyncio
+async def test_real_server_restarted(tmp_path):
+    script = tmp_path / "dies.py"
+    script.write_text(SERVER_THAT_DIES)
+    params = StdioServerParameters(command=sys.executable, args=[str(script)])
+    pool = SessionPool("dies", stdio_session_factory(params), restart=fast_restarts(request_wait=10))
+    await pool.start()
+    try:
+        async with pool.acquire() as session:
+            first_pid = (await session.call_tool("pid")).content[0].text
+            with pytest.raises(Exception):
+                await session.call_tool("die")
+        await wait_for(lambda: not pool.healthy_replicas or pool.restarts, timeout=10)
+        async with pool.acquire() as session:
+            second_pid = (await session.call_tool("pid")).content[0].text
+        assert second_pid != first_pid and pool.restarts == 1
+    finally:
+        await pool.stop()
+
+
+# Testa validação do objeto restart
+def test_restart_config():
+    server_cfg = {"command": "x", "restart": {"initialDelay": 1, "maxDelay": 60, "requestWait": 2}}
+    validate_server_config("s", server_cfg)
+    app = create_sub_app("s", server_cfg, ["*"], None, False, None, 5, None)
+    assert app.state.restart_policy.max_delay == 60 and app.state.restart_policy.enabled
+    for bad, message in [
+        ("yes", "'restart' must be an object"),
+        ({"enabled": 1}, "'restart.enabled' must be a boolean"),
+        ({"maxDelay": -1}, "'restart.maxDelay' must be a non-negative number"),
+        ({"initialDelay": 10, "maxDelay": 1}, "must not exceed"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            validate_server_config("s", {"command": "x", "restart": bad})